@@ -0,0 +1,95 @@
+from dlgo import gotypes
+from dlgo import goboard
+import copy
+import random
+import time
+
+# This script measures how many legal moves per second we can generate with
+# GameState.is_valid_move on 9x9 and 19x19 boards. It also checks that the
+# answers are exactly the same as the ones from the original implementation,
+# which applied every candidate play to a deep copy of the board.
+
+# Seed used to generate the benchmark positions
+SEED = 42
+# Number of positions sampled per board size
+NUM_POSITIONS = 20
+
+
+# Reference legality check that applies the play to a copy of the board, the
+# same way GameState.is_valid_move used to work
+def reference_is_valid_move(game_state, move):
+    if game_state.is_over():
+        return False
+    if move.is_pass or move.is_resign:
+        return True
+    if game_state.board.get(move.point) is not None:
+        return False
+    next_board = copy.deepcopy(game_state.board)
+    next_board.place_stone(game_state.next_player, move.point)
+    # Self capture
+    if next_board.get_go_string(move.point).num_liberties == 0:
+        return False
+    # Ko
+    next_situation = (game_state.next_player.other, next_board.zobrist_hash())
+    return next_situation not in game_state.previous_states
+
+
+# Get all the legal plays of a game state using the given legality check
+def legal_plays(game_state, is_valid_move):
+    plays = []
+    for r in range(1, game_state.board.num_rows + 1):
+        for c in range(1, game_state.board.num_cols + 1):
+            move = goboard.Move.play(gotypes.Point(row = r, col = c))
+            if is_valid_move(game_state, move):
+                plays.append(move)
+    return plays
+
+
+# Play a random game and keep a sample of the positions we go through
+def sample_positions(board_size, rng):
+    game = goboard.GameState.new_game(board_size)
+    positions = []
+    # Long enough for the board to fill up and captures to happen
+    max_moves = board_size * board_size * 2
+    for _ in range(max_moves):
+        plays = legal_plays(game, goboard.GameState.is_valid_move)
+        if not plays:
+            break
+        positions.append(game)
+        game = game.apply_move(rng.choice(plays))
+    # Keep evenly spread positions from the opening to the end
+    step = max(1, len(positions) // NUM_POSITIONS)
+    return positions[::step][:NUM_POSITIONS]
+
+
+# Time how many legal moves per second a legality check produces
+def measure(positions, is_valid_move):
+    num_moves = 0
+    start = time.perf_counter()
+    for game_state in positions:
+        num_moves += len(legal_plays(game_state, is_valid_move))
+    elapsed = time.perf_counter() - start
+    return num_moves, num_moves / elapsed
+
+
+def main():
+    rng = random.Random(SEED)
+    for board_size in (9, 19):
+        positions = sample_positions(board_size, rng)
+        # Make sure both implementations agree on every candidate point
+        for game_state in positions:
+            fast = legal_plays(game_state, goboard.GameState.is_valid_move)
+            slow = legal_plays(game_state, reference_is_valid_move)
+            assert [m.point for m in fast] == [m.point for m in slow]
+        num_moves, fast_rate = measure(
+            positions, goboard.GameState.is_valid_move)
+        _, copy_rate = measure(positions, reference_is_valid_move)
+        print('%dx%d: %d legal moves in %d positions' % (
+            board_size, board_size, num_moves, len(positions)))
+        print('    copy-free: %10.0f legal moves/s' % fast_rate)
+        print('    deepcopy:  %10.0f legal moves/s (%.1fx slower)' % (
+            copy_rate, fast_rate / copy_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+from dlgo.ttt import mnkboard
+import random
+import time
+
+# This script measures the cost of a move in m,n,k games as the board grows.
+# It plays random games and times replaying them with apply_move, which finds out whether the move
+# won by looking only at the four lines through it. For comparison it also
+# times a full scan of the board for k in a row after every move, which is
+# what tttboard does, and checks that both always agree.
+
+# Seed used to generate the random games
+SEED = 42
+# Number of random games played per game size
+NUM_GAMES = 20
+# Games measured, as (rows, cols, k). The cost of a move depends on k, so the
+# games with k = 5 show how it changes with the size of the board alone
+GAMES = ((3, 3, 3), (7, 7, 4), (7, 7, 5), (15, 15, 5), (19, 19, 5),
+         (31, 31, 5))
+# Times the games are replayed through apply_move, keeping the best time
+REPEAT = 5
+
+
+# Play random games, returning the sequences of moves and the winners
+def play_games(num_rows, num_cols, k, rng):
+    games = []
+    num_moves = 0
+    for _ in range(NUM_GAMES):
+        game = mnkboard.GameState.new_game(num_rows, num_cols, k)
+        moves = []
+        while not game.is_over():
+            move = rng.choice(game.legal_moves())
+            game = game.apply_move(move)
+            moves.append(move)
+        games.append((moves, game.winner()))
+        num_moves += len(moves)
+    return games, num_moves
+
+
+# Replay the games through apply_move and return the best total time
+def replay_with_apply_move(num_rows, num_cols, k, games):
+    best = None
+    for _ in range(REPEAT):
+        elapsed = 0.0
+        for moves, winner in games:
+            game = mnkboard.GameState.new_game(num_rows, num_cols, k)
+            start = time.perf_counter()
+            for move in moves:
+                game = game.apply_move(move)
+            elapsed += time.perf_counter() - start
+            assert game.winner() == winner
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+# Replay the games scanning the whole board for a winner after every move
+def replay_with_full_scan(num_rows, num_cols, k, games):
+    elapsed = 0.0
+    for moves, winner in games:
+        board = mnkboard.Board(num_rows, num_cols, k)
+        player = mnkboard.Player.x
+        scan_winner = None
+        for move in moves:
+            board = board.with_tile(player, move.point)
+            start = time.perf_counter()
+            if board.has_line(player):
+                scan_winner = player
+            elapsed += time.perf_counter() - start
+            player = player.other
+        assert scan_winner == winner
+    return elapsed
+
+
+def main():
+    rng = random.Random(SEED)
+    for num_rows, num_cols, k in GAMES:
+        games, num_moves = play_games(num_rows, num_cols, k, rng)
+        elapsed = replay_with_apply_move(num_rows, num_cols, k, games)
+        scan_elapsed = replay_with_full_scan(num_rows, num_cols, k, games)
+        print('%d,%d,%d: %d moves in %d games' % (
+            num_rows, num_cols, k, num_moves, len(games)))
+        print('    apply_move: %8.2f us/move' % (
+            elapsed / num_moves * 1e6))
+        print('    full scan:  %8.2f us/move' % (
+            scan_elapsed / num_moves * 1e6))
+
+
+if __name__ == '__main__':
+    main()
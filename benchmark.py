@@ -0,0 +1,335 @@
+from dlgo import goboard
+from dlgo import gotypes
+from dlgo.agent.naive import RandomBot
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.mcst.mcts_agent import MCTSAgent
+from dlgo.minimax import minimax
+from dlgo.minimax import ttt_solver
+from dlgo.selfplay import BOARDS
+from dlgo.ttt import tttbitboard
+from dlgo.ttt import tttboard
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+# Benchmarks for the board, the game state, and the agents that play on them.
+# Every benchmark starts from a fixed seed, so two runs measure exactly the
+# same work, and the results are written to a JSON file that can be compared
+# with the one from an earlier run:
+#   python benchmark.py --out before.json
+#   ... change something ...
+#   python benchmark.py --out after.json --compare before.json
+# The comparison prints how much faster or slower every benchmark got, and
+# marks the ones that got slower than the tolerance. Every benchmark runs a
+# few times and keeps its best time, which is the least disturbed by whatever
+# else the machine is doing.
+# Go benchmarks replay the same random games, played once per board size with
+# FastRandomBot, so they don't measure the time spent choosing moves.
+
+SEED = 42
+BOARD_SIZES = (9, 13, 19)
+# Number of random games replayed per board size
+NUM_GAMES = 5
+# Random games played with RandomBot, which is slow on big boards
+RANDOM_BOT_GAMES = {9: 3, 13: 2, 19: 1}
+# Rollouts for a single MCTSAgent move
+MCTS_ROUNDS = {9: 200, 13: 100, 19: 50}
+# Number of tic-tac-toe positions solved with minimax
+NUM_TTT_POSITIONS = 5
+# Benchmarks more than this much slower than in the compared file are marked
+TOLERANCE = 0.10
+# Times every fast benchmark is run
+REPEAT = 5
+# Times the benchmarks that play whole games or searches are run. They take
+# seconds each, so they run fewer times, but they still keep their best time
+# like the others, and reseed before every run so every run does the same
+# work
+SLOW_REPEAT = 3
+
+
+# Play random games and return the list of moves of each one
+def record_games(board_size, num_games, seed):
+    random.seed(seed)
+    bot = FastRandomBot()
+    games = []
+    for _ in range(num_games):
+        game = goboard.GameState.new_game(board_size)
+        moves = []
+        while not game.is_over() and len(moves) < board_size * board_size * 3:
+            move = bot.select_move(game)
+            moves.append(move)
+            game = game.apply_move(move)
+        games.append(moves)
+    return games
+
+
+# Run work, which returns how many operations it did, repeat times, and
+# build the result from the best time
+def measure(name, board_size, backend, unit, work, repeat = REPEAT):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = work()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result(name, board_size, backend, count, unit, best)
+
+
+def result(name, board_size, backend, count, unit, elapsed):
+    return {
+        'name': name,
+        'board_size': board_size,
+        'backend': backend,
+        'count': count,
+        'seconds': elapsed,
+        'unit': unit,
+        'rate': count / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+# Stones placed per second on a bare board of every implementation
+def bench_place_stone(board_size, games):
+    results = []
+    for backend in sorted(BOARDS):
+        board_class = BOARDS[backend]
+        # Replay through game states once to find the plays that are legal
+        # and the player who made them
+        plays = []
+        for moves in games:
+            player = gotypes.Player.black
+            game_plays = []
+            for move in moves:
+                if move.is_play:
+                    game_plays.append((player, move.point))
+                player = player.other
+            plays.append(game_plays)
+
+        def work():
+            count = 0
+            for game_plays in plays:
+                board = board_class(board_size, board_size)
+                for player, point in game_plays:
+                    board.place_stone(player, point)
+                count += len(game_plays)
+            return count
+        results.append(measure(
+            'place_stone', board_size, backend, 'stones/s', work))
+    return results
+
+
+# Moves applied per second through GameState.apply_move
+def bench_apply_move(board_size, games):
+    results = []
+    for backend in sorted(BOARDS):
+
+        def work():
+            count = 0
+            for moves in games:
+                game = goboard.GameState.new_game(
+                    board_size, BOARDS[backend])
+                for move in moves:
+                    game = game.apply_move(move)
+                count += len(moves)
+            return count
+        results.append(measure(
+            'apply_move', board_size, backend, 'moves/s', work))
+    return results
+
+
+# Legality checks per second, on every point of positions along the games
+def bench_is_valid_move(board_size, games):
+    results = []
+    candidates = [
+        goboard.Move.play(gotypes.Point(row = row, col = col))
+        for row in range(1, board_size + 1)
+        for col in range(1, board_size + 1)
+    ]
+    for backend in sorted(BOARDS):
+        positions = []
+        for moves in games:
+            game = goboard.GameState.new_game(board_size, BOARDS[backend])
+            for index, move in enumerate(moves):
+                if index % 10 == 0:
+                    positions.append(game)
+                game = game.apply_move(move)
+
+        def work():
+            count = 0
+            for game in positions:
+                for move in candidates:
+                    game.is_valid_move(move)
+                count += len(candidates)
+            return count
+        results.append(measure(
+            'is_valid_move', board_size, backend, 'checks/s', work))
+    return results
+
+
+# Full games between two RandomBots, in moves per second
+def bench_random_games(board_size, seed):
+
+    def work():
+        random.seed(seed)
+        bots = {
+            gotypes.Player.black: RandomBot(),
+            gotypes.Player.white: RandomBot(),
+        }
+        count = 0
+        for _ in range(RANDOM_BOT_GAMES[board_size]):
+            game = goboard.GameState.new_game(board_size)
+            num_moves = 0
+            while not game.is_over() and \
+                    num_moves < board_size * board_size * 3:
+                game = game.apply_move(
+                    bots[game.next_player].select_move(game))
+                num_moves += 1
+            count += num_moves
+        return count
+    return [measure('random_bot_game', board_size, 'board', 'moves/s', work,
+                    SLOW_REPEAT)]
+
+
+# Rollouts per second of a single MCTSAgent move from the empty board
+def bench_mcts(board_size, seed):
+    results = []
+    for backend in ('board', 'array'):
+
+        def work():
+            random.seed(seed)
+            bot = MCTSAgent(MCTS_ROUNDS[board_size], 1.5)
+            game = goboard.GameState.new_game(board_size, BOARDS[backend])
+            bot.select_move(game)
+            return MCTS_ROUNDS[board_size]
+        results.append(measure(
+            'mcts_playouts', board_size, backend, 'playouts/s', work,
+            SLOW_REPEAT))
+    return results
+
+
+# MinimaxAgent on tic-tac-toe: searching with best_result on both boards, and
+# whole games with the precomputed solver
+def bench_minimax_ttt(seed):
+    results = []
+    for backend, module in (('dict', tttboard), ('bitmask', tttbitboard)):
+        rng = random.Random(seed)
+        positions = []
+        for _ in range(NUM_TTT_POSITIONS):
+            game = module.GameState.new_game()
+            for _ in range(2):
+                game = game.apply_move(rng.choice(game.legal_moves()))
+            positions.append(game)
+
+        def work():
+            random.seed(seed)
+            bot = minimax.MinimaxAgent()
+            for game in positions:
+                bot.select_move(game)
+            return len(positions)
+        results.append(measure(
+            'minimax_ttt_search', 3, backend, 'moves/s', work, SLOW_REPEAT))
+    ttt_solver.default_solver()
+
+    def work():
+        random.seed(seed)
+        bot = minimax.MinimaxAgent(ttt_solver.best_result)
+        count = 0
+        for _ in range(100):
+            game = tttbitboard.GameState.new_game()
+            while not game.is_over():
+                game = game.apply_move(bot.select_move(game))
+                count += 1
+        return count
+    results.append(measure(
+        'minimax_ttt_solver', 3, 'bitmask', 'moves/s', work))
+    return results
+
+
+BENCHMARKS = ('place_stone', 'apply_move', 'is_valid_move', 'random_games',
+              'mcts', 'minimax_ttt')
+
+
+def run(board_sizes, benchmarks, seed = SEED):
+    results = []
+    for board_size in board_sizes:
+        games = record_games(board_size, NUM_GAMES, seed)
+        if 'place_stone' in benchmarks:
+            results.extend(bench_place_stone(board_size, games))
+        if 'apply_move' in benchmarks:
+            results.extend(bench_apply_move(board_size, games))
+        if 'is_valid_move' in benchmarks:
+            results.extend(bench_is_valid_move(board_size, games))
+        if 'random_games' in benchmarks:
+            results.extend(bench_random_games(board_size, seed))
+        if 'mcts' in benchmarks:
+            results.extend(bench_mcts(board_size, seed))
+    if 'minimax_ttt' in benchmarks:
+        results.extend(bench_minimax_ttt(seed))
+    return results
+
+
+def result_key(entry):
+    return (entry['name'], entry['board_size'], entry['backend'])
+
+
+# Print every benchmark, with the change from an earlier run if there is one.
+# Returns the number of benchmarks that got slower than the tolerance
+def report(results, previous = None):
+    previous_rates = {}
+    if previous is not None:
+        previous_rates = {
+            result_key(entry): entry['rate'] for entry in previous['results']
+        }
+    regressions = 0
+    for entry in results:
+        line = '%-20s %2dx%-2d %-10s %12.1f %s' % (
+            entry['name'], entry['board_size'], entry['board_size'],
+            entry['backend'], entry['rate'], entry['unit'])
+        before = previous_rates.get(result_key(entry))
+        if before:
+            change = entry['rate'] / before - 1.0
+            line += '  %+6.1f%%' % (change * 100)
+            if change < -TOLERANCE:
+                line += '  SLOWER'
+                regressions += 1
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type = int, nargs = '+',
+                        default = list(BOARD_SIZES))
+    parser.add_argument('--only', nargs = '+', choices = BENCHMARKS,
+                        default = list(BENCHMARKS))
+    parser.add_argument('--seed', type = int, default = SEED)
+    parser.add_argument('--out', default = 'benchmark.json')
+    parser.add_argument('--compare', default = None)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.only, args.seed)
+    output = {
+        'seed': args.seed,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    with open(args.out, 'w') as out_file:
+        json.dump(output, out_file, indent = 2)
+
+    previous = None
+    if args.compare is not None:
+        with open(args.compare) as in_file:
+            previous = json.load(in_file)
+    regressions = report(results, previous)
+    if regressions:
+        print('%d benchmarks got slower' % regressions)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
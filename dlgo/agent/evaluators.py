@@ -0,0 +1,66 @@
+from dlgo.agent.helpers import capture_diff
+
+# capture_diff looks at every point of the board to count the stones, and a
+# depth-pruned search calls it at every leaf. goboard.Board now keeps the
+# counts it needs up to date as stones are placed and captured, so the
+# evaluation functions here only read a few numbers, whatever the size of the
+# board. prisoner_diff and liberty_diff need a game state whose board is a
+# goboard.Board or a MutableBoard. stone_diff works on any board: the other
+# implementations don't keep the counts, so it falls back to capture_diff on
+# them.
+# Like capture_diff, every function scores the position from the point of view
+# of the player who has the next move: a large score means that player expects
+# to win.
+
+
+# Stones on the board, ours minus theirs. Same value as capture_diff
+def stone_diff(game_state):
+    counts = getattr(game_state.board, 'stone_counts', None)
+    if counts is None:
+        return capture_diff(game_state)
+    player = game_state.next_player
+    return counts[player] - counts[player.other]
+
+
+# Enemy stones captured during the game, ours minus theirs
+def prisoner_diff(game_state):
+    counts = game_state.board.capture_counts
+    player = game_state.next_player
+    return counts[player] - counts[player.other]
+
+
+# Liberties of our strings minus the liberties of theirs
+def liberty_diff(game_state):
+    totals = game_state.board.liberty_totals
+    player = game_state.next_player
+    return totals[player] - totals[player.other]
+
+
+# Evaluation functions that can be combined by name
+FEATURES = {
+    'stones': stone_diff,
+    'prisoners': prisoner_diff,
+    'liberties': liberty_diff,
+}
+
+
+# An evaluation function that adds up several features, each multiplied by
+# its weight. The weights are a dict from the name of a feature in FEATURES,
+# or from any evaluation function, to a number. For example
+#   WeightedEvaluator({'stones': 1.0, 'liberties': 0.25})
+# can be passed as the eval_fn of a depth-pruned search
+class WeightedEvaluator():
+
+    def __init__(self, weights):
+        self.terms = []
+        for feature, weight in weights.items():
+            eval_fn = FEATURES[feature] if isinstance(feature, str) \
+                else feature
+            self.terms.append((eval_fn, weight))
+
+    def __call__(self, game_state):
+        score = 0
+        for eval_fn, weight in self.terms:
+            score += weight * eval_fn(game_state)
+        return score
+
@@ -1,4 +1,9 @@
-from dlgo.gotypes import Point
+from dlgo import gotypes
+from dlgo.gotypes import Point, Player
+
+# Scores returned when the game is already over at a node of the search
+MAX_SCORE = 999999
+MIN_SCORE = -999999
 
 # We will hardcode a rule that prevents the bot from filling in its own eyes,
 # under the strictest possible definition. For our purposes, an eye is an empty
@@ -55,16 +60,16 @@ def capture_diff(game_state):
     black_stones = 0
     white_stones = 0
     # Iterate through the board and count stones for each player
-    for r in range(1, game_state.baord.num_rows + 1):
+    for r in range(1, game_state.board.num_rows + 1):
         for c in range(1, game_state.board.num_cols + 1):
             # Create a point for this position
             point = gotypes.Point(r, c)
             # Get the color of said point
-            color = game_state.board.get(p)
+            color = game_state.board.get(point)
             # Store the count
             if color == gotypes.Player.black:
                 black_stones += 1
-            else if color == gotypes.Player.white:
+            elif color == gotypes.Player.white:
                 white_stones += 1
     # Get the difference
     diff = black_stones - white_stones
@@ -145,31 +150,31 @@ def alpha_beta_result(game_state, max_depth, alpha, beta, eval_fn):
         # If our outcome is the best we've seen so far
         if our_outcome > best_so_far:
             # store it as best_so_far
-            best_so_far = our_result
+            best_so_far = our_outcome
         # Chosing a move for White's
         if game_state.next_player == Player.white:
             # and the best result so far for him is better than the previous
-            if best_so_far > alpha
+            if best_so_far > alpha:
                 # Update the benchmark for White
                 alpha = best_so_far
             # Outcome for black would be the opposite
             outcome_for_black = -1 * best_so_far
             # We are picking a move for white, so it only needs to be strong
             # enough to eliminate black's previous move.
-            if outcome_for_black < beta
+            if outcome_for_black < beta:
                 # Return best result so far
                 return best_so_far
         # Chosing a move for Black's
-    elif game_state.next_player == Player.black:
+        elif game_state.next_player == Player.black:
             # and the best result so far for him is better than the previous
-            if best_so_far > beta
+            if best_so_far > beta:
                 # Update the benchmark for Black
                 beta = best_so_far
             # Outcome for white would be the opposite
             outcome_for_white = -1 * best_so_far
             # We are picking a move for black, so it only needs to be strong
             # enough to eliminate white's previous move.
-            if outcome_for_white < alpha
+            if outcome_for_white < alpha:
                 # Return best result so far
                 return best_so_far
     # Return best result so far after having evaluated the necessary situations
@@ -0,0 +1,178 @@
+from dlgo import scoring
+from dlgo.agent.base import Agent
+from dlgo.goboard import Move
+from dlgo.goboard_array import ArrayBoard, BLACK, WHITE, EMPTY
+from dlgo.gotypes import Player, Point
+import random
+
+# RandomBot checks every point of the board on every turn, and for each one
+# builds the lists of neighbours and diagonals again. Random games are the
+# inner loop of every rollout, so here we do as little work as possible:
+#   - Only empty points are candidates, and we sample them without replacement
+#   in random order, stopping at the first legal point that isn't an eye. Most
+#   of the time only a handful of points are looked at.
+#   - Neighbours and diagonals of every point are computed once per board size.
+#   - Full playouts run on an ArrayBoard using point indexes, without creating
+#   a GameState or copying the board on every move.
+
+
+# Neighbours and diagonals of every point on the board, computed once per
+# board size
+class _PointTables():
+
+    def __init__(self, num_rows, num_cols):
+        self.neighbours = {}
+        self.diagonals = {}
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                point = Point(row = row, col = col)
+                self.neighbours[point] = [
+                    n for n in point.neighbours()
+                    if 1 <= n.row <= num_rows and 1 <= n.col <= num_cols]
+                self.diagonals[point] = [
+                    d for d in point.diagonals()
+                    if 1 <= d.row <= num_rows and 1 <= d.col <= num_cols]
+
+
+_TABLES = {}
+
+
+def _tables_for(board):
+    key = (board.num_rows, board.num_cols)
+    if key not in _TABLES:
+        _TABLES[key] = _PointTables(board.num_rows, board.num_cols)
+    return _TABLES[key]
+
+
+# Same eye definition as agent.helpers.is_point_an_eye, using the precomputed
+# neighbours and diagonals. The point is known to be empty
+def _is_eye(board, tables, point, color):
+    for neighbour in tables.neighbours[point]:
+        if board.get(neighbour) != color:
+            return False
+    corners = tables.diagonals[point]
+    friendly_corners = 0
+    for corner in corners:
+        if board.get(corner) == color:
+            friendly_corners += 1
+    # On the edge every corner on the board must be friendly
+    if len(corners) < 4:
+        return friendly_corners == len(corners)
+    return friendly_corners >= 3
+
+
+class FastRandomBot(Agent):
+
+    # By default the bot draws from the global random module, so seeding it
+    # makes games reproducible
+    def __init__(self, rng = None):
+        Agent.__init__(self)
+        self.rng = rng if rng is not None else random
+
+    def select_move(self, game_state):
+        """Choose a random valid move that preserves our own eyes"""
+        board = game_state.board
+        tables = _tables_for(board)
+        player = game_state.next_player
+        candidates = list(game_state.empty_points())
+        # Sample candidates without replacement: pick a random one among the
+        # ones left and swap it to the end of the list
+        remaining = len(candidates)
+        while remaining > 0:
+            index = self.rng.randrange(remaining)
+            point = candidates[index]
+            remaining -= 1
+            candidates[index] = candidates[remaining]
+            if _is_eye(board, tables, point, player):
+                continue
+            move = Move.play(point)
+            if game_state.is_valid_move(move):
+                return move
+        # If there are no candidates, pass
+        return Move.pass_turn()
+
+
+# Copy any board into an ArrayBoard. Placing the stones one by one gives the
+# same position, as no string on a legal board is without liberties
+def to_array_board(board):
+    if isinstance(board, ArrayBoard):
+        return board.__deepcopy__()
+    array_board = ArrayBoard(board.num_rows, board.num_cols)
+    for row in range(1, board.num_rows + 1):
+        for col in range(1, board.num_cols + 1):
+            point = Point(row = row, col = col)
+            color = board.get(point)
+            if color is not None:
+                array_board.place_stone(color, point)
+    return array_board
+
+
+# Play a random game from a game state until both players pass, with the same
+# policy as FastRandomBot. The playout uses the simple ko rule: a single stone
+# that just captured a single stone can't be taken back right away. Returns
+# the final ArrayBoard
+def random_playout(game_state, rng = random, max_moves = None):
+    # A pass ends the game if the previous move was a pass too
+    after_pass = game_state.last_move is not None and \
+        game_state.last_move.is_pass
+    return random_playout_board(
+        to_array_board(game_state.board), game_state.next_player,
+        after_pass, rng, max_moves)
+
+
+# Same as random_playout, but starting from an ArrayBoard, which is played on
+# in place. This is what worker processes get, as it is much smaller to send
+# than a GameState with its whole history
+def random_playout_board(board, next_player, after_pass = False,
+                         rng = random, max_moves = None):
+    tables = board.tables
+    if max_moves is None:
+        max_moves = 3 * len(tables.points)
+    color = BLACK if next_player == Player.black else WHITE
+    candidates = [index for index in tables.points
+                  if board.color_at(index) == EMPTY]
+    ko_point = None
+    passes = 1 if after_pass else 0
+    num_moves = 0
+    while passes < 2 and num_moves < max_moves:
+        played = None
+        remaining = len(candidates)
+        while remaining > 0:
+            position = rng.randrange(remaining)
+            index = candidates[position]
+            remaining -= 1
+            # Swap the candidate to the end of the unsampled part, so the
+            # list always holds every empty point
+            candidates[position] = candidates[remaining]
+            candidates[remaining] = index
+            if index == ko_point or board.is_eye_index(color, index) or \
+                    not board.is_legal_index(color, index):
+                continue
+            played = index
+            candidates[remaining] = candidates[-1]
+            candidates.pop()
+            break
+        if played is None:
+            passes += 1
+            ko_point = None
+        else:
+            passes = 0
+            captured = board.play_index(color, played)
+            candidates.extend(captured)
+            # A lone stone with a single liberty that captured a single stone
+            # sets up a ko on the captured point
+            if len(captured) == 1 and board.string_size(played) == 1 and \
+                    board.liberties_at(played) == 1:
+                ko_point = captured[0]
+            else:
+                ko_point = None
+        color = BLACK + WHITE - color
+        num_moves += 1
+    return board
+
+
+# Find the winner of the final board of a playout with area scoring, flood
+# filling the empty regions once with the precomputed neighbours of
+# dlgo.scoring. White gets the komi
+def playout_winner(board, komi = 7.5):
+    return scoring.score_board(board, komi).winner
@@ -0,0 +1,199 @@
+from dlgo.gotypes import Player, Point
+from dlgo.goboard import GoString
+from dlgo import zobrist
+
+# Python ints can hold as many bits as we want, so a whole color plane of a
+# 19x19 board fits in a single int. BitBoard keeps one bitmask for the black
+# stones and one for the white stones, and the empty points are whatever is
+# left. A point is the bit
+#   (row - 1) * (num_cols + 1) + (col - 1)
+# Every row has an extra bit at its end that never belongs to the board. That
+# padding column stops left and right shifts from wrapping a stone around to
+# the next row, so the neighbours of a whole set of points are found with four
+# shifts and a mask.
+# Strings are found with a flood fill that keeps growing a mask into its
+# neighbours of the same color, and liberties are the empty neighbours of a
+# string. Copying a position only means copying two ints and the hash.
+
+
+# Masks and hash codes that only depend on the size of the board are built
+# once and shared by every board of that size
+class BitBoardTables():
+
+    def __init__(self, num_rows, num_cols):
+        self.width = num_cols + 1
+        # Mask with every point of the board set
+        self.on_board = 0
+        # Zobrist hash codes indexed by bit, one table per color
+        table = zobrist.table_for(num_rows, num_cols)
+        self.hash_codes = {
+            Player.black: {},
+            Player.white: {},
+        }
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                bit = self.to_bit(Point(row = row, col = col))
+                self.on_board |= 1 << bit
+                for player in (Player.black, Player.white):
+                    self.hash_codes[player][bit] = \
+                        table.code(Point(row, col), player)
+
+    def to_bit(self, point):
+        return (point.row - 1) * self.width + (point.col - 1)
+
+    def to_point(self, bit):
+        return Point(row = bit // self.width + 1, col = bit % self.width + 1)
+
+    # All the points next to any point of the mask
+    def dilate(self, mask):
+        width = self.width
+        return ((mask << 1) | (mask >> 1) | (mask << width) |
+                (mask >> width)) & self.on_board
+
+    # Grow a seed into the connected points of the given mask
+    def flood_fill(self, seed, mask):
+        region = seed
+        while True:
+            grown = region | (self.dilate(region) & mask)
+            if grown == region:
+                return region
+            region = grown
+
+
+_TABLES = {}
+
+
+def bitboard_tables(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    if key not in _TABLES:
+        _TABLES[key] = BitBoardTables(num_rows, num_cols)
+    return _TABLES[key]
+
+
+# Iterate over the bits set in a mask
+def iter_bits(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class BitBoard():
+
+    # A board is initialized as an empty grid with the specified number of rows
+    # and columns, just like Board
+    def __init__(self, num_rows = 19, num_cols = 19):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._tables = bitboard_tables(num_rows, num_cols)
+        # Stones of each color
+        self._stones = {
+            Player.black: 0,
+            Player.white: 0,
+        }
+        self._hash = zobrist.EMPTY_BOARD
+
+    # Mask of the empty points
+    @property
+    def empty(self):
+        return self._tables.on_board & \
+            ~(self._stones[Player.black] | self._stones[Player.white])
+
+    # Mask of the stones of a player
+    def stones(self, player):
+        return self._stones[player]
+
+    # Board method used for placing stones
+    def place_stone(self, player, point):
+        tables = self._tables
+        # Check that the given point fits in the grid
+        assert self.is_on_grid(point)
+        bit = 1 << tables.to_bit(point)
+        # Check that the given point has not been set yet
+        assert not (bit & (self._stones[Player.black] |
+                           self._stones[Player.white]))
+        self._stones[player] |= bit
+        # We apply the hash code for this point and player
+        self._hash ^= tables.hash_codes[player][tables.to_bit(point)]
+
+        # Look at the enemy strings next to the new stone. Each one is flood
+        # filled once, and removed if it has no empty point around it
+        enemy = player.other
+        enemy_stones = self._stones[enemy]
+        empty = self.empty
+        adjacent_enemy = tables.dilate(bit) & enemy_stones
+        while adjacent_enemy:
+            seed = adjacent_enemy & -adjacent_enemy
+            string = tables.flood_fill(seed, enemy_stones)
+            adjacent_enemy &= ~string
+            if not (tables.dilate(string) & empty):
+                self._remove_string(enemy, string)
+
+    # Remove a string given as a mask of stones
+    def _remove_string(self, player, string):
+        self._stones[player] &= ~string
+        # With zobrist hashing we need to unapply the hash for these stones
+        hash_codes = self._tables.hash_codes[player]
+        for bit in iter_bits(string):
+            self._hash ^= hash_codes[bit]
+
+    # Board method used to determine if a point is within the grid limits
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    # Returns the content of a point on the board (a Player if a stone is on
+    # that point and None otherwise)
+    def get(self, point):
+        if not self.is_on_grid(point):
+            return None
+        bit = 1 << self._tables.to_bit(point)
+        if self._stones[Player.black] & bit:
+            return Player.black
+        if self._stones[Player.white] & bit:
+            return Player.white
+        return None
+
+    # Mask of the string at a point, or 0 if the point is empty
+    def string_mask(self, point):
+        color = self.get(point)
+        if color is None:
+            return 0
+        bit = 1 << self._tables.to_bit(point)
+        return self._tables.flood_fill(bit, self._stones[color])
+
+    # Mask of the liberties of a string
+    def liberties_mask(self, string):
+        return self._tables.dilate(string) & self.empty
+
+    # Number of liberties of the string at a point. Returns 0 for empty points
+    def num_liberties(self, point):
+        return self.liberties_mask(self.string_mask(point)).bit_count()
+
+    # Returns the string of stones at a point (a GoString if a stone is on that
+    # point or None otherwise)
+    def get_go_string(self, point):
+        color = self.get(point)
+        if color is None:
+            return None
+        string = self.string_mask(point)
+        to_point = self._tables.to_point
+        return GoString(
+            color,
+            [to_point(bit) for bit in iter_bits(string)],
+            [to_point(bit) for bit in iter_bits(self.liberties_mask(string))])
+
+    # Utility method that returns the current Zobrist hash
+    def zobrist_hash(self):
+        return self._hash
+
+    # GameState.apply_move deep-copies the board. A copy is just the two masks
+    # and the hash
+    def __deepcopy__(self, memodict={}):
+        board = BitBoard.__new__(BitBoard)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board._tables = self._tables
+        board._stones = dict(self._stones)
+        board._hash = self._hash
+        return board
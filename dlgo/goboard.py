@@ -1,5 +1,7 @@
-from dlgo.gotypes import Player
+from dlgo.gotypes import Player, Point
+from dlgo import scoring
 from dlgo import zobrist
+from dlgo.hamt import PersistentSet
 import copy
 
 # We need a structure to represent the actions a player can take on a turn
@@ -105,8 +107,18 @@ class Board():
         self.num_rows = num_rows
         self.num_cols = num_cols
         self._grid = {}
-        # We now instantiate the board with the hash value for an empty board
+        # We now instantiate the board with the hash value for an empty board,
+        # and keep the table with the hash codes for its size
         self._hash = zobrist.EMPTY_BOARD
+        self._zobrist = zobrist.table_for(num_rows, num_cols)
+        # Features the evaluation functions look at, kept up to date as stones
+        # are placed and captured so a position can be scored without looking
+        # at the board: the stones of each player, the enemy stones each
+        # player has captured, and the sum of the liberties of each player's
+        # strings. A point that is a liberty of two strings counts for both
+        self.stone_counts = {Player.black: 0, Player.white: 0}
+        self.capture_counts = {Player.black: 0, Player.white: 0}
+        self.liberty_totals = {Player.black: 0, Player.white: 0}
 
     # Board method used for placing stones
     def place_stone(self, player, point):
@@ -147,16 +159,21 @@ class Board():
         for same_color_string in adjacent_same_color:
             new_string = new_string.merged_with(same_color_string)
 
+        # The merged strings are replaced by the new one
+        self.stone_counts[player] += 1
+        self.liberty_totals[player] += new_string.num_liberties - sum(
+            string.num_liberties for string in adjacent_same_color)
+
         # For each stone in the new string you change the grid reference of the
         # stone point to the new_string reference
-        for new_string_point in new_string.stones:
-            self._grid[new_string_point] = new_string
+        self._replace_string(new_string)
 
         # We apply the hash code for this point and player
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._hash ^= self._zobrist.code(point, player)
 
         # Reduce liberties of any adjacent strings of the opposite color
         for other_color_string in adjaceent_opposite_color:
+            self.liberty_totals[other_color_string.color] -= 1
             replacement = other_color_string.without_liberty(point)
             # If replacement still has liberties replace the string
             if replacement.num_liberties:
@@ -197,6 +214,15 @@ class Board():
         # Returns the goString for the stone taking the point
         return string
 
+    # Number of liberties of the string at a point, 0 for an empty point. The
+    # other board implementations count them without building a GoString, so
+    # the legality checks of GameState ask for this instead of the string
+    def num_liberties(self, point):
+        string = self._grid.get(point)
+        if string is None:
+            return 0
+        return string.num_liberties
+
     # To remove a stone, we apply its hash to the board once again. This new
     # helper method updates our board grid with the replacement string
     def _replace_string(self, new_string):
@@ -206,6 +232,9 @@ class Board():
     # We have to keep in mind that other stones might gain liberties when
     # removing an enemy string
     def _remove_string(self, string):
+        # The string's liberties were taken off its total before removing it
+        self.stone_counts[string.color] -= len(string.stones)
+        self.capture_counts[string.color.other] += len(string.stones)
         # For each point which belonged to the string
         for point in string.stones:
             # For each neighbour of this point
@@ -218,16 +247,169 @@ class Board():
                 # If is not the same string we are checking
                 if neighbour_string is not string:
                     # replace the string with a new string with more liberties
-                    self._replace_string(neighbour_string.with_liberty(point))
+                    replacement = neighbour_string.with_liberty(point)
+                    self.liberty_totals[neighbour_string.color] += \
+                        replacement.num_liberties - \
+                        neighbour_string.num_liberties
+                    self._replace_string(replacement)
             # Clear the point within the grid
             self._grid[point] = None
             # With zobrist hashing we need to unapply the hash for this move
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
+            self._hash ^= self._zobrist.code(point, string.color)
 
     # Utility method that returns the current Zobrist hash
     def zobrist_hash(self):
         return self._hash
 
+    # GameState.apply_move deep-copies the board. GoStrings are immutable and
+    # the Zobrist table is shared by every board of the same size, so the copy
+    # only needs new dicts
+    def __deepcopy__(self, memodict={}):
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board._copy_state_from(self)
+        return board
+
+    def _copy_state_from(self, board):
+        self._grid = dict(board._grid)
+        self.stone_counts = dict(board.stone_counts)
+        self.capture_counts = dict(board.capture_counts)
+        self.liberty_totals = dict(board.liberty_totals)
+
+
+# Search algorithms visit a huge number of positions, and copying the whole
+# board for each one of them is expensive. A MutableBoard lets a search walk a
+# single board in place: play places a stone and remembers how to take it
+# back, and undo restores the board as it was before the last play.
+# For each play we keep an undo entry with the placed stone, the strings that
+# were merged into it, the strings that were captured and the change in the
+# Zobrist hash. Since GoStrings are immutable, we also keep the string each
+# touched point referenced before the play, so undoing is just putting those
+# references back on the grid.
+class UndoEntry():
+
+    def __init__(self, player, point, merged):
+        self.player = player
+        self.point = point
+        # Friendly strings that were merged into the new stone's string
+        self.merged = merged
+        # Enemy strings removed from the board by the play
+        self.captured = []
+        # XOR of the hashes before and after the play
+        self.hash_delta = 0
+        # Grid references as they were before the play
+        self.previous = {}
+        # Evaluation features as they were before the play
+        self.features = None
+
+
+class MutableBoard(Board):
+
+    def __init__(self, num_rows = 19, num_cols = 19):
+        super().__init__(num_rows, num_cols)
+        self._undo_log = []
+        # Undo entry for the play in progress, if any
+        self._recording = None
+
+    # Place a stone and push an undo entry on the log
+    def play(self, player, point):
+        # Collect the friendly strings the new stone will be merged with
+        merged = []
+        for neighbour in point.neighbours():
+            neighbour_string = self._grid.get(neighbour)
+            if neighbour_string is not None and \
+                    neighbour_string.color == player and \
+                    not any(neighbour_string is s for s in merged):
+                merged.append(neighbour_string)
+        entry = UndoEntry(player, point, merged)
+        entry.features = (dict(self.stone_counts), dict(self.capture_counts),
+                          dict(self.liberty_totals))
+        previous_hash = self._hash
+        # Record every change to the grid while the stone is placed
+        self._recording = entry
+        try:
+            self.place_stone(player, point)
+        finally:
+            self._recording = None
+        entry.hash_delta = previous_hash ^ self._hash
+        self._undo_log.append(entry)
+        return entry
+
+    # Take back the last play and return its undo entry
+    def undo(self):
+        entry = self._undo_log.pop()
+        # Put back every grid reference changed by the play. Points that were
+        # empty are removed from the grid
+        for point, string in entry.previous.items():
+            if string is None:
+                self._grid.pop(point, None)
+            else:
+                self._grid[point] = string
+        # Unapply the hash changes
+        self._hash ^= entry.hash_delta
+        self.stone_counts, self.capture_counts, self.liberty_totals = \
+            entry.features
+        return entry
+
+    # Number of plays that can be taken back
+    @property
+    def num_undo(self):
+        return len(self._undo_log)
+
+    # Before changing a grid reference, remember the first value it had during
+    # the play
+    def _record(self, points):
+        entry = self._recording
+        if entry is None:
+            return
+        for point in points:
+            if point not in entry.previous:
+                entry.previous[point] = self._grid.get(point)
+
+    def _replace_string(self, new_string):
+        self._record(new_string.stones)
+        super()._replace_string(new_string)
+
+    def _remove_string(self, string):
+        self._record(string.stones)
+        if self._recording is not None:
+            self._recording.captured.append(string)
+        super()._remove_string(string)
+
+    # GameState.apply_move deep-copies the board. GoStrings are immutable, so
+    # the copy can share them, and it starts with an empty undo log
+    def __deepcopy__(self, memodict={}):
+        board = MutableBoard.__new__(MutableBoard)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board._zobrist = self._zobrist
+        board._undo_log = []
+        board._recording = None
+        board._hash = self._hash
+        board._copy_state_from(self)
+        return board
+
+
+# The neighbours of every point that are on the board, for each board size.
+# legal_moves looks at the neighbours of every empty point, and building four
+# new Points for each one costs more than the rest of the check
+_NEIGHBOURS = {}
+
+
+def neighbour_table(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    if key not in _NEIGHBOURS:
+        table = {}
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                point = Point(row = row, col = col)
+                table[point] = tuple(
+                    neighbour for neighbour in point.neighbours()
+                    if 1 <= neighbour.row <= num_rows and
+                    1 <= neighbour.col <= num_cols)
+        _NEIGHBOURS[key] = table
+    return _NEIGHBOURS[key]
+
 
 # GameState knows about the board position, the next payer, the previous game
 # state, and the last move that has been played
@@ -239,16 +421,30 @@ class GameState():
         self.next_player = next_player
         self.previous_state = previous
         if self.previous_state is None:
-            # Initialize previous states as an empty frozenset on first init
-            self.previous_states = frozenset()
+            # Initialize previous states as an empty persistent set on first
+            # init
+            self.previous_states = PersistentSet()
         else:
-            # Or else as a filled frozenset with previous frozenset and current
-            # state pair with the color of the player and the Zobrist hash of
-            # the previous game state.
-            self.previous_states = frozenset(
-                previous.previous_states |
-                {(previous.next_player, previous.board.zobrist_hash())})
+            # Or else add the situation of the previous state, the color of
+            # the player and the Zobrist hash of its board, to the set of the
+            # previous state. The persistent set shares its structure with the
+            # one of the previous state, so this doesn't copy the history
+            self.previous_states = previous.previous_states.add(
+                (previous.next_player, previous.board.zobrist_hash()))
         self.last_move = move
+        # Number of passes in a row that ended with the last move. Two of them
+        # end the game
+        self.consecutive_passes = 0
+        if move is not None and move.is_pass:
+            self.consecutive_passes = 1
+            if previous is not None:
+                self.consecutive_passes += previous.consecutive_passes
+        # Stones captured by the last move, worked out the first time they are
+        # needed
+        self._captured_points = None
+        # Empty points and legal moves are computed on demand and cached
+        self._empty_points = None
+        self._legal_moves = None
 
     # Returns the new GameState after applying the move
     def apply_move(self, move):
@@ -264,12 +460,37 @@ class GameState():
         # Return GameState with the new board and the other player
         return GameState(next_board, self.next_player.other, self, move)
 
+    # The stones captured by the last move. The previous board is kept
+    # unchanged, so they are the enemy strings next to the point that were
+    # on it and are gone from ours. Only empty_points needs them, and only
+    # when it can update the empty points of the previous state, so they
+    # are found then instead of on every move
+    @property
+    def captured_points(self):
+        if self._captured_points is None:
+            captured_points = []
+            previous = self.previous_state
+            if previous is not None and self.last_move.is_play:
+                previous_board = previous.board
+                enemy = self.next_player
+                for neighbour in self.last_move.point.neighbours():
+                    if previous_board.is_on_grid(neighbour) and \
+                            previous_board.get(neighbour) == enemy and \
+                            self.board.get(neighbour) is None and \
+                            neighbour not in captured_points:
+                        captured_points.extend(
+                            previous_board.get_go_string(neighbour).stones)
+            self._captured_points = tuple(captured_points)
+        return self._captured_points
+
     # Method used to start a new game
+    # The board can be a MutableBoard when the caller wants to search in place
+    # with play and undo
     @classmethod
-    def new_game(cls, board_size):
+    def new_game(cls, board_size, board_class = Board):
         if isinstance(board_size, int):
             board_size = (board_size, board_size)
-        board = Board(*board_size)
+        board = board_class(*board_size)
         return GameState(board, Player.black, None, None)
 
     # Method used to decide when a game is over
@@ -280,27 +501,52 @@ class GameState():
         # If last move was resign, return true as the game is over
         if self.last_move.is_resign:
             return True
-        # Save last move from previous state
-        second_last_move = self.previous_state.last_move
-        if second_last_move is None:
-            return False
         # If both last and second last moves are pass, end the game
-        return self.last_move.is_pass and second_last_move.is_pass
+        return self.consecutive_passes >= 2
 
-    # Enforcing the self-capture rule by applying the move to a copy of the
-    # board and checking the number of liberties afterwards
+    # The winner of a finished game, or None while it's still going. The
+    # player who resigns loses, otherwise the board is scored with area
+    # scoring and komi
+    def winner(self, komi = scoring.DEFAULT_KOMI):
+        if not self.is_over():
+            return None
+        if self.last_move.is_resign:
+            return self.next_player
+        return self.game_result(komi).winner
+
+    # The area score of the board, as a scoring.GameResult with the margin
+    def game_result(self, komi = scoring.DEFAULT_KOMI):
+        return scoring.compute_game_result(self, komi)
+
+    # Enforcing the self-capture rule without copying the board. A play is a
+    # self capture only when, after it, the new string has no liberties at all.
+    # We can work that out from the neighbours of the point: an empty neighbour
+    # is a liberty, a friendly string with more than one liberty keeps a
+    # liberty after merging, and an enemy string whose last liberty is the
+    # point gets captured, which frees up liberties for the new string
     def is_move_self_capture(self, player, move):
         # If the game is not a play, return False
         if not move.is_play:
             return False
-        # Get a new board where the play will be applied
-        next_board = copy.deepcopy(self.board)
-        # Apply the play and check if is a valid play
-        next_board.place_stone(player, move.point)
-        # Get the string that forms the newly played stone
-        new_string = next_board.get_go_string(move.point)
-        # If the string has no liberties return True, else return False
-        return new_string.num_liberties == 0
+        board = self.board
+        # Visit the neighbours of the point
+        for neighbour in move.point.neighbours():
+            # Skip neighbours outside the grid
+            if not board.is_on_grid(neighbour):
+                continue
+            color = board.get(neighbour)
+            # An empty neighbour is a liberty for the new stone
+            if color is None:
+                return False
+            # A friendly string that has another liberty shares it with us
+            if color == player:
+                if board.num_liberties(neighbour) > 1:
+                    return False
+            # An enemy string in atari gets captured by the play
+            elif board.num_liberties(neighbour) == 1:
+                return False
+        # No liberty can be found, so the play is a self capture
+        return True
 
     # The rule for preventing kos will be that a player may not play a stone
     # that would recreate a previous game state, where the game state includes
@@ -312,19 +558,46 @@ class GameState():
     def situation(self):
         return (self.next_player, self.board)
 
+    # Instead of applying the play to a copy of the board, we compute the hash
+    # the board would have after it. Zobrist hashes are built with XOR, so the
+    # new hash is the current one with the code of the new stone applied, and
+    # the codes of every stone that gets captured unapplied
     def does_move_violate_ko(self, player, move):
         # If the game is not a play, return False
         if not move.is_play:
             return False
-        # Get a new board where the play will be applied
-        next_board = copy.deepcopy(self.board)
-        # Apply the play and save the 'next' situation
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        board = self.board
+        codes = zobrist.table_for(board.num_rows, board.num_cols)
+        # Apply the hash code of the new stone
+        next_hash = board.zobrist_hash() ^ codes.code(move.point, player)
+        # Unapply the hash of every captured stone
+        for string in self._captured_strings(player, move.point):
+            for point in string.stones:
+                next_hash ^= codes.code(point, player.other)
+        next_situation = (player.other, next_hash)
         # Check if the hash has already been stored, meaning the game state
         # has already happend and we would be violating the ko rule
         return next_situation in self.previous_states
 
+    # Enemy strings in atari next to the point are captured when the player
+    # plays on it. We keep the ones already visited so a string touching the
+    # point twice is only returned once
+    def _captured_strings(self, player, point):
+        board = self.board
+        captured = []
+        enemy = player.other
+        for neighbour in point.neighbours():
+            # Only enemy strings in atari are captured. Counting liberties
+            # first saves building the string of the other neighbours
+            if not board.is_on_grid(neighbour) or \
+                    board.get(neighbour) != enemy or \
+                    board.num_liberties(neighbour) != 1:
+                continue
+            neighbour_string = board.get_go_string(neighbour)
+            if neighbour_string not in captured:
+                captured.append(neighbour_string)
+        return captured
+
     # Decide whether a move is valid by using knowledge from both ko and
     # self capture
     def is_valid_move(self, move):
@@ -341,3 +614,74 @@ class GameState():
             not self.is_move_self_capture(self.next_player, move) and
             # Doesn't violate the ko rule
             not self.does_move_violate_ko(self.next_player, move))
+
+    # Returns the set of empty points of the board. When the previous state
+    # already knows its empty points, we only take out the point that was
+    # played and add back the stones it captured
+    def empty_points(self):
+        if self._empty_points is None:
+            previous = self.previous_state
+            if previous is not None and previous._empty_points is not None:
+                if self.last_move.is_play:
+                    self._empty_points = \
+                        (previous._empty_points - {self.last_move.point}) | \
+                        frozenset(self.captured_points)
+                else:
+                    self._empty_points = previous._empty_points
+            else:
+                self._empty_points = frozenset(
+                    Point(row = row, col = col)
+                    for row in range(1, self.board.num_rows + 1)
+                    for col in range(1, self.board.num_cols + 1)
+                    if self.board.get(Point(row = row, col = col)) is None)
+        return self._empty_points
+
+    # Returns all the legal moves: every legal play, passing and resigning.
+    # Only empty points are candidates, and a single look at the neighbours
+    # of each one tells what else has to be checked. With an
+    # empty neighbour the play can't be a self capture. With no enemy string
+    # in atari next to it, it captures nothing, so the hash after the play
+    # is the current one with the code of the new stone, and the ko check is
+    # one lookup in the history. That lookup can't be skipped: with the
+    # history of every previous position, even a play that captures nothing
+    # could recreate one of them. Only the few plays that capture go through
+    # does_move_violate_ko.
+    # The result is cached, and callers get their own copy of the list
+    def legal_moves(self):
+        if self._legal_moves is None:
+            if self.is_over():
+                self._legal_moves = []
+                return []
+            board = self.board
+            player = self.next_player
+            enemy = player.other
+            codes = zobrist.table_for(board.num_rows, board.num_cols)
+            neighbours = neighbour_table(board.num_rows, board.num_cols)
+            board_hash = board.zobrist_hash()
+            previous_states = self.previous_states
+            empty_points = self.empty_points()
+            moves = []
+            for point in sorted(empty_points):
+                move = Move.play(point)
+                has_liberty = False
+                captures = False
+                for neighbour in neighbours[point]:
+                    if neighbour in empty_points:
+                        has_liberty = True
+                    elif board.get(neighbour) == enemy and \
+                            board.num_liberties(neighbour) == 1:
+                        captures = True
+                if not has_liberty and \
+                        self.is_move_self_capture(player, move):
+                    continue
+                if captures:
+                    if self.does_move_violate_ko(player, move):
+                        continue
+                elif (enemy, board_hash ^ codes.code(point, player)) in \
+                        previous_states:
+                    continue
+                moves.append(move)
+            moves.append(Move.pass_turn())
+            moves.append(Move.resign())
+            self._legal_moves = moves
+        return list(self._legal_moves)
@@ -0,0 +1,316 @@
+from array import array
+from dlgo.gotypes import Player, Point
+from dlgo.goboard import GoString
+from dlgo import zobrist
+
+# The dict based Board stores a GoString for every Point on the grid. Every
+# time we look at the neighbours of a point we build four new Point objects,
+# and we have to check each one of them against the limits of the board.
+# ArrayBoard stores the same information in flat arrays instead. The grid is
+# padded with a border of off-board points, so a board of N rows and M cols is
+# stored in (N + 2) x (M + 2) cells, and a point is just the index
+#   row * (M + 2) + col
+# With the border in place the neighbours of any point on the board are found
+# by adding fixed offsets to its index, without any bounds checks. Points only
+# exist at the edge of the API, in place_stone, get and get_go_string.
+
+# Values stored in the color array. Stones use the value of their Player
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+BORDER = 3
+
+
+# Tables that only depend on the size of the board are built once and shared
+# by every board of that size
+class BoardTables():
+
+    def __init__(self, num_rows, num_cols):
+        self.width = num_cols + 2
+        self.size = (num_rows + 2) * self.width
+        # Offsets to the top, bottom, left and right neighbours
+        self.neighbour_offsets = (-self.width, self.width, -1, 1)
+        # Offsets to the four diagonals
+        self.diagonal_offsets = (
+            -self.width - 1, -self.width + 1, self.width - 1, self.width + 1)
+        # Color array of an empty board, with the border already in place
+        self.empty_colors = array('b', [BORDER] * self.size)
+        # Index of every point on the board
+        self.points = []
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                index = row * self.width + col
+                self.empty_colors[index] = EMPTY
+                self.points.append(index)
+        # Zobrist hash codes indexed by point index, one table per color
+        table = zobrist.table_for(num_rows, num_cols)
+        self.hash_codes = {}
+        for player in (Player.black, Player.white):
+            codes = [0] * self.size
+            for index in self.points:
+                codes[index] = table.code(self.to_point(index), player)
+            self.hash_codes[player.value] = codes
+
+    # Translate a point index back to a Point
+    def to_point(self, index):
+        return Point(row = index // self.width, col = index % self.width)
+
+
+_TABLES = {}
+
+
+def board_tables(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    if key not in _TABLES:
+        _TABLES[key] = BoardTables(num_rows, num_cols)
+    return _TABLES[key]
+
+
+class ArrayBoard():
+
+    # A board is initialized as an empty grid with the specified number of rows
+    # and columns, just like Board
+    def __init__(self, num_rows = 19, num_cols = 19):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._tables = board_tables(num_rows, num_cols)
+        # Color of every cell, including the border
+        self._colors = array('b', self._tables.empty_colors)
+        # Id of the string each stone belongs to, 0 for empty points
+        self._string_ids = array('i', [0] * self._tables.size)
+        # Stones and liberties of each string, as point indexes
+        self._stones = {}
+        self._liberties = {}
+        self._next_id = 1
+        self._hash = zobrist.EMPTY_BOARD
+
+    # Translate a Point into its index in the arrays
+    def _index(self, point):
+        return point.row * self._tables.width + point.col
+
+    # Board method used for placing stones
+    def place_stone(self, player, point):
+        # Check that the given point fits in the grid
+        assert self.is_on_grid(point)
+        self.play_index(player.value, self._index(point))
+
+    # Place a stone given its color value and point index. Returns the list of
+    # captured stones
+    def play_index(self, color, index):
+        colors = self._colors
+        string_ids = self._string_ids
+        # Check that the given point has not been set yet
+        assert colors[index] == EMPTY
+        liberties = set()
+        adjacent_same_color = []
+        adjacent_opposite_color = []
+
+        # Visit the neighbours, the border makes any bound check unnecessary
+        for offset in self._tables.neighbour_offsets:
+            neighbour = index + offset
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY:
+                liberties.add(neighbour)
+            elif neighbour_color == color:
+                string_id = string_ids[neighbour]
+                if string_id not in adjacent_same_color:
+                    adjacent_same_color.append(string_id)
+            elif neighbour_color != BORDER:
+                string_id = string_ids[neighbour]
+                if string_id not in adjacent_opposite_color:
+                    adjacent_opposite_color.append(string_id)
+
+        # Place the stone. It joins the biggest adjacent friendly string, or
+        # starts a new one
+        colors[index] = color
+        if adjacent_same_color:
+            adjacent_same_color.sort(
+                key = lambda string_id: len(self._stones[string_id]))
+            new_id = adjacent_same_color.pop()
+        else:
+            new_id = self._next_id
+            self._next_id += 1
+            self._stones[new_id] = []
+            self._liberties[new_id] = set()
+        string_ids[index] = new_id
+        new_stones = self._stones[new_id]
+        new_liberties = self._liberties[new_id]
+        new_stones.append(index)
+        new_liberties |= liberties
+        # Merge the rest of adjacent friendly strings into it, relabelling
+        # only the stones of the smaller strings
+        for string_id in adjacent_same_color:
+            for stone in self._stones[string_id]:
+                string_ids[stone] = new_id
+            new_stones.extend(self._stones.pop(string_id))
+            new_liberties |= self._liberties.pop(string_id)
+        new_liberties.discard(index)
+
+        # We apply the hash code for this point and player
+        self._hash ^= self._tables.hash_codes[color][index]
+
+        # Reduce liberties of any adjacent strings of the opposite color, and
+        # remove the ones that run out of liberties
+        captured = []
+        for string_id in adjacent_opposite_color:
+            string_liberties = self._liberties[string_id]
+            string_liberties.discard(index)
+            if not string_liberties:
+                captured.extend(self._remove_string(string_id))
+        return captured
+
+    # Remove a captured string, giving its points back as liberties to the
+    # strings around it. Returns the removed stones
+    def _remove_string(self, string_id):
+        colors = self._colors
+        string_ids = self._string_ids
+        offsets = self._tables.neighbour_offsets
+        stones = self._stones.pop(string_id)
+        del self._liberties[string_id]
+        hash_codes = self._tables.hash_codes[colors[stones[0]]]
+        # Clear the stones first, so the removed string doesn't get liberties
+        for stone in stones:
+            colors[stone] = EMPTY
+            string_ids[stone] = 0
+            # With zobrist hashing we need to unapply the hash for this stone
+            self._hash ^= hash_codes[stone]
+        for stone in stones:
+            for offset in offsets:
+                neighbour_id = string_ids[stone + offset]
+                if neighbour_id:
+                    self._liberties[neighbour_id].add(stone)
+        return stones
+
+    # Check if a play is legal, ignoring ko. The play is not a self capture if
+    # the point has an empty neighbour, a friendly string next to it has
+    # another liberty, or an enemy string next to it is in atari
+    def is_legal_index(self, color, index):
+        colors = self._colors
+        if colors[index] != EMPTY:
+            return False
+        for offset in self._tables.neighbour_offsets:
+            neighbour = index + offset
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY:
+                return True
+            if neighbour_color == BORDER:
+                continue
+            num_liberties = len(self._liberties[self._string_ids[neighbour]])
+            if neighbour_color == color:
+                if num_liberties > 1:
+                    return True
+            elif num_liberties == 1:
+                return True
+        return False
+
+    # Same eye definition as agent.helpers.is_point_an_eye: every neighbour is
+    # a friendly stone, and we control three out of four corners, or all of
+    # them on the edge of the board
+    def is_eye_index(self, color, index):
+        colors = self._colors
+        if colors[index] != EMPTY:
+            return False
+        for offset in self._tables.neighbour_offsets:
+            neighbour_color = colors[index + offset]
+            if neighbour_color != color and neighbour_color != BORDER:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for offset in self._tables.diagonal_offsets:
+            corner_color = colors[index + offset]
+            if corner_color == color:
+                friendly_corners += 1
+            elif corner_color == BORDER:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    # Color value of a point index
+    def color_at(self, index):
+        return self._colors[index]
+
+    # Number of stones in the string at a point index
+    def string_size(self, index):
+        return len(self._stones[self._string_ids[index]])
+
+    # Number of liberties of the string at a point index
+    def liberties_at(self, index):
+        return len(self._liberties[self._string_ids[index]])
+
+    # Shared tables for the size of this board
+    @property
+    def tables(self):
+        return self._tables
+
+    # Board method used to determine if a point is within the grid limits
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    # Returns the content of a point on the board (a Player if a stone is on
+    # that point and None otherwise)
+    def get(self, point):
+        if not self.is_on_grid(point):
+            return None
+        color = self._colors[self._index(point)]
+        if color == EMPTY:
+            return None
+        return Player(color)
+
+    # Returns the string of stones at a point (a GoString if a stone is on that
+    # point or None otherwise). The GoString is built from the arrays on every
+    # call, so it is only meant for the edge of the API
+    def get_go_string(self, point):
+        if not self.is_on_grid(point):
+            return None
+        string_id = self._string_ids[self._index(point)]
+        if not string_id:
+            return None
+        to_point = self._tables.to_point
+        return GoString(
+            Player(self._colors[self._index(point)]),
+            [to_point(stone) for stone in self._stones[string_id]],
+            [to_point(liberty) for liberty in self._liberties[string_id]])
+
+    # Number of liberties of the string at a point, without building a
+    # GoString. Returns 0 for empty points
+    def num_liberties(self, point):
+        string_id = self._string_ids[self._index(point)]
+        if not string_id:
+            return 0
+        return len(self._liberties[string_id])
+
+    # Utility method that returns the current Zobrist hash
+    def zobrist_hash(self):
+        return self._hash
+
+    # GameState.apply_move deep-copies the board. Copying the arrays and the
+    # containers of each string is enough, as everything inside them is an int
+    def __deepcopy__(self, memodict={}):
+        board = ArrayBoard.__new__(ArrayBoard)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board._tables = self._tables
+        board._colors = array('b', self._colors)
+        board._string_ids = array('i', self._string_ids)
+        board._stones = {
+            string_id: list(stones)
+            for string_id, stones in self._stones.items()}
+        board._liberties = {
+            string_id: set(liberties)
+            for string_id, liberties in self._liberties.items()}
+        board._next_id = self._next_id
+        board._hash = self._hash
+        return board
+
+    # The shared tables are left out when pickling, and looked up again on the
+    # other side
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_tables']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tables = board_tables(self.num_rows, self.num_cols)
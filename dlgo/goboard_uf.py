@@ -0,0 +1,237 @@
+from array import array
+from dlgo.gotypes import Player
+from dlgo.goboard import GoString
+from dlgo.goboard_array import board_tables, EMPTY, BORDER
+from dlgo import zobrist
+
+# When two strings merge, the frozenset based GoString builds new sets with
+# all the stones and liberties of both, and the board then points every stone
+# of the group to the new string. Late in a 19x19 game that means work
+# proportional to the size of the group on every move.
+# A union-find (disjoint set) structure avoids that: every stone points to a
+# parent stone of its string, and the root of the tree represents the whole
+# string. Merging two strings only links one root under the other, and finding
+# the string of a stone follows the parent links, compressing the path as it
+# goes so that later lookups are almost immediate.
+# For each root we keep the stones and the liberties of the string as bitsets
+# stored in Python ints, one bit per point index. Merging liberties is a single
+# OR, and counting them a single bit_count.
+
+
+# Keeps track of the strings on a board using point indexes
+class StringTracker():
+
+    def __init__(self, size):
+        # Parent of every point, roots are their own parent
+        self._parent = array('i', range(size))
+        # Number of stones, stones bitset and liberties bitset of every root
+        self._sizes = {}
+        self._stones = {}
+        self._liberties = {}
+
+    # Find the root of the string a stone belongs to. We use path halving:
+    # every visited stone is linked to its grandparent
+    def find(self, index):
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Start a new string with a single stone and the given liberties bitset
+    def add(self, index, liberties):
+        self._parent[index] = index
+        self._sizes[index] = 1
+        self._stones[index] = 1 << index
+        self._liberties[index] = liberties
+        return index
+
+    # Merge the strings of two roots and return the root of the result. The
+    # smaller string is linked under the bigger one to keep the trees flat
+    def union(self, root, other_root):
+        if root == other_root:
+            return root
+        if self._sizes[root] < self._sizes[other_root]:
+            root, other_root = other_root, root
+        self._parent[other_root] = root
+        self._sizes[root] += self._sizes.pop(other_root)
+        self._stones[root] |= self._stones.pop(other_root)
+        self._liberties[root] |= self._liberties.pop(other_root)
+        return root
+
+    # Remove the string of a root, returning its stones bitset
+    def remove(self, root):
+        del self._sizes[root]
+        del self._liberties[root]
+        return self._stones.pop(root)
+
+    def add_liberty(self, root, index):
+        self._liberties[root] |= 1 << index
+
+    def remove_liberty(self, root, index):
+        self._liberties[root] &= ~(1 << index)
+
+    def liberties(self, root):
+        return self._liberties[root]
+
+    def num_liberties(self, root):
+        return self._liberties[root].bit_count()
+
+    def stones(self, root):
+        return self._stones[root]
+
+    # A copy shares nothing mutable: the arrays are copied and the bitsets are
+    # ints
+    def copy(self):
+        tracker = StringTracker.__new__(StringTracker)
+        tracker._parent = array('i', self._parent)
+        tracker._sizes = dict(self._sizes)
+        tracker._stones = dict(self._stones)
+        tracker._liberties = dict(self._liberties)
+        return tracker
+
+
+# Iterate over the point indexes set in a bitset
+def iter_bits(bits):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+# A Board backed by a StringTracker. It uses the same padded point index as
+# ArrayBoard, and keeps the color of each point in a flat array
+class UnionFindBoard():
+
+    def __init__(self, num_rows = 19, num_cols = 19):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._tables = board_tables(num_rows, num_cols)
+        self._colors = array('b', self._tables.empty_colors)
+        self._strings = StringTracker(self._tables.size)
+        self._hash = zobrist.EMPTY_BOARD
+
+    # Translate a Point into its index in the arrays
+    def _index(self, point):
+        return point.row * self._tables.width + point.col
+
+    # Board method used for placing stones
+    def place_stone(self, player, point):
+        # Check that the given point fits in the grid
+        assert self.is_on_grid(point)
+        index = self._index(point)
+        colors = self._colors
+        strings = self._strings
+        # Check that the given point has not been set yet
+        assert colors[index] == EMPTY
+        color = player.value
+        liberties = 0
+        adjacent_same_color = []
+        adjacent_opposite_color = []
+
+        # Visit the neighbours, the border makes any bound check unnecessary
+        for offset in self._tables.neighbour_offsets:
+            neighbour = index + offset
+            neighbour_color = colors[neighbour]
+            if neighbour_color == EMPTY:
+                liberties |= 1 << neighbour
+            elif neighbour_color == BORDER:
+                continue
+            else:
+                root = strings.find(neighbour)
+                if neighbour_color == color:
+                    if root not in adjacent_same_color:
+                        adjacent_same_color.append(root)
+                elif root not in adjacent_opposite_color:
+                    adjacent_opposite_color.append(root)
+
+        # Place the stone and link it with the adjacent friendly strings
+        colors[index] = color
+        root = strings.add(index, liberties)
+        for same_color_root in adjacent_same_color:
+            root = strings.union(root, same_color_root)
+        # The point is no longer a liberty of the merged string
+        strings.remove_liberty(root, index)
+
+        # We apply the hash code for this point and player
+        self._hash ^= self._tables.hash_codes[color][index]
+
+        # Reduce liberties of any adjacent strings of the opposite color, and
+        # remove the ones that run out of liberties
+        for other_color_root in adjacent_opposite_color:
+            strings.remove_liberty(other_color_root, index)
+            if not strings.liberties(other_color_root):
+                self._remove_string(other_color_root)
+
+    # Remove a captured string, giving its points back as liberties to the
+    # strings around it
+    def _remove_string(self, root):
+        colors = self._colors
+        strings = self._strings
+        offsets = self._tables.neighbour_offsets
+        hash_codes = self._tables.hash_codes[colors[root]]
+        stones = list(iter_bits(strings.remove(root)))
+        # Clear the stones first, so the removed string doesn't get liberties
+        for stone in stones:
+            colors[stone] = EMPTY
+            # With zobrist hashing we need to unapply the hash for this stone
+            self._hash ^= hash_codes[stone]
+        for stone in stones:
+            for offset in offsets:
+                neighbour = stone + offset
+                if colors[neighbour] != EMPTY and colors[neighbour] != BORDER:
+                    strings.add_liberty(strings.find(neighbour), stone)
+
+    # Board method used to determine if a point is within the grid limits
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    # Returns the content of a point on the board (a Player if a stone is on
+    # that point and None otherwise)
+    def get(self, point):
+        if not self.is_on_grid(point):
+            return None
+        color = self._colors[self._index(point)]
+        if color == EMPTY:
+            return None
+        return Player(color)
+
+    # Returns the string of stones at a point (a GoString if a stone is on that
+    # point or None otherwise), built from the bitsets of its root
+    def get_go_string(self, point):
+        if self.get(point) is None:
+            return None
+        index = self._index(point)
+        root = self._strings.find(index)
+        to_point = self._tables.to_point
+        return GoString(
+            Player(self._colors[index]),
+            [to_point(stone)
+             for stone in iter_bits(self._strings.stones(root))],
+            [to_point(liberty)
+             for liberty in iter_bits(self._strings.liberties(root))])
+
+    # Number of liberties of the string at a point, without building a
+    # GoString. Returns 0 for empty points
+    def num_liberties(self, point):
+        index = self._index(point)
+        if self._colors[index] == EMPTY:
+            return 0
+        return self._strings.num_liberties(self._strings.find(index))
+
+    # Utility method that returns the current Zobrist hash
+    def zobrist_hash(self):
+        return self._hash
+
+    # GameState.apply_move deep-copies the board. The color array and the
+    # tracker are all we need to copy
+    def __deepcopy__(self, memodict={}):
+        board = UnionFindBoard.__new__(UnionFindBoard)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board._tables = self._tables
+        board._colors = array('b', self._colors)
+        board._strings = self._strings.copy()
+        board._hash = self._hash
+        return board
@@ -0,0 +1,147 @@
+# A persistent set based on a hash array mapped trie (HAMT).
+# Every GameState needs the set of situations that happened before it, in
+# order to enforce the ko rule. Building a new frozenset for every state costs
+# time and memory proportional to the number of moves played, and a search
+# tree pays that at every node. A persistent set never changes once built:
+# adding an item returns a new set that shares almost all of its structure
+# with the old one. Both states can then keep using their own set.
+# The trie consumes the hash of an item 5 bits at a time. Each node has up to
+# 32 slots, but only stores the ones in use, with a bitmap telling which slots
+# are present. Adding an item copies only the nodes on its path, and the trie
+# is never more than a few levels deep for the few hundred situations of a
+# game, so both adding and looking up take constant time in practice.
+
+BITS = 5
+MASK = (1 << BITS) - 1
+# Hashes are folded to 64 bits, so after this shift we run out of bits
+MAX_SHIFT = 64
+HASH_MASK = (1 << MAX_SHIFT) - 1
+
+
+# An inner node of the trie. Its slots are either items, other nodes or
+# collision buckets
+class _Node():
+    __slots__ = ('bitmap', 'slots')
+
+    def __init__(self, bitmap, slots):
+        self.bitmap = bitmap
+        self.slots = slots
+
+
+# Items whose hashes are equal in all of their 64 bits
+class _Bucket():
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+def _slot_position(bitmap, bit):
+    return (bitmap & (bit - 1)).bit_count()
+
+
+def _contains(node, item, item_hash, shift):
+    while True:
+        bit = 1 << ((item_hash >> shift) & MASK)
+        if not node.bitmap & bit:
+            return False
+        slot = node.slots[_slot_position(node.bitmap, bit)]
+        if isinstance(slot, _Node):
+            node = slot
+            shift += BITS
+        elif isinstance(slot, _Bucket):
+            return item in slot.items
+        else:
+            return slot == item
+
+
+# Return a new node with the item added, or the same node if it was already
+# there
+def _add(node, item, item_hash, shift):
+    bit = 1 << ((item_hash >> shift) & MASK)
+    position = _slot_position(node.bitmap, bit)
+    slots = node.slots
+    # Free slot, the item goes straight in
+    if not node.bitmap & bit:
+        return _Node(
+            node.bitmap | bit,
+            slots[:position] + (item,) + slots[position:])
+    slot = slots[position]
+    if isinstance(slot, _Node):
+        new_slot = _add(slot, item, item_hash, shift + BITS)
+    elif isinstance(slot, _Bucket):
+        if item in slot.items:
+            return node
+        new_slot = _Bucket(slot.items + (item,))
+    elif slot == item:
+        return node
+    else:
+        # Two different items in the same slot: push them one level down, or
+        # into a bucket if there is no hash left to tell them apart
+        slot_hash = hash(slot) & HASH_MASK
+        if shift + BITS >= MAX_SHIFT or slot_hash == item_hash:
+            new_slot = _Bucket((slot, item))
+        else:
+            new_slot = _add(
+                _add(_EMPTY_NODE, slot, slot_hash, shift + BITS),
+                item, item_hash, shift + BITS)
+    if new_slot is slot:
+        return node
+    return _Node(
+        node.bitmap,
+        slots[:position] + (new_slot,) + slots[position + 1:])
+
+
+class PersistentSet():
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, items = ()):
+        self._root = _EMPTY_NODE
+        self._size = 0
+        for item in items:
+            new_set = self.add(item)
+            self._root = new_set._root
+            self._size = new_set._size
+
+    # Returns a new set with the item added. The current set doesn't change
+    def add(self, item):
+        root = _add(self._root, item, hash(item) & HASH_MASK, 0)
+        if root is self._root:
+            return self
+        new_set = PersistentSet.__new__(PersistentSet)
+        new_set._root = root
+        new_set._size = self._size + 1
+        return new_set
+
+    def __contains__(self, item):
+        return _contains(self._root, item, hash(item) & HASH_MASK, 0)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for slot in node.slots:
+                if isinstance(slot, _Node):
+                    stack.append(slot)
+                elif isinstance(slot, _Bucket):
+                    yield from slot.items
+                else:
+                    yield slot
+
+    # The set never changes, so copies can share it
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memodict={}):
+        return self
+
+    # Hashes of some items, like enums, change from one process to another,
+    # so the set is pickled as its items and rebuilt on the other side
+    def __reduce__(self):
+        return (PersistentSet, (tuple(self),))
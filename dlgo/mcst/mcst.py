@@ -10,33 +10,71 @@
 #   - unvisited_moves: A list of all legal moves from this position that aren't
 #   yet part of the tree. Whenever we add a new node to the tree, we pull one
 #   move out of unvisited_moves, generate a new MCTS node for it and add it to
-#   the children list.
+#   the children list. The list is only built the first time a search asks
+#   for it: a new leaf only gets a rollout, and most leaves are never
+#   expanded, so finding their legal moves would be wasted work.
+#   - virtual_losses: When several rollouts run at the same time, every one of
+#   them counts as a loss for this node until its result comes back. That makes
+#   the tree search spread the rollouts across different branches instead of
+#   sending them all down the same path.
+# With a transposition table, nodes for the same position share their win
+# counts and rollouts through a NodeStats object from the table. Every node
+# keeps its own virtual losses, edge visits and child visits, which belong to
+# its path: the edge visits are the rollouts recorded through this node, and
+# the child visits of a node add up the edge visits of its children. The UCT
+# exploration term only looks at those, so it stays consistent when a child's
+# shared stats also count rollouts from other paths.
+from dlgo.mcst.transpositions import NodeStats
+import random
+
 
 class MCTSNode(object):
 
     # Initialization of a node within the tree
-    def __init__(self, game_state, parent = None, move = None):
+    def __init__(self, game_state, parent = None, move = None,
+                 transpositions = None):
         self.game_state = game_state
         self.parent = parent
         self.move = move
-        self.win_counts = {
-            Player.black = 0
-            Player.white = 0
-        }
-        self.num_rollouts = 0
+        self.transpositions = transpositions
+        if transpositions is None:
+            self.stats = NodeStats()
+        else:
+            self.stats = transpositions.lookup(game_state)
+        self.virtual_losses = 0
+        # Rollouts recorded through this node, from this parent
+        self.edge_visits = 0
+        # Sum of the edge visit counts of the children, kept up to date as
+        # they change so choosing a child doesn't have to add them up
+        self.child_visits = 0
         self.children = []
-        self.unvisited_moves = game_state.legal_moves()
+        self._unvisited_moves = None
+
+    @property
+    def unvisited_moves(self):
+        if self._unvisited_moves is None:
+            self._unvisited_moves = self.game_state.legal_moves()
+        return self._unvisited_moves
+
+    @property
+    def win_counts(self):
+        return self.stats.win_counts
+
+    @property
+    def num_rollouts(self):
+        return self.stats.num_rollouts
 
     # A node can be modified in two ways. We can add a new child to the tree
-    def add_random_children(self):
+    def add_random_child(self):
         # Get a random index
-        index = random.radint(0, len(self.unvisited_moves) - 1)
+        index = random.randint(0, len(self.unvisited_moves) - 1)
         # Get a random move using this index
         new_move = self.unvisited_moves.pop(index)
         # Apply the move and get the new game state
         new_game_state = self.game_state.apply_move(new_move)
         # Get the new node for this game state
-        new_node = MCTSNode(new_game_state, self, new_move)
+        new_node = MCTSNode(new_game_state, self, new_move,
+                            self.transpositions)
         # Save it as a child
         self.children.append(new_node)
         # Return the new node
@@ -44,10 +82,19 @@ class MCTSNode(object):
 
     # Or we can update its rollout stats
     def record_win(self, winner):
-        # Update the winner count
-        self.win_counts[winner] += 1
-        # Update the rollout count
-        self.num_rollouts += 1
+        # Update the winner count and the rollout count
+        self.stats.record_win(winner)
+        self.edge_visits += 1
+        if self.parent is not None:
+            self.parent.child_visits += 1
+
+    # Or record a batch of rollouts, given as a dict of wins per player
+    def record_wins(self, wins):
+        count = sum(wins.values())
+        self.stats.record_wins(wins)
+        self.edge_visits += count
+        if self.parent is not None:
+            self.parent.child_visits += count
 
     # Finally we can add three convenience methods to access useful properties
     # of our node:
@@ -63,6 +110,40 @@ class MCTSNode(object):
         return self.game_state.is_over()
 
     #   - winning_frac: returns the fraction of rollouts that were won by a
-    #   given player.
+    #   given player. Rollouts still in progress count as losses for the
+    #   player who chose this node
     def winning_frac(self, player):
-        return float(self.win_counts[player])/ float(self.num_rollouts)
+        return float(self.wins_for(player)) / float(self.visit_count)
+
+    #   - wins_for: the wins of a player that winning_frac divides by the
+    #   visit count
+    def wins_for(self, player):
+        wins = self.win_counts[player]
+        if player == self.game_state.next_player:
+            wins += self.virtual_losses
+        return wins
+
+    #   - visit_count: the number of rollouts through this node, counting the
+    #   ones still in progress
+    @property
+    def visit_count(self):
+        return self.num_rollouts + self.virtual_losses
+
+    #   - edge_visit_count: the same count, but only for the rollouts that
+    #   went through this node from its parent. Without a transposition
+    #   table it's the visit count
+    @property
+    def edge_visit_count(self):
+        return self.edge_visits + self.virtual_losses
+
+    # Mark a rollout in progress through this node, and take the mark back
+    # when its result is recorded
+    def add_virtual_loss(self):
+        self.virtual_losses += 1
+        if self.parent is not None:
+            self.parent.child_visits += 1
+
+    def remove_virtual_loss(self):
+        self.virtual_losses -= 1
+        if self.parent is not None:
+            self.parent.child_visits -= 1
@@ -1,8 +1,8 @@
 # We can now implement the algorithm creating an MCTS agent: We start by
 # creating a new tree. The root node is the currenta gem state. Then we
-# repeteadly generate rollouts. In this implementation, we loop for a fixed
-# number of rounds for each turn; other implementations may run for a specific
-# length of time instead.
+# repeteadly generate rollouts. By default we loop for a fixed number of
+# rounds for each turn; with a time budget we run for a specific length of
+# time instead.
 # Each round begins by walking down the tree until we find a node where we can
 # add a child (any board position that has a legal move that isn't yet in the
 # tree). The select_move function hides the work of choosing the best branch to
@@ -14,71 +14,592 @@
 # implementation of simulate_random_game is identical to the bot_v_bot example.
 # Finally we update the win counts of the newly created node and all its
 # ancestors.
+# Rollouts are independent of each other, so they can also run in parallel
+# (tree parallelization). With num_workers greater than one, the agent keeps
+# walking down the shared tree and hands each new leaf to a pool of worker
+# processes, which play the random games. Every leaf waiting for its result
+# holds a virtual loss on its path, so the next walks down the tree pick other
+# branches. When a result comes back we take the virtual losses off and record
+# the win on the path, in the main process, so the tree needs no locking.
+# Root parallelization is the other option: every worker builds its own tree
+# from the same game state, with its own random seed, and only sends back the
+# win counts and rollouts of the children of its root. We add those up and
+# pick the move from the totals. Nothing is shared while searching, and only a
+# few numbers per move travel between processes.
+# Leaf parallelization can be added to either: with leaf_rollouts greater than
+# one, every new leaf gets that many random games at once instead of one. The
+# board is converted for the playouts once, and the results go up the tree in
+# a single pass, so the walk down the tree and the backup are shared by the
+# whole batch. With worker processes the batch is a single task.
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dlgo.agent import base as agent
+from dlgo.agent.naive_fast import random_playout, random_playout_board, \
+    playout_winner, to_array_board
+from dlgo.goboard import GameState, Move
+from dlgo.gotypes import Point
+from dlgo.mcst.mcst import MCTSNode
+from dlgo.mcst.transpositions import TranspositionTable
+from dlgo.mcst.uct import best_uct_index
+import math
+import random
+import time
+
+
 class MCTSAgent(agent.Agent):
 
-    # We define the function that selects a child based on its UTC score
-    # calculated using the helper function at the end of this file
+    # The agent runs num_rounds rollouts per move. The temperature is the
+    # exploration constant c of the UCT score,
+    #   win fraction + c * sqrt(log(parent rollouts) / child rollouts)
+    # so 0 only exploits and larger values explore more. It is the only
+    # exploration constant, and is passed as is to uct_scores. With num_workers
+    # greater than one, rollouts run in that many processes. The parallel mode
+    # is either 'tree', with up to num_workers * in_flight_per_worker rollouts
+    # in progress at once on the shared tree, or 'root', with a tree per
+    # worker.
+    # With a time_budget_ms, every move searches until that many milliseconds
+    # have passed, and num_rounds, if given, is only an upper bound. With
+    # early_stop the search also ends as soon as the most visited move can't
+    # be caught up in the time left, and that move is played.
+    # With reuse_tree the agent keeps its tree between moves. On the next call
+    # it follows the moves played since then down the tree, and searches on
+    # from the node it reaches, keeping all the rollouts below it.
+    # With a transposition_table_size, nodes for the same position share
+    # their stats through a TranspositionTable of that many positions, which
+    # is kept between moves.
+    # leaf_rollouts is the number of random games played from every new leaf.
+    # num_rounds still counts random games, so there are fewer leaves
+    def __init__(self, num_rounds, temperature, num_workers = 1,
+                 in_flight_per_worker = 2, komi = 7.5, parallel = 'tree',
+                 time_budget_ms = None, early_stop = False,
+                 reuse_tree = False, transposition_table_size = None,
+                 leaf_rollouts = 1):
+        agent.Agent.__init__(self)
+        assert parallel in ('tree', 'root')
+        assert num_rounds is not None or time_budget_ms is not None
+        assert leaf_rollouts >= 1
+        self.num_rounds = num_rounds
+        self.time_budget_ms = time_budget_ms
+        self.early_stop = early_stop
+        self.temperature = temperature
+        self.num_workers = num_workers
+        self.parallel = parallel
+        self.in_flight_per_worker = in_flight_per_worker
+        self.komi = komi
+        self.leaf_rollouts = leaf_rollouts
+        self.reuse_tree = reuse_tree
+        # Rollouts and nodes carried over from the previous move, and nodes
+        # thrown away, when the tree is reused
+        self.reused_rollouts = 0
+        self.reused_nodes = 0
+        self.discarded_nodes = 0
+        self._tree = None
+        self.transpositions = None
+        if transposition_table_size is not None:
+            self.transpositions = TranspositionTable(transposition_table_size)
+        self._pool = None
+
+    # We define the function that selects a child based on its UTC score.
+    # The scores of all the children are computed at once by best_uct_index,
+    # which gives the same choice as calling uct_score on each child
     def select_child(self, node):
-        # Get total number of rollouts from the node's children
-        total_rollouts = sum(child.num_rollouts for child in node.children)
-        # Start best score at -1
-        best_score = -1
-        # And best child as None
-        best_child = None
-        # Iterate trough the children and look for the best UCT score
-        for child in node.children:
-            # Calculate the score
-            score = uct_score(
-                total_rollouts,
-                child.num_rollouts,
-                child.winning_frac(node.game_state.next_player),
+        children = node.children
+        player = node.game_state.next_player
+        # The total number of rollouts from the node's children, counting the
+        # ones in progress, is kept up to date by the node
+        if self.transpositions is None:
+            index = best_uct_index(
+                [child.wins_for(player) for child in children],
+                [child.visit_count for child in children],
+                node.child_visits,
                 self.temperature)
-            # If the score is better than the best score recorded
-            if score > best_score:
-                # Update score
-                best_score = score
-                # And store the child
-                best_child = child
-        # Return the chosen child
-        return best_child
+            return children[index]
+        # With transpositions a child's stats also count the rollouts of the
+        # other paths to its position. They give the win fraction, while the
+        # exploration term compares the visits through this node only, which
+        # add up to its child visits
+        index = best_uct_index(
+            [child.wins_for(player) for child in children],
+            [child.edge_visit_count for child in children],
+            node.child_visits,
+            self.temperature,
+            [child.visit_count for child in children])
+        return children[index]
 
     # Function that returns the selected node
     def select_move(self, game_state):
-        # Initialize the tree creating a root node from current game_state
-        root = MCTSNode(game_state)
-        # Loop for a number of rounds (this can be changed to time)
-        for i in range(self.num_rounds):
-            # The starting node will be the root
-            node = root
-            # Look for the deepest child that is not a leaf
-            while (not node.can_add_child()) and (not node.is_terminal()):
-                node = self.select_child(node)
-            # If the node can have children, add a new child to the tree
-            if node.can_add_child():
-                node = node.add_random_child()
-            # Simulate a random game from this node
-            winner = self.simulate_random_game(node.game_state)
-            # Propagate the score upt the tree
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
-        # After we are done looping, we have to select the best move by looking
-        # at the scores
+        # Time budgeted searches run one rollout after the other
+        if self.time_budget_ms is not None:
+            search = self.start_search(game_state)
+            search.run(time_budget_ms = self.time_budget_ms,
+                       max_rounds = self.num_rounds,
+                       early_stop = self.early_stop)
+            return search.best_move()
+        if self.num_workers > 1 and self.parallel == 'root':
+            return self._select_move_root_parallel(game_state)
+        # Initialize the tree creating a root node from current game_state, or
+        # reusing the tree from the previous move
+        root = self.root_for(game_state)
+        if self.num_workers > 1:
+            self._run_parallel_rollouts(root, self.num_rounds)
+        else:
+            self._run_rollouts(root, self.num_rounds)
+        return self.best_move(root, game_state.next_player)
+
+    # Returns the root to search from. Without tree reuse it's a new node.
+    # Otherwise we look for the game state below the root of the last search
+    def root_for(self, game_state):
+        root = None
+        self.reused_rollouts = 0
+        self.reused_nodes = 0
+        self.discarded_nodes = 0
+        if self.reuse_tree and self._tree is not None:
+            root = self._advance_tree(game_state)
+        if root is None:
+            root = MCTSNode(game_state,
+                            transpositions = self.transpositions)
+        if self.reuse_tree:
+            self._tree = root
+        return root
+
+    # Follow the moves played since the last search down the tree. Returns the
+    # node for the game state, or None if the tree doesn't have it
+    def _advance_tree(self, game_state):
+        old_root = self._tree
+        self._tree = None
+        # Collect the moves from the old root to the game state. Only a few
+        # moves can have been played since the last search
+        moves = []
+        state = game_state
+        while state is not None and state is not old_root.game_state and \
+                len(moves) < MAX_REUSE_MOVES:
+            moves.append(state.last_move)
+            state = state.previous_state
+        node = old_root
+        if state is not old_root.game_state:
+            node = None
+        for move in reversed(moves):
+            if node is None:
+                break
+            node = _child_for_move(node, move)
+        # Throw away everything that is not below the new root
+        self.discarded_nodes = _discard_tree(old_root, keep = node)
+        if node is None:
+            return None
+        node.parent = None
+        # The node gets the caller's game state, which is the same position
+        node.game_state = game_state
+        self.reused_rollouts = node.num_rollouts
+        self.reused_nodes = _count_nodes(node)
+        return node
+
+    # Start an anytime search from the game state. The search runs only when
+    # asked to, and can give its best move at any point
+    def start_search(self, game_state):
+        return MCTSSearch(self, game_state)
+
+    # Walk down the tree until we find a node where we can add a child, and
+    # add it
+    def select_leaf(self, root):
+        # The starting node will be the root
+        node = root
+        # Look for the deepest child that is not a leaf
+        while (not node.can_add_child()) and (not node.is_terminal()):
+            node = self.select_child(node)
+        # If the node can have children, add a new child to the tree
+        if node.can_add_child():
+            node = node.add_random_child()
+        return node
+
+    # Run rollouts one leaf after the other
+    def _run_rollouts(self, root, num_rounds):
+        # Loop until we have played num_rounds random games (this can be
+        # changed to time)
+        done = 0
+        while done < num_rounds:
+            node = self.select_leaf(root)
+            count = min(self.leaf_rollouts, num_rounds - done)
+            # Simulate random games from this node
+            wins = self.simulate_random_games(node.game_state, count)
+            # Propagate the scores up the tree
+            self._backup_wins(node, wins)
+            done += count
+
+    # Run rollouts in the pool of worker processes, keeping the pool busy
+    def _run_parallel_rollouts(self, root, num_rounds):
+        pool = self._get_pool()
+        max_in_flight = self.num_workers * self.in_flight_per_worker
+        pending = {}
+        started = 0
+        while started < num_rounds or pending:
+            # Send new leaves to the workers until enough rollouts are in
+            # progress
+            while started < num_rounds and len(pending) < max_in_flight:
+                node = self.select_leaf(root)
+                count = min(self.leaf_rollouts, num_rounds - started)
+                started += count
+                # Terminal nodes don't need a rollout
+                if node.is_terminal():
+                    wins = self.simulate_random_games(node.game_state, count)
+                    self._backup_wins(node, wins)
+                    continue
+                self._add_virtual_loss(node)
+                future = pool.submit(
+                    _rollout_worker,
+                    self._rollout_task(node.game_state, count))
+                pending[future] = node
+            if not pending:
+                continue
+            # Record the results that are ready
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                node = pending.pop(future)
+                self._remove_virtual_loss(node)
+                self._backup_wins(node, future.result())
+
+    # Every worker searches its own tree with its share of the rounds. We add
+    # up the stats of each move and choose the same way best_move does
+    def _select_move_root_parallel(self, game_state):
+        pool = self._get_pool()
+        player = game_state.next_player
+        rounds_per_worker = -(-self.num_rounds // self.num_workers)
+        position = _position_task(game_state)
+        settings = self._worker_settings()
+        futures = [
+            pool.submit(
+                _root_search_worker, position, rounds_per_worker,
+                self.temperature, settings, random.getrandbits(64))
+            for _ in range(self.num_workers)
+        ]
+        wins = {}
+        rollouts = {}
+        for future in futures:
+            for move_key, move_wins, move_rollouts in future.result():
+                wins[move_key] = wins.get(move_key, 0) + move_wins
+                rollouts[move_key] = \
+                    rollouts.get(move_key, 0) + move_rollouts
+        best_key = None
+        best_percentage = -1.0
+        for move_key in rollouts:
+            percentage = float(wins[move_key]) / float(rollouts[move_key])
+            if percentage > best_percentage:
+                best_percentage = percentage
+                best_key = move_key
+        if best_key is None:
+            return None
+        return _key_to_move(best_key)
+
+    # Propagate a batch of results, given as wins per player, up the tree
+    def _backup_wins(self, node, wins):
+        while node is not None:
+            node.record_wins(wins)
+            node = node.parent
+
+    def _add_virtual_loss(self, node):
+        while node is not None:
+            node.add_virtual_loss()
+            node = node.parent
+
+    def _remove_virtual_loss(self, node):
+        while node is not None:
+            node.remove_virtual_loss()
+            node = node.parent
+
+    # What a worker needs to play random games: the board as an ArrayBoard,
+    # the next player, whether the last move was a pass, the komi, a seed and
+    # the number of games
+    def _rollout_task(self, game_state, count = 1):
+        after_pass = game_state.last_move is not None and \
+            game_state.last_move.is_pass
+        return (to_array_board(game_state.board), game_state.next_player,
+                after_pass, self.komi, random.getrandbits(64), count)
+
+    # The settings every worker tree is searched with in root parallel mode,
+    # as keyword arguments for MCTSAgent. Each worker searches on its own,
+    # so it gets its own transposition table of the same size
+    def _worker_settings(self):
+        settings = {
+            'komi': self.komi,
+            'leaf_rollouts': self.leaf_rollouts,
+        }
+        if self.transpositions is not None:
+            settings['transposition_table_size'] = \
+                self.transpositions.max_size
+        return settings
+
+    # The pool is created the first time it is needed and kept between moves
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.num_workers)
+        return self._pool
+
+    # Shut down the worker processes, if any
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # After we are done looping, we have to select the best move by looking
+    # at the scores
+    def best_move(self, root, player):
         best_move = None
         best_percentage = -1.0
         # Loop through the children looking for the best move
         for child in root.children:
             # Get percentage of wins over loses
-            child_percentage = child.winning_frac(game_state.next_player)
+            child_percentage = child.winning_frac(player)
             # If the score is better than the last best score recorded
             if child_percentage > best_percentage:
                 # Update the last best score
                 best_percentage = child_percentage
                 # Store the move
-                best_move = child_move
+                best_move = child.move
         # Return the selected move
         return best_move
 
+    # Play a random game from the game state and return the winner. A finished
+    # game already has its winner, and every playout is decided by area
+    # scoring with the agent's komi
+    def simulate_random_game(self, game_state):
+        if game_state.is_over():
+            return game_state.winner(self.komi)
+        return playout_winner(random_playout(game_state), self.komi)
+
+    # Play count random games from the game state and return the wins of
+    # each player. The board is converted once, and every game is played on a
+    # copy of it
+    def simulate_random_games(self, game_state, count):
+        if count == 1:
+            return {self.simulate_random_game(game_state): 1}
+        if game_state.is_over():
+            # Every game would end the same way
+            return {self.simulate_random_game(game_state): count}
+        last_move = game_state.last_move
+        after_pass = last_move is not None and last_move.is_pass
+        return _random_games(
+            to_array_board(game_state.board), game_state.next_player,
+            after_pass, self.komi, random, count)
+
+
+# An anytime search: rollouts are added to the tree in as many calls to run as
+# we want, and best_move returns the move the agent would choose with the
+# rollouts done so far. stop can be called from another thread to end the
+# current run early
+class MCTSSearch():
+
+    # Number of leaves searched between checks for early stopping
+    CHECK_EVERY = 8
+
+    def __init__(self, mcts_agent, game_state):
+        self.agent = mcts_agent
+        self.game_state = game_state
+        self.root = mcts_agent.root_for(game_state)
+        self.num_rounds = 0
+        self.elapsed = 0.0
+        self.stopped_early = False
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    # Run rollouts until the time budget is spent, max_rounds rollouts are
+    # done, or stop is called, whichever comes first. Returns the number of
+    # rollouts done in this call.
+    # The clock is read before every leaf, and a new leaf is only started
+    # when the average time of the rollouts so far says it ends before the
+    # deadline. With leaf_rollouts above one, the last leaf gets only as many
+    # random games as there is time left for. Reading the clock costs far
+    # less than a rollout
+    def run(self, time_budget_ms = None, max_rounds = None,
+            early_stop = False):
+        assert time_budget_ms is not None or max_rounds is not None
+        self._stopped = False
+        self.stopped_early = False
+        start = time.perf_counter()
+        deadline = None
+        if time_budget_ms is not None:
+            deadline = start + time_budget_ms / 1000.0
+        done = 0
+        leaves = 0
+        while not self._stopped:
+            if max_rounds is not None and done >= max_rounds:
+                break
+            count = self.agent.leaf_rollouts
+            if max_rounds is not None:
+                count = min(count, max_rounds - done)
+            now = time.perf_counter()
+            if deadline is not None and done > 0:
+                fit = int((deadline - now) / ((now - start) / done))
+                if fit < 1:
+                    break
+                count = min(count, fit)
+            if early_stop and leaves > 0 and leaves % self.CHECK_EVERY == 0 \
+                    and self._decided(done, now - start, deadline,
+                                      max_rounds, now):
+                self.stopped_early = True
+                break
+            self.agent._run_rollouts(self.root, count)
+            done += count
+            leaves += 1
+        self.num_rounds += done
+        self.elapsed += time.perf_counter() - start
+        return done
+
+    # The most visited move is decided when the rollouts we can still do, at
+    # the current rate, can't give the second most visited move as many visits
+    def _decided(self, done, spent, deadline, max_rounds, now):
+        visits = sorted(
+            (child.num_rollouts for child in self.root.children),
+            reverse = True)
+        # Moves not yet in the tree have no visits
+        if self.root.can_add_child() or len(visits) < 2:
+            visits.append(0)
+        if len(visits) < 2:
+            return True
+        remaining = None
+        if deadline is not None:
+            rate = done / spent if spent > 0 else 0.0
+            remaining = rate * (deadline - now)
+        if max_rounds is not None:
+            left = max_rounds - done
+            remaining = left if remaining is None else min(remaining, left)
+        return visits[0] - visits[1] > remaining
+
+    # The move the agent would choose right now. Stopping early only makes
+    # sure the most visited move can't be overtaken, so a search that
+    # stopped early plays that move rather than the best win fraction
+    def best_move(self):
+        if self.stopped_early:
+            return most_visited_move(self.root)
+        return self.agent.best_move(self.root, self.game_state.next_player)
+
+
+# The move of the child with the most rollouts
+def most_visited_move(root):
+    best_move = None
+    best_visits = -1
+    for child in root.children:
+        if child.num_rollouts > best_visits:
+            best_visits = child.num_rollouts
+            best_move = child.move
+    return best_move
+
+
+# How many moves back we look for the root of the previous search
+MAX_REUSE_MOVES = 8
+
+
+def _same_move(move, other):
+    return move.is_pass == other.is_pass and \
+        move.is_resign == other.is_resign and move.point == other.point
+
+
+def _child_for_move(node, move):
+    for child in node.children:
+        if _same_move(child.move, move):
+            return child
+    return None
+
+
+def _count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+# Break up a tree, except for the subtree under keep, so its nodes are freed
+# right away instead of waiting for the cycle collector. Returns the number of
+# nodes thrown away
+def _discard_tree(root, keep = None):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is keep:
+            continue
+        count += 1
+        stack.extend(node.children)
+        node.children = []
+        node.parent = None
+        node.game_state = None
+    return count
+
+
+# Play count random games from an ArrayBoard, each on its own copy, and
+# return the wins of each player
+def _random_games(board, next_player, after_pass, komi, rng, count):
+    wins = {}
+    for i in range(count):
+        final = random_playout_board(
+            board.__deepcopy__(), next_player, after_pass, rng)
+        winner = playout_winner(final, komi)
+        wins[winner] = wins.get(winner, 0) + 1
+    return wins
+
+
+# Rollouts run by the worker processes
+def _rollout_worker(task):
+    board, next_player, after_pass, komi, seed, count = task
+    rng = random.Random(seed)
+    return _random_games(board, next_player, after_pass, komi, rng, count)
+
+
+# Moves are sent between processes as small tuples
+def _move_to_key(move):
+    if move.is_play:
+        return (move.point.row, move.point.col)
+    if move.is_pass:
+        return 'pass'
+    return 'resign'
+
+
+def _key_to_move(move_key):
+    if move_key == 'pass':
+        return Move.pass_turn()
+    if move_key == 'resign':
+        return Move.resign()
+    return Move.play(Point(*move_key))
+
+
+# A game state is sent to the workers without its chain of previous states:
+# only the board, the next player, the last move, the number of passes in a
+# row, which is all is_over looks at, and the set of previous situations for
+# the ko rule
+def _position_task(game_state):
+    return (game_state.board, game_state.next_player,
+            game_state.last_move, game_state.consecutive_passes,
+            game_state.previous_states)
+
+
+# The rebuilt game state has no previous state, and gets the passes and the
+# previous situations of the one that was sent
+def _position_from_task(task):
+    board, next_player, last_move, consecutive_passes, previous_states = task
+    game_state = GameState(board, next_player, None, last_move)
+    game_state.consecutive_passes = consecutive_passes
+    game_state.previous_states = previous_states
+    return game_state
+
+
+# Search run by every worker in root parallel mode, with the agent's settings.
+# Returns, for every child of the root, its move, the wins of the player to
+# move and its rollouts
+def _root_search_worker(position, num_rounds, temperature, settings, seed):
+    random.seed(seed)
+    game_state = _position_from_task(position)
+    searcher = MCTSAgent(num_rounds, temperature, **settings)
+    root = searcher.root_for(game_state)
+    searcher._run_rollouts(root, num_rounds)
+    player = game_state.next_player
+    return [
+        (_move_to_key(child.move), child.win_counts[player],
+         child.num_rollouts)
+        for child in root.children
+    ]
+
 
 # We have to select a branch to explore using the BCT formula so we have to use
 # a function like this one (which implements the UCT formulae):
@@ -0,0 +1,170 @@
+# Every MCTSNode keeps a full GameState, with its own copy of the board, plus
+# a dict, two lists and the node object itself. Trees with hundreds of
+# thousands of nodes take gigabytes of memory that way.
+# ArrayTree stores the same tree as a structure of arrays instead: one flat
+# array per field, and a node is just an index into them. The children of a
+# node are created all at once when it is first expanded, so they take a
+# contiguous range of indexes and the node only needs to know where its range
+# starts and how long it is. A node costs a few dozens of bytes this way.
+# Game states are not stored at all: the search rebuilds them by replaying the
+# moves from the root while it walks down the tree, which it has to do anyway.
+from array import array
+from dlgo.goboard import Move
+from dlgo.gotypes import Point
+from dlgo.mcst.mcts_agent import MCTSAgent
+from dlgo.mcst.uct import best_uct_index
+import random
+
+
+class ArrayTree():
+
+    # Fields of every node, with their array type codes
+    FIELDS = (
+        ('parent', 'i'),
+        # Index of the move that led to the node, see move_index
+        ('move', 'i'),
+        # Rollouts through the node and rollouts won by the player who made
+        # the move that led to it
+        ('visits', 'i'),
+        ('wins', 'i'),
+        # Sum of the visits of the children
+        ('child_visits', 'i'),
+        # Range of the children, -1 until the node is expanded
+        ('first_child', 'i'),
+        ('num_children', 'i'),
+        # Number of children already visited. Children are shuffled when they
+        # are created, so the next one to visit is always the next in range
+        ('num_visited', 'i'),
+    )
+
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.num_points = num_rows * num_cols
+        for name, typecode in self.FIELDS:
+            setattr(self, name, array(typecode))
+        # The root has no parent and no move
+        self._add_nodes(-1, [-1])
+
+    def __len__(self):
+        return len(self.parent)
+
+    # Bytes used by every node
+    def bytes_per_node(self):
+        return sum(getattr(self, name).itemsize for name, _ in self.FIELDS)
+
+    # Moves are stored as indexes: points first, then pass and resign
+    def move_index(self, move):
+        if move.is_play:
+            return (move.point.row - 1) * self.num_cols + move.point.col - 1
+        if move.is_pass:
+            return self.num_points
+        return self.num_points + 1
+
+    def index_to_move(self, index):
+        if index == self.num_points:
+            return Move.pass_turn()
+        if index == self.num_points + 1:
+            return Move.resign()
+        return Move.play(Point(row = index // self.num_cols + 1,
+                               col = index % self.num_cols + 1))
+
+    def _add_nodes(self, parent, moves):
+        count = len(moves)
+        self.parent.extend([parent] * count)
+        self.move.extend(moves)
+        for name in ('visits', 'wins', 'child_visits', 'num_children',
+                     'num_visited'):
+            getattr(self, name).extend([0] * count)
+        self.first_child.extend([-1] * count)
+
+    def is_expanded(self, node):
+        return self.first_child[node] >= 0
+
+    # Create the children of a node for the given moves, in random order
+    def expand(self, node, moves):
+        indexes = [self.move_index(move) for move in moves]
+        random.shuffle(indexes)
+        self.first_child[node] = len(self.parent)
+        self.num_children[node] = len(indexes)
+        self._add_nodes(node, indexes)
+
+    def children(self, node):
+        first = self.first_child[node]
+        if first < 0:
+            return range(0)
+        return range(first, first + self.num_children[node])
+
+
+# An MCTSAgent that keeps its tree in an ArrayTree. It searches the same way:
+# a node gets a new child, chosen at random, while it has unvisited moves, and
+# otherwise the search goes down to the child with the best UCT score.
+# It runs a fixed number of rounds, one after the other, so it only takes the
+# options that make sense for that. Time budgets, workers, leaf batches, tree
+# reuse and transposition tables are only supported by MCTSAgent
+class ArrayMCTSAgent(MCTSAgent):
+
+    def __init__(self, num_rounds, temperature, komi = 7.5):
+        assert num_rounds is not None
+        MCTSAgent.__init__(self, num_rounds, temperature, komi = komi)
+
+    def select_move(self, game_state):
+        tree = ArrayTree(game_state.board.num_rows, game_state.board.num_cols)
+        for i in range(self.num_rounds):
+            self._run_round(tree, game_state)
+        self.last_tree = tree
+        return self._best_child_move(tree)
+
+    def _run_round(self, tree, root_state):
+        node = 0
+        state = root_state
+        path = [0]
+        # Player who made the move leading to each node of the path
+        movers = [None]
+        while not state.is_over():
+            if not tree.is_expanded(node):
+                tree.expand(node, state.legal_moves())
+            if tree.num_visited[node] < tree.num_children[node]:
+                # Add the next unvisited child and stop there
+                child = tree.first_child[node] + tree.num_visited[node]
+                tree.num_visited[node] += 1
+                movers.append(state.next_player)
+                state = state.apply_move(tree.index_to_move(tree.move[child]))
+                path.append(child)
+                break
+            child = self._select_child_index(tree, node)
+            movers.append(state.next_player)
+            state = state.apply_move(tree.index_to_move(tree.move[child]))
+            node = child
+            path.append(node)
+        # Simulate a random game from this node
+        winner = self.simulate_random_game(state)
+        # Propagate the score up the tree
+        for node, mover in zip(path, movers):
+            tree.visits[node] += 1
+            if mover == winner:
+                tree.wins[node] += 1
+            if node:
+                tree.child_visits[tree.parent[node]] += 1
+
+    # Child with the best UCT score. All children have been visited, and their
+    # stats are contiguous slices of the arrays
+    def _select_child_index(self, tree, node):
+        first = tree.first_child[node]
+        last = first + tree.num_children[node]
+        return first + best_uct_index(
+            tree.wins[first:last], tree.visits[first:last],
+            tree.child_visits[node], self.temperature)
+
+    # Same choice as MCTSAgent.best_move: the child with the best win fraction
+    def _best_child_move(self, tree):
+        best_move = None
+        best_percentage = -1.0
+        for child in tree.children(0):
+            if tree.visits[child] == 0:
+                continue
+            percentage = float(tree.wins[child]) / tree.visits[child]
+            if percentage > best_percentage:
+                best_percentage = percentage
+                best_move = tree.index_to_move(tree.move[child])
+        return best_move
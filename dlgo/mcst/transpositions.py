@@ -0,0 +1,84 @@
+# The same position can be reached by playing the same moves in a different
+# order. MCTSNode keeps the stats of every path on its own, so the rollouts
+# through one of them teach the search nothing about the others.
+# A TranspositionTable hands out the stats of a position, keyed by the player
+# to move, the Zobrist hash of the board and the number of passes in a row
+# that led to it. After a pass, one more pass ends the game, so the same board
+# right after a pass is a different position. Nodes for the same position share
+# the same NodeStats object, so a rollout recorded through any of them counts
+# for all of them.
+# The table holds at most max_size positions. When it is full the position
+# that was looked up the longest time ago is dropped. Nodes that still use its
+# stats keep them, they only stop being shared with new nodes.
+# The key doesn't include the ko history, so two nodes sharing stats can
+# differ in what is legal from them. Their stats are close enough for
+# choosing where to search.
+# The shared stats are only used for the value of a position. How often a
+# node was tried from its parent is counted by the node itself, see MCTSNode.
+from collections import OrderedDict
+from dlgo.gotypes import Player
+
+
+# Win counts and rollouts of a position
+class NodeStats():
+
+    def __init__(self):
+        self.win_counts = {
+            Player.black: 0,
+            Player.white: 0,
+        }
+        self.num_rollouts = 0
+
+    def record_win(self, winner):
+        self.win_counts[winner] += 1
+        self.num_rollouts += 1
+
+    # Record several rollouts at once, from a dict of wins per player
+    def record_wins(self, wins):
+        for player, count in wins.items():
+            self.win_counts[player] += count
+            self.num_rollouts += count
+
+
+class TranspositionTable():
+
+    def __init__(self, max_size = 100000):
+        assert max_size > 0
+        self.max_size = max_size
+        self._stats = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._stats)
+
+    def __contains__(self, game_state):
+        return position_key(game_state) in self._stats
+
+    # Stats of the position of the game state, created if the table doesn't
+    # have them yet
+    def lookup(self, game_state):
+        key = position_key(game_state)
+        stats = self._stats.get(key)
+        if stats is not None:
+            self.hits += 1
+            # The position is now the most recently used
+            self._stats.move_to_end(key)
+            return stats
+        self.misses += 1
+        stats = NodeStats()
+        self._stats[key] = stats
+        if len(self._stats) > self.max_size:
+            # Drop the least recently used position
+            self._stats.popitem(last = False)
+            self.evictions += 1
+        return stats
+
+    def clear(self):
+        self._stats.clear()
+
+
+def position_key(game_state):
+    return (game_state.next_player, game_state.board.zobrist_hash(),
+            game_state.consecutive_passes)
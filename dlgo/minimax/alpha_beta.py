@@ -0,0 +1,243 @@
+from dlgo.agent.base import Agent
+from dlgo.agent.evaluators import stone_diff
+from dlgo.agent.helpers import MAX_SCORE, MIN_SCORE
+import time
+
+# alpha_beta_result in agent.helpers searches the whole tree again for every
+# move, and has no memory of the positions it has already seen. On a 9x9
+# board that makes anything past depth 2 too slow to play with. This search
+# adds the usual tools on top of alpha-beta:
+#   - Iterative deepening: we search to depth 1, then 2, and so on until the
+#   maximum depth or the time budget. Every iteration is cheap compared to the
+#   next one, and it tells the next one which moves to look at first. When the
+#   time runs out in the middle of an iteration, we play the best move of the
+#   last finished one.
+#   - A transposition table keyed by the player to move, the Zobrist hash
+#   of the board and the number of passes in a row. For every position searched it keeps the depth, the score,
+#   whether the score is exact or only a bound, and the best move. A position
+#   reached again, by another move order or in the next iteration, is either
+#   answered from the table or searched with its best move first.
+#   - Killer moves: the last two moves that caused a cutoff at every ply. A
+#   move that refutes one line often refutes its siblings too.
+#   - The history heuristic: every cutoff adds depth * depth to the score of
+#   its move, and the remaining moves are tried in order of that score.
+# Good ordering is what makes alpha-beta prune: with the best move first, it
+# looks at around the square root of the nodes plain minimax does.
+# The search is written as negamax: scores are from the point of view of the
+# player to move, and flip sign from one ply to the next.
+
+# Kinds of score stored in the transposition table. A score that caused a
+# cutoff is only a lower bound of the real one, and a score that didn't reach
+# alpha is only an upper bound
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Number of nodes searched between checks of the clock
+CHECK_EVERY = 256
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# What the transposition table keeps for a position
+class TableEntry():
+
+    __slots__ = ('depth', 'score', 'bound', 'best_move')
+
+    def __init__(self, depth, score, bound, best_move):
+        self.depth = depth
+        self.score = score
+        self.bound = bound
+        self.best_move = best_move
+
+
+# Moves are compared by their point, with None for a pass
+def _move_key(move):
+    return move.point
+
+
+# The same board right after a pass is a different position: one more pass
+# ends the game from it. So the passes in a row that led to the position are
+# part of the key, as they are for the MCTS transposition table
+def _position_key(game_state):
+    return (game_state.next_player, game_state.board.zobrist_hash(),
+            game_state.consecutive_passes)
+
+
+class AlphaBetaSearch():
+
+    # eval_fn scores a position for the player to move. The default,
+    # stone_diff, gives the same scores as capture_diff, without looking at
+    # the board when it is a goboard.Board. The transposition table holds up
+    # to table_size positions, and is emptied when it's full
+    def __init__(self, eval_fn = stone_diff, table_size = 1000000):
+        self.eval_fn = eval_fn
+        self.table_size = table_size
+        self.table = {}
+        self.killers = []
+        self.history = {}
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = None
+
+    # Search the game state to max_depth, or until time_budget_ms milliseconds
+    # have passed. Returns the best move and its score from the deepest
+    # finished iteration
+    def search(self, game_state, max_depth, time_budget_ms = None):
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = None
+        if time_budget_ms is not None:
+            self._deadline = time.perf_counter() + time_budget_ms / 1000.0
+        # Killers and history are only good for the current position
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = {}
+        best_move = None
+        best_score = MIN_SCORE
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_root(game_state, depth)
+            except SearchTimeout:
+                break
+            best_move, best_score = move, score
+            self.depth_reached = depth
+            # A won or lost game won't change with a deeper search
+            if abs(score) >= MAX_SCORE:
+                break
+        if best_move is None:
+            best_move = self._ordered_moves(game_state, None, 0)[0]
+        return best_move, best_score
+
+    def _search_root(self, game_state, depth):
+        entry = self.table.get(_position_key(game_state))
+        table_move = None if entry is None else entry.best_move
+        alpha = MIN_SCORE - 1
+        beta = MAX_SCORE + 1
+        best_move = None
+        for move in self._ordered_moves(game_state, table_move, 0):
+            score = -self._alpha_beta(
+                game_state.apply_move(move), depth - 1, -beta, -alpha, 1)
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+        self._store(game_state, depth, alpha, EXACT, best_move)
+        return best_move, alpha
+
+    def _alpha_beta(self, game_state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self._deadline is not None and self.nodes % CHECK_EVERY == 0 and \
+                time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        if game_state.is_over():
+            return self._game_over_score(game_state)
+        if depth == 0:
+            return self.eval_fn(game_state)
+        key = _position_key(game_state)
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry.best_move
+            # A result from a search at least as deep can answer right away
+            if entry.depth >= depth:
+                if entry.bound == EXACT:
+                    return entry.score
+                if entry.bound == LOWER_BOUND and entry.score >= beta:
+                    return entry.score
+                if entry.bound == UPPER_BOUND and entry.score <= alpha:
+                    return entry.score
+        original_alpha = alpha
+        best_so_far = MIN_SCORE - 1
+        best_move = None
+        for move in self._ordered_moves(game_state, table_move, ply):
+            score = -self._alpha_beta(
+                game_state.apply_move(move), depth - 1, -beta, -alpha,
+                ply + 1)
+            if score > best_so_far:
+                best_so_far = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                # The opponent won't let us get here, no need to look at the
+                # rest of the moves
+                self._record_cutoff(move, depth, ply)
+                break
+        if best_so_far <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_so_far >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._store(game_state, depth, best_so_far, bound, best_move)
+        return best_so_far
+
+    # The player who resigned loses. A game that ended with two passes is
+    # scored with the evaluation function, like any other leaf: the area
+    # score of GameState.winner would count a half-played board as final,
+    # and let komi alone decide the search
+    def _game_over_score(self, game_state):
+        if game_state.last_move.is_resign:
+            return MAX_SCORE
+        return self.eval_fn(game_state)
+
+    # The move from the table first, then the killers of the ply, then the
+    # rest by history score. A search never needs to consider resigning
+    def _ordered_moves(self, game_state, table_move, ply):
+        moves = [move for move in game_state.legal_moves()
+                 if not move.is_resign]
+        first = []
+        if table_move is not None:
+            first.append(_move_key(table_move))
+        if ply < len(self.killers):
+            for killer in self.killers[ply]:
+                if killer is not None and killer not in first:
+                    first.append(killer)
+        history = self.history
+
+        def priority(move):
+            key = _move_key(move)
+            if key in first:
+                return (0, first.index(key))
+            return (1, -history.get(key, 0))
+        moves.sort(key = priority)
+        return moves
+
+    def _record_cutoff(self, move, depth, ply):
+        key = _move_key(move)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+        # A pass is always tried anyway, and would push a real killer out
+        if key is not None and ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != key:
+                killers[1] = killers[0]
+                killers[0] = key
+
+    # Keep the deepest result of every position
+    def _store(self, game_state, depth, score, bound, best_move):
+        key = _position_key(game_state)
+        entry = self.table.get(key)
+        if entry is not None and entry.depth > depth:
+            return
+        if entry is None and len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = TableEntry(depth, score, bound, best_move)
+
+
+# An agent that picks its moves with an AlphaBetaSearch. The table is kept
+# between moves, so the positions searched for the last move help with this
+# one
+class AlphaBetaAgent(Agent):
+
+    def __init__(self, max_depth, eval_fn = stone_diff,
+                 time_budget_ms = None, table_size = 1000000):
+        Agent.__init__(self)
+        self.max_depth = max_depth
+        self.time_budget_ms = time_budget_ms
+        self.searcher = AlphaBetaSearch(eval_fn, table_size)
+
+    def select_move(self, game_state):
+        move, _ = self.searcher.search(
+            game_state, self.max_depth, self.time_budget_ms)
+        return move
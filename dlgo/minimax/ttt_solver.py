@@ -0,0 +1,168 @@
+from dlgo.minimax.minimax import GameResult, reverse_game_result
+from dlgo.ttt.ttttypes import Player, Point
+import json
+
+# best_result searches the whole tic-tac-toe tree again for every move, and
+# every node of the search copies the board. But tic-tac-toe only has a few
+# thousand positions, so we can solve every one of them once and look the
+# answers up afterwards.
+# A position is a tuple of the 9 cells, row by row, with 0 for an empty cell,
+# 1 for x and 2 for o, plus the player to move. Rotating or mirroring the
+# board doesn't change the result of a position, so the 8 symmetric versions
+# of a position share a single entry: its canonical key, the smallest of the
+# 8. That leaves less than a thousand entries to solve, store or load from
+# disk.
+
+BOARD_SIZE = 3
+NUM_CELLS = BOARD_SIZE * BOARD_SIZE
+
+# Cells of the 8 lines a player can win with: rows, columns and diagonals
+LINES = tuple(
+    [tuple(row * BOARD_SIZE + col for col in range(BOARD_SIZE))
+     for row in range(BOARD_SIZE)] +
+    [tuple(row * BOARD_SIZE + col for row in range(BOARD_SIZE))
+     for col in range(BOARD_SIZE)] +
+    [tuple(i * BOARD_SIZE + i for i in range(BOARD_SIZE)),
+     tuple(i * BOARD_SIZE + BOARD_SIZE - 1 - i for i in range(BOARD_SIZE))]
+)
+
+# Cell values used in the keys, so they can be compared and sorted
+_CELL_VALUES = {None: 0, Player.x: 1, Player.o: 2}
+_CELL_PLAYERS = {0: None, 1: Player.x, 2: Player.o}
+
+
+def _symmetries():
+    last = BOARD_SIZE - 1
+
+    def rotate(row, col):
+        return col, last - row
+
+    def mirror(row, col):
+        return row, last - col
+    # Every symmetry is a tuple telling, for each cell, which cell of the
+    # original board ends up there
+    result = []
+    for mirrored in (False, True):
+        for turns in range(4):
+            permutation = []
+            for cell in range(NUM_CELLS):
+                row, col = divmod(cell, BOARD_SIZE)
+                if mirrored:
+                    row, col = mirror(row, col)
+                for _ in range(turns):
+                    row, col = rotate(row, col)
+                permutation.append(row * BOARD_SIZE + col)
+            result.append(tuple(permutation))
+    return tuple(result)
+
+
+SYMMETRIES = _symmetries()
+
+
+# The cells of a tic-tac-toe game state, as used in the keys
+def cells_of(game_state):
+    board = game_state.board
+    return tuple(
+        _CELL_VALUES[board.get(Point(row, col))]
+        for row in range(1, BOARD_SIZE + 1)
+        for col in range(1, BOARD_SIZE + 1))
+
+
+def canonical_key(cells, next_player):
+    return (min(tuple(cells[i] for i in symmetry)
+                for symmetry in SYMMETRIES),
+            _CELL_VALUES[next_player])
+
+
+def _winner(cells):
+    for a, b, c in LINES:
+        if cells[a] != 0 and cells[a] == cells[b] == cells[c]:
+            return _CELL_PLAYERS[cells[a]]
+    return None
+
+
+class TicTacToeSolver():
+
+    def __init__(self):
+        # Result for the player to move of every canonical position solved
+        self._results = {}
+
+    def __len__(self):
+        return len(self._results)
+
+    # Best result the player to move can get from the game state
+    def best_result(self, game_state):
+        return self.solve(cells_of(game_state), game_state.next_player)
+
+    # Same as minimax.best_result, on cells instead of a game state. Every
+    # position is searched once and remembered
+    def solve(self, cells, next_player):
+        key = canonical_key(cells, next_player)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        winner = _winner(cells)
+        if winner is not None:
+            result = GameResult.win if winner == next_player \
+                else GameResult.loss
+        elif 0 not in cells:
+            result = GameResult.draw
+        else:
+            # Start asuming our best move turns into a loss
+            result = GameResult.loss
+            value = _CELL_VALUES[next_player]
+            for cell in range(NUM_CELLS):
+                if cells[cell] != 0:
+                    continue
+                next_cells = cells[:cell] + (value,) + cells[cell + 1:]
+                opponent_result = self.solve(next_cells, next_player.other)
+                # Our outcome is the opposite of our opponent's outcome. We
+                # don't stop at the first win, so that every reachable
+                # position ends up in the table
+                our_result = reverse_game_result(opponent_result)
+                if our_result.value > result.value:
+                    result = our_result
+        self._results[key] = result
+        return result
+
+    # Solve every position that can be reached from the empty board
+    def solve_all(self):
+        self.solve((0,) * NUM_CELLS, Player.x)
+        return self
+
+    # The table is saved as JSON, with every position written as a string of
+    # its cells followed by the player to move
+    def save(self, path):
+        table = {
+            ''.join(str(value) for value in cells) + str(player): result.value
+            for (cells, player), result in self._results.items()
+        }
+        with open(path, 'w') as out_file:
+            json.dump(table, out_file, sort_keys = True)
+
+    @classmethod
+    def load(cls, path):
+        solver = cls()
+        with open(path) as in_file:
+            table = json.load(in_file)
+        for text, value in table.items():
+            cells = tuple(int(char) for char in text[:NUM_CELLS])
+            solver._results[(cells, int(text[NUM_CELLS]))] = \
+                GameResult(value)
+        return solver
+
+
+_SOLVER = None
+
+
+# The solver with every position solved, built the first time it's needed
+def default_solver():
+    global _SOLVER
+    if _SOLVER is None:
+        _SOLVER = TicTacToeSolver().solve_all()
+    return _SOLVER
+
+
+# Drop-in replacement for minimax.best_result that looks the answer up
+def best_result(game_state):
+    return default_solver().best_result(game_state)
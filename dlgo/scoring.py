@@ -0,0 +1,147 @@
+from collections import namedtuple
+from dlgo.gotypes import Player, Point
+
+# Area scoring: at the end of the game every player gets a point for each of
+# their stones on the board, and for each empty point in a region surrounded
+# only by their stones. Empty regions that touch both colors count for nobody.
+# White gets komi on top, to make up for playing second.
+# Every empty region is flood-filled once. Points are numbered row by row,
+#   (row - 1) * num_cols + (col - 1)
+# and the neighbours of every point are computed once per board size, so the
+# fill never builds a Point or checks the edges of the board. Positions are
+# scored as flat sequences of colors in that order, 0 for an empty point and
+# the value of the Player for a stone, so many final boards of the same size,
+# such as the boards of a batch of finished rollouts, can be scored in one
+# call with score_color_batch.
+
+DEFAULT_KOMI = 7.5
+
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+
+
+class GameResult(namedtuple('GameResult', 'b w komi')):
+
+    @property
+    def winner(self):
+        if self.b > self.w + self.komi:
+            return Player.black
+        return Player.white
+
+    @property
+    def winning_margin(self):
+        w = self.w + self.komi
+        return abs(self.b - w)
+
+    def __str__(self):
+        w = self.w + self.komi
+        if self.b > w:
+            return 'B+%.1f' % (self.b - w,)
+        return 'W+%.1f' % (w - self.b,)
+
+
+# Points and neighbours of a board size
+class ScoringTables():
+
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.num_points = num_rows * num_cols
+        self.points = tuple(
+            Point(row = row, col = col)
+            for row in range(1, num_rows + 1)
+            for col in range(1, num_cols + 1))
+        neighbours = []
+        for index in range(self.num_points):
+            row, col = divmod(index, num_cols)
+            adjacent = []
+            if row > 0:
+                adjacent.append(index - num_cols)
+            if row < num_rows - 1:
+                adjacent.append(index + num_cols)
+            if col > 0:
+                adjacent.append(index - 1)
+            if col < num_cols - 1:
+                adjacent.append(index + 1)
+            neighbours.append(tuple(adjacent))
+        self.neighbours = tuple(neighbours)
+
+
+_TABLES = {}
+
+
+def scoring_tables(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    if key not in _TABLES:
+        _TABLES[key] = ScoringTables(num_rows, num_cols)
+    return _TABLES[key]
+
+
+# The colors of a board, in the order of the scoring tables. Boards with
+# index-based colors, like ArrayBoard, give them directly, any other board is
+# read point by point
+def board_colors(board):
+    if hasattr(board, 'color_at'):
+        return list(map(board.color_at, board.tables.points))
+    tables = scoring_tables(board.num_rows, board.num_cols)
+    colors = []
+    for point in tables.points:
+        player = board.get(point)
+        colors.append(EMPTY if player is None else player.value)
+    return colors
+
+
+# Area score of a sequence of colors
+def score_colors(colors, tables, komi = DEFAULT_KOMI):
+    neighbours = tables.neighbours
+    counts = [0, 0, 0]
+    visited = bytearray(tables.num_points)
+    for index in range(tables.num_points):
+        color = colors[index]
+        if color != EMPTY:
+            counts[color] += 1
+            continue
+        if visited[index]:
+            continue
+        # Flood fill the empty region, collecting the colors around it
+        visited[index] = 1
+        region_size = 0
+        borders = 0
+        stack = [index]
+        while stack:
+            current = stack.pop()
+            region_size += 1
+            for neighbour in neighbours[current]:
+                neighbour_color = colors[neighbour]
+                if neighbour_color != EMPTY:
+                    borders |= neighbour_color
+                elif not visited[neighbour]:
+                    visited[neighbour] = 1
+                    stack.append(neighbour)
+        # Only a region surrounded by a single color is territory
+        if borders == BLACK or borders == WHITE:
+            counts[borders] += region_size
+    return GameResult(counts[BLACK], counts[WHITE], komi)
+
+
+# Score the board of a finished game
+def score_board(board, komi = DEFAULT_KOMI):
+    tables = scoring_tables(board.num_rows, board.num_cols)
+    return score_colors(board_colors(board), tables, komi)
+
+
+def compute_game_result(game_state, komi = DEFAULT_KOMI):
+    return score_board(game_state.board, komi)
+
+
+# Score many final positions of the same size at once. Every item is a flat
+# sequence of colors, such as a row of a 2-D array
+def score_color_batch(color_rows, num_rows, num_cols, komi = DEFAULT_KOMI):
+    tables = scoring_tables(num_rows, num_cols)
+    return [score_colors(colors, tables, komi) for colors in color_rows]
+
+
+# Score many boards, of any sizes and implementations
+def score_boards(boards, komi = DEFAULT_KOMI):
+    return [score_board(board, komi) for board in boards]
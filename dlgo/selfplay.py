@@ -0,0 +1,139 @@
+from dlgo import goboard
+from dlgo import gotypes
+from dlgo.bitboard import BitBoard
+from dlgo.goboard_array import ArrayBoard
+from dlgo.goboard_uf import UnionFindBoard
+from dlgo.utils import COLS
+import importlib
+import json
+import multiprocessing
+import random
+import time
+
+# bot_v_bot shows a single game move by move. To generate training data or to
+# rate agents we need to play lots of games without looking at them. This
+# module plays games between two agents in a pool of worker processes, one
+# game per task, and streams one JSON line per finished game to a file as
+# soon as it is done.
+# Each game gets its own seed, derived from a base seed and the index of the
+# game, so a run can be repeated no matter how the games are spread across the
+# workers.
+
+# Agents that can be named on the command line. Any other agent can be given
+# as 'module:ClassName', and is built without arguments
+AGENTS = {
+    'random': 'dlgo.agent.naive:RandomBot',
+    'fast_random': 'dlgo.agent.naive_fast:FastRandomBot',
+}
+
+# Board implementations games can be played on
+BOARDS = {
+    'board': goboard.Board,
+    'array': ArrayBoard,
+    'unionfind': UnionFindBoard,
+    'bitboard': BitBoard,
+}
+
+
+# Build an agent from its name or from a 'module:ClassName' spec
+def make_agent(spec):
+    spec = AGENTS.get(spec, spec)
+    module_name, class_name = spec.split(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+# Translate a move into the text used in the results file
+def move_to_str(move):
+    if move.is_pass:
+        return 'pass'
+    if move.is_resign:
+        return 'resign'
+    return '%s%d' % (COLS[move.point.col - 1], move.point.row)
+
+
+# Find out who won a game. A player who resigns loses, and a game that ended
+# with two passes is decided by area scoring. Games stopped by the move limit
+# have no winner
+def game_winner(game):
+    return game.winner()
+
+
+# The result of a game as text, like B+3.5, with the margin of a scored game
+def game_result_str(game):
+    if not game.is_over():
+        return None
+    if game.last_move.is_resign:
+        return '%s+R' % ('B' if game.next_player == gotypes.Player.black
+                         else 'W')
+    return str(game.game_result())
+
+
+# Play a single game. The task is a tuple, so it can be sent to the workers:
+# (game index, black agent, white agent, board size, board name, seed,
+# max moves)
+def play_game(task):
+    index, black, white, board_size, board_name, seed, max_moves = task
+    random.seed(seed)
+    bots = {
+        gotypes.Player.black: make_agent(black),
+        gotypes.Player.white: make_agent(white),
+    }
+    game = goboard.GameState.new_game(board_size, BOARDS[board_name])
+    moves = []
+    start = time.perf_counter()
+    while not game.is_over() and len(moves) < max_moves:
+        move = bots[game.next_player].select_move(game)
+        moves.append(move_to_str(move))
+        game = game.apply_move(move)
+    elapsed = time.perf_counter() - start
+    winner = game_winner(game)
+    return {
+        'game': index,
+        'seed': seed,
+        'board_size': board_size,
+        'black': black,
+        'white': white,
+        'winner': None if winner is None else winner.name,
+        'result': game_result_str(game),
+        'length': len(moves),
+        'finished': game.is_over(),
+        'seconds': elapsed,
+        'moves': moves,
+    }
+
+
+# Play num_games games between black and white, writing one JSON line per game
+# to out_path as they finish. Returns a summary of the run, including the
+# throughput in games per second
+def play_games(num_games, black, white, board_size, out_path,
+               board_name = 'board', processes = None, seed = 0,
+               max_moves = None):
+    if max_moves is None:
+        max_moves = board_size * board_size * 3
+    tasks = [
+        (index, black, white, board_size, board_name, seed + index, max_moves)
+        for index in range(num_games)
+    ]
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    wins = {}
+    num_moves = 0
+    start = time.perf_counter()
+    with open(out_path, 'w') as out_file:
+        with multiprocessing.Pool(processes) as pool:
+            # Games are written in the order they finish
+            for result in pool.imap_unordered(play_game, tasks):
+                out_file.write(json.dumps(result) + '\n')
+                out_file.flush()
+                wins[result['winner']] = wins.get(result['winner'], 0) + 1
+                num_moves += result['length']
+    elapsed = time.perf_counter() - start
+    return {
+        'games': num_games,
+        'processes': processes,
+        'seconds': elapsed,
+        'games_per_second': num_games / elapsed,
+        'moves_per_second': num_moves / elapsed,
+        'wins': wins,
+    }
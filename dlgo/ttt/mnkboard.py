@@ -0,0 +1,160 @@
+from dlgo.ttt.tttboard import Move
+from dlgo.ttt.ttttypes import Player, Point
+
+# Tic-tac-toe is the smallest of the m,n,k games: on a board of m rows and n
+# columns, the first player to get k tiles in a row, horizontally, vertically
+# or diagonally, wins. Gomoku is the 15,15,5 game.
+# On big boards we can't scan every line after every move. A new line of k
+# can only go through the last tile placed, so apply_move only counts the
+# tiles of the player around it in the four directions: across, down and the
+# two diagonals. That is at most 4 * 2 * (k - 1) points, whatever the size of
+# the board.
+# Every point of the board is a byte of a bytearray, at
+#   (row - 1) * num_cols + (col - 1)
+# holding 0 for an empty point and the value of the player otherwise. Counting
+# along a line reads one byte per step, so it takes the same time whatever the
+# size of the board. Game states never change a board, so applying a move
+# copies the bytearray, which is a single memory copy, and sets one byte.
+
+# Directions of the four lines through a point, as (row, col) steps
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+EMPTY = 0
+
+
+class Board():
+
+    def __init__(self, num_rows, num_cols, k, cells = None):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.k = k
+        if cells is None:
+            cells = bytearray(num_rows * num_cols)
+        self.cells = cells
+        self.num_tiles = num_rows * num_cols - cells.count(EMPTY)
+
+    def index(self, point):
+        return (point.row - 1) * self.num_cols + point.col - 1
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    def get(self, point):
+        value = self.cells[self.index(point)]
+        if value == EMPTY:
+            return None
+        return Player(value)
+
+    # Place a tile in place, as tttboard.Board.place does. Game states don't
+    # use it, they build a new board with the move instead
+    def place(self, player, point):
+        assert self.is_on_grid(point)
+        assert self.get(point) is None
+        self.cells[self.index(point)] = player.value
+        self.num_tiles += 1
+
+    def is_full(self):
+        return self.num_tiles == self.num_rows * self.num_cols
+
+    # A new board with the player's tile on the point
+    def with_tile(self, player, point):
+        board = Board.__new__(Board)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board.k = self.k
+        board.cells = bytearray(self.cells)
+        board.cells[self.index(point)] = player.value
+        board.num_tiles = self.num_tiles + 1
+        return board
+
+    # Whether the player's tile on the point is part of k in a row. Only the
+    # four lines through the point are looked at, at most k - 1 points on
+    # each side. With k = 1 the tile is a line on its own
+    def makes_line(self, player, point):
+        if self.k <= 1:
+            return True
+        cells = self.cells
+        value = player.value
+        num_rows = self.num_rows
+        num_cols = self.num_cols
+        for row_step, col_step in DIRECTIONS:
+            count = 1
+            # Count the tiles on both sides of the point
+            for sign in (1, -1):
+                row = point.row + sign * row_step
+                col = point.col + sign * col_step
+                while 1 <= row <= num_rows and 1 <= col <= num_cols and \
+                        cells[(row - 1) * num_cols + col - 1] == value:
+                    count += 1
+                    if count >= self.k:
+                        return True
+                    row += sign * row_step
+                    col += sign * col_step
+        return False
+
+    # Whether the player has k in a row anywhere, looking at every tile
+    def has_line(self, player):
+        for row in range(1, self.num_rows + 1):
+            for col in range(1, self.num_cols + 1):
+                point = Point(row, col)
+                if self.get(point) == player and \
+                        self.makes_line(player, point):
+                    return True
+        return False
+
+    def __deepcopy__(self, memodict = {}):
+        return Board(self.num_rows, self.num_cols, self.k,
+                     bytearray(self.cells))
+
+
+class GameState():
+
+    # The winner is worked out by apply_move. A game state built from any
+    # other board finds it by checking every tile
+    def __init__(self, board, next_player, move, winner = False):
+        self.board = board
+        self.next_player = next_player
+        self.last_move = move
+        if winner is False:
+            winner = None
+            for player in (Player.x, Player.o):
+                if board.has_line(player):
+                    winner = player
+        self._winner = winner
+
+    def apply_move(self, move):
+        assert self.board.is_on_grid(move.point)
+        assert self.board.get(move.point) is None
+        player = self.next_player
+        next_board = self.board.with_tile(player, move.point)
+        winner = None
+        if next_board.makes_line(player, move.point):
+            winner = player
+        return GameState(next_board, player.other, move, winner)
+
+    # Starts a new game, by default tic-tac-toe. Gomoku is new_game(15, 15, 5)
+    @classmethod
+    def new_game(cls, num_rows = 3, num_cols = 3, k = 3):
+        return GameState(Board(num_rows, num_cols, k), Player.x, None, None)
+
+    def is_valid_move(self, move):
+        return self.board.is_on_grid(move.point) and \
+            self.board.get(move.point) is None and not self.is_over()
+
+    def legal_moves(self):
+        if self.is_over():
+            return []
+        board = self.board
+        cells = board.cells
+        moves = []
+        for row in range(1, board.num_rows + 1):
+            for col in range(1, board.num_cols + 1):
+                if cells[(row - 1) * board.num_cols + col - 1] == EMPTY:
+                    moves.append(Move(Point(row, col)))
+        return moves
+
+    def is_over(self):
+        return self._winner is not None or self.board.is_full()
+
+    def winner(self):
+        return self._winner
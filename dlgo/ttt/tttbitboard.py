@@ -0,0 +1,154 @@
+from dlgo.ttt.tttboard import BOARD_SIZE, Move
+from dlgo.ttt.ttttypes import Player, Point
+
+# The tic-tac-toe Board keeps a dict of points, and the GameState checks every
+# line again, building points as it goes, each time is_over or winner is
+# called. apply_move also copies the whole board.
+# Here the board is two 9-bit masks, one per player, with bit
+#   (row - 1) * 3 + (col - 1)
+# set for every point the player holds. A player wins when one of the 8 line
+# masks is all inside their mask. A move only sets one bit, and only the lines
+# through that point can be completed by it, so the game state finds out if
+# the move won when it's applied and remembers it. Boards are never changed
+# once a game state holds them, so applying a move builds a new board from two
+# ints instead of copying a dict.
+# The classes have the same interface as the ones in tttboard, so they work
+# with play_ttt.py and the minimax agents.
+
+NUM_POINTS = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << NUM_POINTS) - 1
+
+
+def point_bit(point):
+    return 1 << ((point.row - 1) * BOARD_SIZE + point.col - 1)
+
+
+def _line_masks():
+    lines = []
+    for row in range(1, BOARD_SIZE + 1):
+        lines.append([Point(row, col) for col in range(1, BOARD_SIZE + 1)])
+    for col in range(1, BOARD_SIZE + 1):
+        lines.append([Point(row, col) for row in range(1, BOARD_SIZE + 1)])
+    lines.append([Point(i, i) for i in range(1, BOARD_SIZE + 1)])
+    lines.append([Point(i, BOARD_SIZE + 1 - i)
+                  for i in range(1, BOARD_SIZE + 1)])
+    masks = []
+    for line in lines:
+        mask = 0
+        for point in line:
+            mask |= point_bit(point)
+        masks.append(mask)
+    return tuple(masks)
+
+
+# The 8 lines a player can win with: rows, columns and diagonals
+LINE_MASKS = _line_masks()
+# The lines through every point, by its bit
+LINES_THROUGH = {
+    1 << index: tuple(mask for mask in LINE_MASKS if mask & (1 << index))
+    for index in range(NUM_POINTS)
+}
+# Every point of the board, with its bit
+POINT_BITS = tuple(
+    (Point(row, col), point_bit(Point(row, col)))
+    for row in range(1, BOARD_SIZE + 1)
+    for col in range(1, BOARD_SIZE + 1)
+)
+
+
+class Board():
+
+    def __init__(self, x_mask = 0, o_mask = 0):
+        self.masks = {Player.x: x_mask, Player.o: o_mask}
+
+    # Place a tile in place, as tttboard.Board.place does. Game states don't
+    # use it, they build a new board with the move instead
+    def place(self, player, point):
+        assert self.is_on_grid(point)
+        assert self.get(point) is None
+        self.masks[player] |= point_bit(point)
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= BOARD_SIZE and 1 <= point.col <= BOARD_SIZE
+
+    def get(self, point):
+        bit = point_bit(point)
+        if self.masks[Player.x] & bit:
+            return Player.x
+        if self.masks[Player.o] & bit:
+            return Player.o
+        return None
+
+    @property
+    def occupied(self):
+        return self.masks[Player.x] | self.masks[Player.o]
+
+    # A new board with the player's tile on the point's bit
+    def with_bit(self, player, bit):
+        board = Board(self.masks[Player.x], self.masks[Player.o])
+        board.masks[player] |= bit
+        return board
+
+    def has_line(self, player):
+        mask = self.masks[player]
+        for line in LINE_MASKS:
+            if mask & line == line:
+                return True
+        return False
+
+    def __deepcopy__(self, memodict = {}):
+        return Board(self.masks[Player.x], self.masks[Player.o])
+
+
+class GameState():
+
+    # The winner is worked out by apply_move. A game state built from any
+    # other board finds it by checking every line
+    def __init__(self, board, next_player, move, winner = False):
+        self.board = board
+        self.next_player = next_player
+        self.last_move = move
+        if winner is False:
+            winner = None
+            for player in (Player.x, Player.o):
+                if board.has_line(player):
+                    winner = player
+        self._winner = winner
+
+    def apply_move(self, move):
+        assert self.board.is_on_grid(move.point)
+        bit = point_bit(move.point)
+        # A tile on a taken point would set its bit in both masks
+        assert not self.board.occupied & bit
+        player = self.next_player
+        next_board = self.board.with_bit(player, bit)
+        # Only the lines through the point can have been completed
+        winner = None
+        mask = next_board.masks[player]
+        for line in LINES_THROUGH[bit]:
+            if mask & line == line:
+                winner = player
+                break
+        return GameState(next_board, player.other, move, winner)
+
+    @classmethod
+    def new_game(cls):
+        return GameState(Board(), Player.x, None, None)
+
+    def is_valid_move(self, move):
+        return self.board.is_on_grid(move.point) and \
+            not self.board.occupied & point_bit(move.point) and \
+            not self.is_over()
+
+    def legal_moves(self):
+        if self.is_over():
+            return []
+        occupied = self.board.occupied
+        return [Move(point) for point, bit in POINT_BITS
+                if not occupied & bit]
+
+    def is_over(self):
+        return self._winner is not None or self.board.occupied == FULL_MASK
+
+    def winner(self):
+        return self._winner
@@ -1,730 +1,93 @@
-from .gotypes import Player, Point
+from array import array
+from functools import reduce
+from itertools import compress
+from operator import xor
+from dlgo.gotypes import Player, Point
+import random
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+# Zobrist hashing gives every (point, color) pair a random code, and the hash
+# of a position is the XOR of the codes of all its stones. Placing or removing
+# a stone is then a single XOR.
+# The codes used to live in a generated dict literal keyed by (Point, Player),
+# which only covered 19x19 boards and was slow to import. Instead we generate
+# them from a fixed seed the first time a board size is used, so the same size
+# always gets the same codes. They are stored in flat arrays indexed by
+#   (row - 1) * num_cols + (col - 1)
+# with one array per color.
 
-HASH_CODE = {
-    (Point(row=1, col=1), Player.black): 8861299300158620898,
-    (Point(row=1, col=1), Player.white): 16172206197796987,
-    (Point(row=1, col=2), Player.black): 2501730636581731973,
-    (Point(row=1, col=2), Player.white): 9194465790652677433,
-    (Point(row=1, col=3), Player.black): 4057931154215579604,
-    (Point(row=1, col=3), Player.white): 7862658212632759912,
-    (Point(row=1, col=4), Player.black): 1085991334360251429,
-    (Point(row=1, col=4), Player.white): 2620206257644464374,
-    (Point(row=1, col=5), Player.black): 6348488741821537199,
-    (Point(row=1, col=5), Player.white): 1532997781033394407,
-    (Point(row=1, col=6), Player.black): 8794167633874438087,
-    (Point(row=1, col=6), Player.white): 7804503648960705488,
-    (Point(row=1, col=7), Player.black): 7871715477385806967,
-    (Point(row=1, col=7), Player.white): 9195784988756519165,
-    (Point(row=1, col=8), Player.black): 6299232469846599580,
-    (Point(row=1, col=8), Player.white): 7130327014892116251,
-    (Point(row=1, col=9), Player.black): 1436329059330391448,
-    (Point(row=1, col=9), Player.white): 7904793000360811481,
-    (Point(row=1, col=10), Player.black): 8171309114981211721,
-    (Point(row=1, col=10), Player.white): 5909230957842363125,
-    (Point(row=1, col=11), Player.black): 1548915574870816144,
-    (Point(row=1, col=11), Player.white): 2156632615016231893,
-    (Point(row=1, col=12), Player.black): 9088407440987367994,
-    (Point(row=1, col=12), Player.white): 8027982466820915244,
-    (Point(row=1, col=13), Player.black): 2823478357177228836,
-    (Point(row=1, col=13), Player.white): 3394266478043152136,
-    (Point(row=1, col=14), Player.black): 2387593726875965969,
-    (Point(row=1, col=14), Player.white): 843372756936473465,
-    (Point(row=1, col=15), Player.black): 3856860512491775606,
-    (Point(row=1, col=15), Player.white): 7061740056525678563,
-    (Point(row=1, col=16), Player.black): 1180116497578808793,
-    (Point(row=1, col=16), Player.white): 5355882604774984799,
-    (Point(row=1, col=17), Player.black): 6528901908378197594,
-    (Point(row=1, col=17), Player.white): 3885304033821811887,
-    (Point(row=1, col=18), Player.black): 1844170413139779574,
-    (Point(row=1, col=18), Player.white): 9106022617123228540,
-    (Point(row=1, col=19), Player.black): 3526977751875927319,
-    (Point(row=1, col=19), Player.white): 8766850942881255080,
-    (Point(row=2, col=1), Player.black): 5516175681164720523,
-    (Point(row=2, col=1), Player.white): 3237785886133545895,
-    (Point(row=2, col=2), Player.black): 5467875517526903076,
-    (Point(row=2, col=2), Player.white): 1860316781418541445,
-    (Point(row=2, col=3), Player.black): 764600990577142189,
-    (Point(row=2, col=3), Player.white): 6142396801238992138,
-    (Point(row=2, col=4), Player.black): 2329707374658495519,
-    (Point(row=2, col=4), Player.white): 6630793996757195680,
-    (Point(row=2, col=5), Player.black): 3932604387717458383,
-    (Point(row=2, col=5), Player.white): 4387768725611417547,
-    (Point(row=2, col=6), Player.black): 4891628828214138997,
-    (Point(row=2, col=6), Player.white): 5044593033468595337,
-    (Point(row=2, col=7), Player.black): 2115068854335964621,
-    (Point(row=2, col=7), Player.white): 1128300666181158698,
-    (Point(row=2, col=8), Player.black): 6965409198205259133,
-    (Point(row=2, col=8), Player.white): 4475821666267274183,
-    (Point(row=2, col=9), Player.black): 899981278458066147,
-    (Point(row=2, col=9), Player.white): 3064432183757487545,
-    (Point(row=2, col=10), Player.black): 147282283349220389,
-    (Point(row=2, col=10), Player.white): 7409796313794523196,
-    (Point(row=2, col=11), Player.black): 7880110228223918511,
-    (Point(row=2, col=11), Player.white): 7431441447974711838,
-    (Point(row=2, col=12), Player.black): 8651557693778121296,
-    (Point(row=2, col=12), Player.white): 4389090261275301368,
-    (Point(row=2, col=13), Player.black): 4887052246519865362,
-    (Point(row=2, col=13), Player.white): 5809223290230601559,
-    (Point(row=2, col=14), Player.black): 7780878546482366064,
-    (Point(row=2, col=14), Player.white): 9046270430971634929,
-    (Point(row=2, col=15), Player.black): 7379250939311005322,
-    (Point(row=2, col=15), Player.white): 8873475629072078453,
-    (Point(row=2, col=16), Player.black): 6818668427250659780,
-    (Point(row=2, col=16), Player.white): 7020574220749670212,
-    (Point(row=2, col=17), Player.black): 1081196764912390734,
-    (Point(row=2, col=17), Player.white): 1048755166893797516,
-    (Point(row=2, col=18), Player.black): 6121247011742776674,
-    (Point(row=2, col=18), Player.white): 6047883136809286879,
-    (Point(row=2, col=19), Player.black): 7526526365415525175,
-    (Point(row=2, col=19), Player.white): 8618209575708917510,
-    (Point(row=3, col=1), Player.black): 7772393308970240906,
-    (Point(row=3, col=1), Player.white): 4950397525656745611,
-    (Point(row=3, col=2), Player.black): 4063483109421788710,
-    (Point(row=3, col=2), Player.white): 1028513578627383034,
-    (Point(row=3, col=3), Player.black): 7519142633417731655,
-    (Point(row=3, col=3), Player.white): 883733082284049823,
-    (Point(row=3, col=4), Player.black): 854251557465447672,
-    (Point(row=3, col=4), Player.white): 184808277706808764,
-    (Point(row=3, col=5), Player.black): 8300752702180243025,
-    (Point(row=3, col=5), Player.white): 5088171612676391719,
-    (Point(row=3, col=6), Player.black): 1094106943939955425,
-    (Point(row=3, col=6), Player.white): 9207806780688346237,
-    (Point(row=3, col=7), Player.black): 6926245301090004536,
-    (Point(row=3, col=7), Player.white): 4609767833584761825,
-    (Point(row=3, col=8), Player.black): 3287747173726201794,
-    (Point(row=3, col=8), Player.white): 1039951947230484526,
-    (Point(row=3, col=9), Player.black): 3531315638203649603,
-    (Point(row=3, col=9), Player.white): 6674251093599656903,
-    (Point(row=3, col=10), Player.black): 1184258383928608252,
-    (Point(row=3, col=10), Player.white): 2944755078183107870,
-    (Point(row=3, col=11), Player.black): 8396483242269957021,
-    (Point(row=3, col=11), Player.white): 6915817968519467010,
-    (Point(row=3, col=12), Player.black): 23095607826072551,
-    (Point(row=3, col=12), Player.white): 2249776138456571450,
-    (Point(row=3, col=13), Player.black): 4110323412857842413,
-    (Point(row=3, col=13), Player.white): 2587304340753569472,
-    (Point(row=3, col=14), Player.black): 4194693399351162916,
-    (Point(row=3, col=14), Player.white): 3681253277079519605,
-    (Point(row=3, col=15), Player.black): 8009611919817849272,
-    (Point(row=3, col=15), Player.white): 2696962767741878818,
-    (Point(row=3, col=16), Player.black): 72316678809612064,
-    (Point(row=3, col=16), Player.white): 787244656134640175,
-    (Point(row=3, col=17), Player.black): 9156406021421788407,
-    (Point(row=3, col=17), Player.white): 1661837671077545360,
-    (Point(row=3, col=18), Player.black): 2954108441325518311,
-    (Point(row=3, col=18), Player.white): 2011271471792747818,
-    (Point(row=3, col=19), Player.black): 9030000106807658298,
-    (Point(row=3, col=19), Player.white): 484963362947105693,
-    (Point(row=4, col=1), Player.black): 601633466875140885,
-    (Point(row=4, col=1), Player.white): 4765948988045542588,
-    (Point(row=4, col=2), Player.black): 6928539964843143771,
-    (Point(row=4, col=2), Player.white): 4641880463930926747,
-    (Point(row=4, col=3), Player.black): 7589370706713096877,
-    (Point(row=4, col=3), Player.white): 5461766775146943444,
-    (Point(row=4, col=4), Player.black): 2426060691080557055,
-    (Point(row=4, col=4), Player.white): 8506750352926742533,
-    (Point(row=4, col=5), Player.black): 64873039045876134,
-    (Point(row=4, col=5), Player.white): 4175102218309934462,
-    (Point(row=4, col=6), Player.black): 4599445796500018828,
-    (Point(row=4, col=6), Player.white): 8096017397851658920,
-    (Point(row=4, col=7), Player.black): 8112285229086887945,
-    (Point(row=4, col=7), Player.white): 4651281571478192672,
-    (Point(row=4, col=8), Player.black): 4845838357350508935,
-    (Point(row=4, col=8), Player.white): 5670755208573530228,
-    (Point(row=4, col=9), Player.black): 6024595651443347870,
-    (Point(row=4, col=9), Player.white): 4863705341500967035,
-    (Point(row=4, col=10), Player.black): 9217113203982985495,
-    (Point(row=4, col=10), Player.white): 2848989318092937571,
-    (Point(row=4, col=11), Player.black): 7321903732759483797,
-    (Point(row=4, col=11), Player.white): 2841842667050573716,
-    (Point(row=4, col=12), Player.black): 4979010889012771172,
-    (Point(row=4, col=12), Player.white): 8165453884379407437,
-    (Point(row=4, col=13), Player.black): 6657312891433563558,
-    (Point(row=4, col=13), Player.white): 5094634322547745010,
-    (Point(row=4, col=14), Player.black): 3291727757822917713,
-    (Point(row=4, col=14), Player.white): 6688683858806141957,
-    (Point(row=4, col=15), Player.black): 3216754454846761054,
-    (Point(row=4, col=15), Player.white): 7383372248910838951,
-    (Point(row=4, col=16), Player.black): 8775716717833243232,
-    (Point(row=4, col=16), Player.white): 7574977702172033433,
-    (Point(row=4, col=17), Player.black): 7457820344047463689,
-    (Point(row=4, col=17), Player.white): 8027324838428274270,
-    (Point(row=4, col=18), Player.black): 953615930982187037,
-    (Point(row=4, col=18), Player.white): 3544897814578064203,
-    (Point(row=4, col=19), Player.black): 8005999675620813606,
-    (Point(row=4, col=19), Player.white): 5643551763761971236,
-    (Point(row=5, col=1), Player.black): 8580650839434771038,
-    (Point(row=5, col=1), Player.white): 1550878709295705620,
-    (Point(row=5, col=2), Player.black): 5047925670388853211,
-    (Point(row=5, col=2), Player.white): 196391222670994294,
-    (Point(row=5, col=3), Player.black): 8845953386599768216,
-    (Point(row=5, col=3), Player.white): 9083749279781196936,
-    (Point(row=5, col=4), Player.black): 2509059312728613162,
-    (Point(row=5, col=4), Player.white): 7064653487499837747,
-    (Point(row=5, col=5), Player.black): 5277674198403210656,
-    (Point(row=5, col=5), Player.white): 6525989130865784435,
-    (Point(row=5, col=6), Player.black): 3406684240112953797,
-    (Point(row=5, col=6), Player.white): 8122210708519775901,
-    (Point(row=5, col=7), Player.black): 4722828132933785130,
-    (Point(row=5, col=7), Player.white): 7694019625804530411,
-    (Point(row=5, col=8), Player.black): 4475225257405316905,
-    (Point(row=5, col=8), Player.white): 3065436493839226222,
-    (Point(row=5, col=9), Player.black): 5295181942931198875,
-    (Point(row=5, col=9), Player.white): 408438873342267598,
-    (Point(row=5, col=10), Player.black): 8546365047485139422,
-    (Point(row=5, col=10), Player.white): 1408313679930722713,
-    (Point(row=5, col=11), Player.black): 8235198880652004079,
-    (Point(row=5, col=11), Player.white): 3220082272138772030,
-    (Point(row=5, col=12), Player.black): 8807580210729400549,
-    (Point(row=5, col=12), Player.white): 1115510899814376130,
-    (Point(row=5, col=13), Player.black): 3699839363220933441,
-    (Point(row=5, col=13), Player.white): 3857140765672044972,
-    (Point(row=5, col=14), Player.black): 4160108318146323746,
-    (Point(row=5, col=14), Player.white): 1074043188681311274,
-    (Point(row=5, col=15), Player.black): 3451420311268068696,
-    (Point(row=5, col=15), Player.white): 3567670219752497449,
-    (Point(row=5, col=16), Player.black): 8338443014522716469,
-    (Point(row=5, col=16), Player.white): 3895345088295844524,
-    (Point(row=5, col=17), Player.black): 2955064428892276907,
-    (Point(row=5, col=17), Player.white): 4738708368976145063,
-    (Point(row=5, col=18), Player.black): 8242702308883797091,
-    (Point(row=5, col=18), Player.white): 1294912349103732767,
-    (Point(row=5, col=19), Player.black): 5345546105074334779,
-    (Point(row=5, col=19), Player.white): 2330063171787386067,
-    (Point(row=6, col=1), Player.black): 1507153660184771390,
-    (Point(row=6, col=1), Player.white): 3117137139513858866,
-    (Point(row=6, col=2), Player.black): 1618082658291764918,
-    (Point(row=6, col=2), Player.white): 3064805334319832393,
-    (Point(row=6, col=3), Player.black): 8882931480967298547,
-    (Point(row=6, col=3), Player.white): 6510165137449176336,
-    (Point(row=6, col=4), Player.black): 7064940976107529522,
-    (Point(row=6, col=4), Player.white): 5503542860722505437,
-    (Point(row=6, col=5), Player.black): 1450262967445386008,
-    (Point(row=6, col=5), Player.white): 6698387528860595367,
-    (Point(row=6, col=6), Player.black): 5118421611124259408,
-    (Point(row=6, col=6), Player.white): 28240662048788461,
-    (Point(row=6, col=7), Player.black): 5020645643874679177,
-    (Point(row=6, col=7), Player.white): 3186086939193521894,
-    (Point(row=6, col=8), Player.black): 9094797334678190419,
-    (Point(row=6, col=8), Player.white): 5257278147917582200,
-    (Point(row=6, col=9), Player.black): 3359739769634002694,
-    (Point(row=6, col=9), Player.white): 2866320180676762867,
-    (Point(row=6, col=10), Player.black): 904174642503264333,
-    (Point(row=6, col=10), Player.white): 572848275180550693,
-    (Point(row=6, col=11), Player.black): 1449906901047237512,
-    (Point(row=6, col=11), Player.white): 9097215516855221148,
-    (Point(row=6, col=12), Player.black): 8333982920576830626,
-    (Point(row=6, col=12), Player.white): 8898944092520830283,
-    (Point(row=6, col=13), Player.black): 1186246452649245865,
-    (Point(row=6, col=13), Player.white): 8597261162607386436,
-    (Point(row=6, col=14), Player.black): 2052774117163167569,
-    (Point(row=6, col=14), Player.white): 7176671676690363871,
-    (Point(row=6, col=15), Player.black): 8692232433024058709,
-    (Point(row=6, col=15), Player.white): 1683063903328520664,
-    (Point(row=6, col=16), Player.black): 5810518038513058948,
-    (Point(row=6, col=16), Player.white): 5379958268545009755,
-    (Point(row=6, col=17), Player.black): 6946590268859687487,
-    (Point(row=6, col=17), Player.white): 5606236105207933214,
-    (Point(row=6, col=18), Player.black): 6672221108282456262,
-    (Point(row=6, col=18), Player.white): 8735711213189651,
-    (Point(row=6, col=19), Player.black): 3371769457981435716,
-    (Point(row=6, col=19), Player.white): 1038316661073833360,
-    (Point(row=7, col=1), Player.black): 1113253525633140467,
-    (Point(row=7, col=1), Player.white): 6013228706784281663,
-    (Point(row=7, col=2), Player.black): 6055216907055714534,
-    (Point(row=7, col=2), Player.white): 1902154105933432393,
-    (Point(row=7, col=3), Player.black): 6631007109591982162,
-    (Point(row=7, col=3), Player.white): 6564831489199791810,
-    (Point(row=7, col=4), Player.black): 7583419806808407916,
-    (Point(row=7, col=4), Player.white): 1627617334628129449,
-    (Point(row=7, col=5), Player.black): 6762197947912410883,
-    (Point(row=7, col=5), Player.white): 3906000371633487373,
-    (Point(row=7, col=6), Player.black): 1783048817097311587,
-    (Point(row=7, col=6), Player.white): 1126083852227089098,
-    (Point(row=7, col=7), Player.black): 3604594082612056283,
-    (Point(row=7, col=7), Player.white): 5728055396152202655,
-    (Point(row=7, col=8), Player.black): 4325750469429101225,
-    (Point(row=7, col=8), Player.white): 983330874100699922,
-    (Point(row=7, col=9), Player.black): 5884327609181367079,
-    (Point(row=7, col=9), Player.white): 4962732461954644552,
-    (Point(row=7, col=10), Player.black): 4954916439427240765,
-    (Point(row=7, col=10), Player.white): 83503685056900639,
-    (Point(row=7, col=11), Player.black): 556655044510146294,
-    (Point(row=7, col=11), Player.white): 6508550000872755832,
-    (Point(row=7, col=12), Player.black): 5770000759704225332,
-    (Point(row=7, col=12), Player.white): 1287297433652100804,
-    (Point(row=7, col=13), Player.black): 997880202315505160,
-    (Point(row=7, col=13), Player.white): 3520711517361617564,
-    (Point(row=7, col=14), Player.black): 1507602225765161859,
-    (Point(row=7, col=14), Player.white): 1913403557186737789,
-    (Point(row=7, col=15), Player.black): 3349462246931648167,
-    (Point(row=7, col=15), Player.white): 2266730395582238254,
-    (Point(row=7, col=16), Player.black): 3459013598020584912,
-    (Point(row=7, col=16), Player.white): 3253382576134604509,
-    (Point(row=7, col=17), Player.black): 6928259348192103510,
-    (Point(row=7, col=17), Player.white): 8203663889402742879,
-    (Point(row=7, col=18), Player.black): 1254712788741976486,
-    (Point(row=7, col=18), Player.white): 6245877138620473253,
-    (Point(row=7, col=19), Player.black): 6467779505763966201,
-    (Point(row=7, col=19), Player.white): 7197351175193082379,
-    (Point(row=8, col=1), Player.black): 6547717980304953488,
-    (Point(row=8, col=1), Player.white): 6664440303747971408,
-    (Point(row=8, col=2), Player.black): 1753010727325530278,
-    (Point(row=8, col=2), Player.white): 6516127609887944444,
-    (Point(row=8, col=3), Player.black): 49657646255758080,
-    (Point(row=8, col=3), Player.white): 8085430540602503042,
-    (Point(row=8, col=4), Player.black): 653605953646094159,
-    (Point(row=8, col=4), Player.white): 8600439514577394054,
-    (Point(row=8, col=5), Player.black): 8469351442270226723,
-    (Point(row=8, col=5), Player.white): 3309853692260773417,
-    (Point(row=8, col=6), Player.black): 105235373556330269,
-    (Point(row=8, col=6), Player.white): 557771576946910562,
-    (Point(row=8, col=7), Player.black): 4190226429690067953,
-    (Point(row=8, col=7), Player.white): 4217002735810688887,
-    (Point(row=8, col=8), Player.black): 1097616937562394956,
-    (Point(row=8, col=8), Player.white): 2983718596731989474,
-    (Point(row=8, col=9), Player.black): 6702850370549153951,
-    (Point(row=8, col=9), Player.white): 1163952553355325088,
-    (Point(row=8, col=10), Player.black): 3942337241071007423,
-    (Point(row=8, col=10), Player.white): 4249817615544047951,
-    (Point(row=8, col=11), Player.black): 6136103646445150380,
-    (Point(row=8, col=11), Player.white): 2227767632909926339,
-    (Point(row=8, col=12), Player.black): 2578501384882817754,
-    (Point(row=8, col=12), Player.white): 7878117075812116291,
-    (Point(row=8, col=13), Player.black): 9085086233377629840,
-    (Point(row=8, col=13), Player.white): 1733467705354479632,
-    (Point(row=8, col=14), Player.black): 8836157660418874578,
-    (Point(row=8, col=14), Player.white): 1590053670904757141,
-    (Point(row=8, col=15), Player.black): 8005979580710078855,
-    (Point(row=8, col=15), Player.white): 2266592692564687642,
-    (Point(row=8, col=16), Player.black): 6741323214532452909,
-    (Point(row=8, col=16), Player.white): 2423296073213559860,
-    (Point(row=8, col=17), Player.black): 3677784340683020422,
-    (Point(row=8, col=17), Player.white): 8795149527714018677,
-    (Point(row=8, col=18), Player.black): 480095501126851458,
-    (Point(row=8, col=18), Player.white): 2186409449084125085,
-    (Point(row=8, col=19), Player.black): 8765883250729293056,
-    (Point(row=8, col=19), Player.white): 8718301518594398971,
-    (Point(row=9, col=1), Player.black): 8142368934600205028,
-    (Point(row=9, col=1), Player.white): 3532105980013081249,
-    (Point(row=9, col=2), Player.black): 5924017306302247244,
-    (Point(row=9, col=2), Player.white): 5546373567818757064,
-    (Point(row=9, col=3), Player.black): 5360074962767955612,
-    (Point(row=9, col=3), Player.white): 7336584657063130324,
-    (Point(row=9, col=4), Player.black): 2410867863628928865,
-    (Point(row=9, col=4), Player.white): 3514144827302209816,
-    (Point(row=9, col=5), Player.black): 9153567218038606401,
-    (Point(row=9, col=5), Player.white): 1742150023040619887,
-    (Point(row=9, col=6), Player.black): 3430257884582183371,
-    (Point(row=9, col=6), Player.white): 3371475121143747641,
-    (Point(row=9, col=7), Player.black): 6705919017990127351,
-    (Point(row=9, col=7), Player.white): 2452034170294646081,
-    (Point(row=9, col=8), Player.black): 2645551536370840768,
-    (Point(row=9, col=8), Player.white): 7649175255710208151,
-    (Point(row=9, col=9), Player.black): 4261825909654302126,
-    (Point(row=9, col=9), Player.white): 4059492053156273947,
-    (Point(row=9, col=10), Player.black): 4170306949783306326,
-    (Point(row=9, col=10), Player.white): 3526510155081475360,
-    (Point(row=9, col=11), Player.black): 1283243787466002390,
-    (Point(row=9, col=11), Player.white): 1781087240299223604,
-    (Point(row=9, col=12), Player.black): 335036245309516408,
-    (Point(row=9, col=12), Player.white): 6957099995308018057,
-    (Point(row=9, col=13), Player.black): 8334569890937430262,
-    (Point(row=9, col=13), Player.white): 4584791439225092121,
-    (Point(row=9, col=14), Player.black): 4168910688397334149,
-    (Point(row=9, col=14), Player.white): 2235331548323176676,
-    (Point(row=9, col=15), Player.black): 2463476451407982779,
-    (Point(row=9, col=15), Player.white): 6807481188206537180,
-    (Point(row=9, col=16), Player.black): 1662036030593277331,
-    (Point(row=9, col=16), Player.white): 2548723218438524571,
-    (Point(row=9, col=17), Player.black): 6114933426616457625,
-    (Point(row=9, col=17), Player.white): 3063825434054371557,
-    (Point(row=9, col=18), Player.black): 6325591632793964050,
-    (Point(row=9, col=18), Player.white): 1332537681786675566,
-    (Point(row=9, col=19), Player.black): 3316856740512468306,
-    (Point(row=9, col=19), Player.white): 2074252268178705930,
-    (Point(row=10, col=1), Player.black): 4639809757030710091,
-    (Point(row=10, col=1), Player.white): 6931578420462400733,
-    (Point(row=10, col=2), Player.black): 5055680576516549106,
-    (Point(row=10, col=2), Player.white): 692423106472256343,
-    (Point(row=10, col=3), Player.black): 367416763723960962,
-    (Point(row=10, col=3), Player.white): 7966035645281385679,
-    (Point(row=10, col=4), Player.black): 8203775904121005362,
-    (Point(row=10, col=4), Player.white): 654063029138506870,
-    (Point(row=10, col=5), Player.black): 2052890397533984395,
-    (Point(row=10, col=5), Player.white): 4676882664458100278,
-    (Point(row=10, col=6), Player.black): 7930131489584925217,
-    (Point(row=10, col=6), Player.white): 6996767894105360269,
-    (Point(row=10, col=7), Player.black): 5213729016608051397,
-    (Point(row=10, col=7), Player.white): 6742051859770665413,
-    (Point(row=10, col=8), Player.black): 6678401399562633038,
-    (Point(row=10, col=8), Player.white): 2301578135001931368,
-    (Point(row=10, col=9), Player.black): 9184972152972504047,
-    (Point(row=10, col=9), Player.white): 1043242496277669333,
-    (Point(row=10, col=10), Player.black): 469951147197103817,
-    (Point(row=10, col=10), Player.white): 5036282909665507230,
-    (Point(row=10, col=11), Player.black): 4953058146293150490,
-    (Point(row=10, col=11), Player.white): 1720323499284437821,
-    (Point(row=10, col=12), Player.black): 2380305344504761735,
-    (Point(row=10, col=12), Player.white): 6680508444924552083,
-    (Point(row=10, col=13), Player.black): 5812344497974292123,
-    (Point(row=10, col=13), Player.white): 1539076135091241729,
-    (Point(row=10, col=14), Player.black): 2092686182310241167,
-    (Point(row=10, col=14), Player.white): 1858303748966981410,
-    (Point(row=10, col=15), Player.black): 6144897152165396747,
-    (Point(row=10, col=15), Player.white): 7009382250648205853,
-    (Point(row=10, col=16), Player.black): 4099978773575105512,
-    (Point(row=10, col=16), Player.white): 8813692847594733106,
-    (Point(row=10, col=17), Player.black): 2211582457125566458,
-    (Point(row=10, col=17), Player.white): 5751958141479923160,
-    (Point(row=10, col=18), Player.black): 9208115124075644831,
-    (Point(row=10, col=18), Player.white): 8989309039422486961,
-    (Point(row=10, col=19), Player.black): 1387192513498393404,
-    (Point(row=10, col=19), Player.white): 8956240750335409756,
-    (Point(row=11, col=1), Player.black): 8270201723500715188,
-    (Point(row=11, col=1), Player.white): 3129401004628557982,
-    (Point(row=11, col=2), Player.black): 5541810022928424721,
-    (Point(row=11, col=2), Player.white): 6541362344126183299,
-    (Point(row=11, col=3), Player.black): 6349631246055105540,
-    (Point(row=11, col=3), Player.white): 3068478483837233533,
-    (Point(row=11, col=4), Player.black): 6352353206246476855,
-    (Point(row=11, col=4), Player.white): 6538501329550398644,
-    (Point(row=11, col=5), Player.black): 104663503923661033,
-    (Point(row=11, col=5), Player.white): 8145224152483347664,
-    (Point(row=11, col=6), Player.black): 6172382784389795290,
-    (Point(row=11, col=6), Player.white): 7567012922368504209,
-    (Point(row=11, col=7), Player.black): 5084336832009396047,
-    (Point(row=11, col=7), Player.white): 6984976392884134697,
-    (Point(row=11, col=8), Player.black): 4556193379950268091,
-    (Point(row=11, col=8), Player.white): 976642552953319845,
-    (Point(row=11, col=9), Player.black): 621492211098491714,
-    (Point(row=11, col=9), Player.white): 250012988400591483,
-    (Point(row=11, col=10), Player.black): 5463886135070565408,
-    (Point(row=11, col=10), Player.white): 1384622847567212511,
-    (Point(row=11, col=11), Player.black): 941555222439415518,
-    (Point(row=11, col=11), Player.white): 7244642685180670714,
-    (Point(row=11, col=12), Player.black): 3985101804760128292,
-    (Point(row=11, col=12), Player.white): 1706527186637216333,
-    (Point(row=11, col=13), Player.black): 850265537457438015,
-    (Point(row=11, col=13), Player.white): 8984626031187317460,
-    (Point(row=11, col=14), Player.black): 2861841745078785032,
-    (Point(row=11, col=14), Player.white): 2665475133957820728,
-    (Point(row=11, col=15), Player.black): 9087582274273111153,
-    (Point(row=11, col=15), Player.white): 4938198409613987159,
-    (Point(row=11, col=16), Player.black): 4711730822514566113,
-    (Point(row=11, col=16), Player.white): 1499636250742790931,
-    (Point(row=11, col=17), Player.black): 6134283249310706567,
-    (Point(row=11, col=17), Player.white): 6984149055088881134,
-    (Point(row=11, col=18), Player.black): 7631370563418133615,
-    (Point(row=11, col=18), Player.white): 2167170046464792397,
-    (Point(row=11, col=19), Player.black): 4820395571184669408,
-    (Point(row=11, col=19), Player.white): 8246053762858424413,
-    (Point(row=12, col=1), Player.black): 3248890594884604803,
-    (Point(row=12, col=1), Player.white): 3079570768286757777,
-    (Point(row=12, col=2), Player.black): 3391680201249032190,
-    (Point(row=12, col=2), Player.white): 8636810614310478464,
-    (Point(row=12, col=3), Player.black): 1667936943982556871,
-    (Point(row=12, col=3), Player.white): 4462799900844938365,
-    (Point(row=12, col=4), Player.black): 7415085726686327793,
-    (Point(row=12, col=4), Player.white): 277536333023802043,
-    (Point(row=12, col=5), Player.black): 1369944158874558968,
-    (Point(row=12, col=5), Player.white): 6690354423208218662,
-    (Point(row=12, col=6), Player.black): 3594653323224025615,
-    (Point(row=12, col=6), Player.white): 1863694317893043043,
-    (Point(row=12, col=7), Player.black): 9117148050217179024,
-    (Point(row=12, col=7), Player.white): 8578249506746448536,
-    (Point(row=12, col=8), Player.black): 3588309293129533987,
-    (Point(row=12, col=8), Player.white): 8322398646761725608,
-    (Point(row=12, col=9), Player.black): 6829648345896830620,
-    (Point(row=12, col=9), Player.white): 6334964688987567893,
-    (Point(row=12, col=10), Player.black): 4274542664940978729,
-    (Point(row=12, col=10), Player.white): 258028436185260562,
-    (Point(row=12, col=11), Player.black): 2498647699771770902,
-    (Point(row=12, col=11), Player.white): 3858088459421232819,
-    (Point(row=12, col=12), Player.black): 2822465252698758880,
-    (Point(row=12, col=12), Player.white): 7575068457854419646,
-    (Point(row=12, col=13), Player.black): 7654157421392447332,
-    (Point(row=12, col=13), Player.white): 6003049709272500597,
-    (Point(row=12, col=14), Player.black): 1698658029556884414,
-    (Point(row=12, col=14), Player.white): 5937035590340368297,
-    (Point(row=12, col=15), Player.black): 7521349837397152786,
-    (Point(row=12, col=15), Player.white): 5810242945157998654,
-    (Point(row=12, col=16), Player.black): 2836112273576463402,
-    (Point(row=12, col=16), Player.white): 2039242574264466279,
-    (Point(row=12, col=17), Player.black): 1479733617798017463,
-    (Point(row=12, col=17), Player.white): 8667990278096086249,
-    (Point(row=12, col=18), Player.black): 5008571855462021137,
-    (Point(row=12, col=18), Player.white): 1965458025963110211,
-    (Point(row=12, col=19), Player.black): 8682747645650103711,
-    (Point(row=12, col=19), Player.white): 2266019372956259679,
-    (Point(row=13, col=1), Player.black): 6333972369573520361,
-    (Point(row=13, col=1), Player.white): 5416588118960266890,
-    (Point(row=13, col=2), Player.black): 7342956753094601438,
-    (Point(row=13, col=2), Player.white): 3567308173666616488,
-    (Point(row=13, col=3), Player.black): 7832841491959473884,
-    (Point(row=13, col=3), Player.white): 946075711849084714,
-    (Point(row=13, col=4), Player.black): 3277501847065898404,
-    (Point(row=13, col=4), Player.white): 2023565804274988399,
-    (Point(row=13, col=5), Player.black): 4520113909312726565,
-    (Point(row=13, col=5), Player.white): 5222412645527303795,
-    (Point(row=13, col=6), Player.black): 3718184562855043466,
-    (Point(row=13, col=6), Player.white): 5485028478256158265,
-    (Point(row=13, col=7), Player.black): 346845678565520484,
-    (Point(row=13, col=7), Player.white): 6840792357506254649,
-    (Point(row=13, col=8), Player.black): 6446089703553420888,
-    (Point(row=13, col=8), Player.white): 7048383280498127298,
-    (Point(row=13, col=9), Player.black): 2508806827590364016,
-    (Point(row=13, col=9), Player.white): 4297490952239208473,
-    (Point(row=13, col=10), Player.black): 4036881273173124909,
-    (Point(row=13, col=10), Player.white): 485049366075600502,
-    (Point(row=13, col=11), Player.black): 8382675592754138783,
-    (Point(row=13, col=11), Player.white): 4178872950278769667,
-    (Point(row=13, col=12), Player.black): 70525595287108724,
-    (Point(row=13, col=12), Player.white): 7857369885121268169,
-    (Point(row=13, col=13), Player.black): 2322249656242875665,
-    (Point(row=13, col=13), Player.white): 6619507385253678211,
-    (Point(row=13, col=14), Player.black): 2087479381613723552,
-    (Point(row=13, col=14), Player.white): 3740901177735609530,
-    (Point(row=13, col=15), Player.black): 1623245569813044666,
-    (Point(row=13, col=15), Player.white): 7752918869745708231,
-    (Point(row=13, col=16), Player.black): 6794960761655729257,
-    (Point(row=13, col=16), Player.white): 6309266758561476772,
-    (Point(row=13, col=17), Player.black): 7841396012229723343,
-    (Point(row=13, col=17), Player.white): 2346257994497171424,
-    (Point(row=13, col=18), Player.black): 6003543399997274455,
-    (Point(row=13, col=18), Player.white): 6411582161128661199,
-    (Point(row=13, col=19), Player.black): 2341184893480777015,
-    (Point(row=13, col=19), Player.white): 87205219604028085,
-    (Point(row=14, col=1), Player.black): 1487871486411581226,
-    (Point(row=14, col=1), Player.white): 8943165327131863068,
-    (Point(row=14, col=2), Player.black): 8079193919539185209,
-    (Point(row=14, col=2), Player.white): 7759698499971740942,
-    (Point(row=14, col=3), Player.black): 1226701932789629764,
-    (Point(row=14, col=3), Player.white): 2440773576137254541,
-    (Point(row=14, col=4), Player.black): 6465780525880619752,
-    (Point(row=14, col=4), Player.white): 4511029117349657474,
-    (Point(row=14, col=5), Player.black): 5609899317523786708,
-    (Point(row=14, col=5), Player.white): 2148247319130515269,
-    (Point(row=14, col=6), Player.black): 7499844677092842786,
-    (Point(row=14, col=6), Player.white): 1925565594273968589,
-    (Point(row=14, col=7), Player.black): 8846274114142109947,
-    (Point(row=14, col=7), Player.white): 696947219681116977,
-    (Point(row=14, col=8), Player.black): 4229950076811600402,
-    (Point(row=14, col=8), Player.white): 1779341587020442229,
-    (Point(row=14, col=9), Player.black): 4314756459032195747,
-    (Point(row=14, col=9), Player.white): 3588202599020892408,
-    (Point(row=14, col=10), Player.black): 6914946149494981278,
-    (Point(row=14, col=10), Player.white): 2752206828936260263,
-    (Point(row=14, col=11), Player.black): 5513832341171321938,
-    (Point(row=14, col=11), Player.white): 2823548589488987940,
-    (Point(row=14, col=12), Player.black): 8386008397715229281,
-    (Point(row=14, col=12), Player.white): 4733361808267212869,
-    (Point(row=14, col=13), Player.black): 8507193853561014417,
-    (Point(row=14, col=13), Player.white): 6847748792331319716,
-    (Point(row=14, col=14), Player.black): 6503315626496689221,
-    (Point(row=14, col=14), Player.white): 1512620868042864456,
-    (Point(row=14, col=15), Player.black): 1169652317366964361,
-    (Point(row=14, col=15), Player.white): 3862974523838548835,
-    (Point(row=14, col=16), Player.black): 8099992875553190633,
-    (Point(row=14, col=16), Player.white): 3127485793785006066,
-    (Point(row=14, col=17), Player.black): 3615104080247541489,
-    (Point(row=14, col=17), Player.white): 3075854031319947719,
-    (Point(row=14, col=18), Player.black): 9082902182600666820,
-    (Point(row=14, col=18), Player.white): 6175098466131747668,
-    (Point(row=14, col=19), Player.black): 7679052968301839864,
-    (Point(row=14, col=19), Player.white): 9203961480168351651,
-    (Point(row=15, col=1), Player.black): 496448353015132974,
-    (Point(row=15, col=1), Player.white): 2218811769209015317,
-    (Point(row=15, col=2), Player.black): 8035365891726701990,
-    (Point(row=15, col=2), Player.white): 7245688126153295132,
-    (Point(row=15, col=3), Player.black): 8404558134371491690,
-    (Point(row=15, col=3), Player.white): 401652337718060355,
-    (Point(row=15, col=4), Player.black): 303272235349066531,
-    (Point(row=15, col=4), Player.white): 8960726106736606545,
-    (Point(row=15, col=5), Player.black): 5916885529263475547,
-    (Point(row=15, col=5), Player.white): 4047461015257269720,
-    (Point(row=15, col=6), Player.black): 5045685001751661301,
-    (Point(row=15, col=6), Player.white): 712449742776797212,
-    (Point(row=15, col=7), Player.black): 903413918601495058,
-    (Point(row=15, col=7), Player.white): 4008583470203770389,
-    (Point(row=15, col=8), Player.black): 5292619958409243978,
-    (Point(row=15, col=8), Player.white): 7598198381639925298,
-    (Point(row=15, col=9), Player.black): 2043039731437524718,
-    (Point(row=15, col=9), Player.white): 2598892013371203905,
-    (Point(row=15, col=10), Player.black): 3657654745974878441,
-    (Point(row=15, col=10), Player.white): 4481053485877960331,
-    (Point(row=15, col=11), Player.black): 8290249179888060842,
-    (Point(row=15, col=11), Player.white): 1133861520044893019,
-    (Point(row=15, col=12), Player.black): 4222616563724801588,
-    (Point(row=15, col=12), Player.white): 6505120448494652090,
-    (Point(row=15, col=13), Player.black): 4784006696796238769,
-    (Point(row=15, col=13), Player.white): 4757936782341882386,
-    (Point(row=15, col=14), Player.black): 4615669992619694393,
-    (Point(row=15, col=14), Player.white): 8361798411869451936,
-    (Point(row=15, col=15), Player.black): 4696035167226623067,
-    (Point(row=15, col=15), Player.white): 6179846934986817431,
-    (Point(row=15, col=16), Player.black): 3762738708989249373,
-    (Point(row=15, col=16), Player.white): 7928144306274997003,
-    (Point(row=15, col=17), Player.black): 7013521435076720077,
-    (Point(row=15, col=17), Player.white): 7597997073744284955,
-    (Point(row=15, col=18), Player.black): 7642540273348750390,
-    (Point(row=15, col=18), Player.white): 7123229995769799808,
-    (Point(row=15, col=19), Player.black): 6010557591982675602,
-    (Point(row=15, col=19), Player.white): 4969966360888736857,
-    (Point(row=16, col=1), Player.black): 2323273001503922658,
-    (Point(row=16, col=1), Player.white): 880019858441870554,
-    (Point(row=16, col=2), Player.black): 8927493419141385132,
-    (Point(row=16, col=2), Player.white): 2373273570904493733,
-    (Point(row=16, col=3), Player.black): 1252595073397840514,
-    (Point(row=16, col=3), Player.white): 1441243769070703403,
-    (Point(row=16, col=4), Player.black): 156203409630768693,
-    (Point(row=16, col=4), Player.white): 3234860226180528102,
-    (Point(row=16, col=5), Player.black): 2461368546968863498,
-    (Point(row=16, col=5), Player.white): 84895647852997853,
-    (Point(row=16, col=6), Player.black): 6685667053726406180,
-    (Point(row=16, col=6), Player.white): 7235723527406780527,
-    (Point(row=16, col=7), Player.black): 6321092393147395509,
-    (Point(row=16, col=7), Player.white): 1681830813460776716,
-    (Point(row=16, col=8), Player.black): 965803362534613859,
-    (Point(row=16, col=8), Player.white): 2442333196627279718,
-    (Point(row=16, col=9), Player.black): 846108391687892250,
-    (Point(row=16, col=9), Player.white): 5569490934596998679,
-    (Point(row=16, col=10), Player.black): 248329338138142505,
-    (Point(row=16, col=10), Player.white): 8416754669290361779,
-    (Point(row=16, col=11), Player.black): 4941750029448737565,
-    (Point(row=16, col=11), Player.white): 720742501846773516,
-    (Point(row=16, col=12), Player.black): 1307457603947227277,
-    (Point(row=16, col=12), Player.white): 5600534901612511909,
-    (Point(row=16, col=13), Player.black): 8714591119561399131,
-    (Point(row=16, col=13), Player.white): 8480402264287982230,
-    (Point(row=16, col=14), Player.black): 2759043072904684611,
-    (Point(row=16, col=14), Player.white): 3978983140907123455,
-    (Point(row=16, col=15), Player.black): 3114318855169188561,
-    (Point(row=16, col=15), Player.white): 6159668889035908977,
-    (Point(row=16, col=16), Player.black): 4278337700425753551,
-    (Point(row=16, col=16), Player.white): 4862212392288437286,
-    (Point(row=16, col=17), Player.black): 2856678720874488087,
-    (Point(row=16, col=17), Player.white): 668740878416965286,
-    (Point(row=16, col=18), Player.black): 6906238556598159846,
-    (Point(row=16, col=18), Player.white): 1416510347125836836,
-    (Point(row=16, col=19), Player.black): 1334990395646419876,
-    (Point(row=16, col=19), Player.white): 1865475453606258532,
-    (Point(row=17, col=1), Player.black): 1570570997469400437,
-    (Point(row=17, col=1), Player.white): 6251146415329329086,
-    (Point(row=17, col=2), Player.black): 4847249170412750520,
-    (Point(row=17, col=2), Player.white): 5733569185707450555,
-    (Point(row=17, col=3), Player.black): 1645189182784561491,
-    (Point(row=17, col=3), Player.white): 6832840894334384585,
-    (Point(row=17, col=4), Player.black): 3846763245385536983,
-    (Point(row=17, col=4), Player.white): 2201851584231579660,
-    (Point(row=17, col=5), Player.black): 6154332905658821659,
-    (Point(row=17, col=5), Player.white): 9130381634452119334,
-    (Point(row=17, col=6), Player.black): 8457348278254074745,
-    (Point(row=17, col=6), Player.white): 8554781182462312293,
-    (Point(row=17, col=7), Player.black): 4316765850628480782,
-    (Point(row=17, col=7), Player.white): 7982510408550349732,
-    (Point(row=17, col=8), Player.black): 6419095147635237734,
-    (Point(row=17, col=8), Player.white): 1167714061846220020,
-    (Point(row=17, col=9), Player.black): 3490850908229780285,
-    (Point(row=17, col=9), Player.white): 9006595442701081763,
-    (Point(row=17, col=10), Player.black): 9171092522859819907,
-    (Point(row=17, col=10), Player.white): 8401406403528161898,
-    (Point(row=17, col=11), Player.black): 2898193961168187618,
-    (Point(row=17, col=11), Player.white): 7004299760177586098,
-    (Point(row=17, col=12), Player.black): 7649088287328232055,
-    (Point(row=17, col=12), Player.white): 66278026868607179,
-    (Point(row=17, col=13), Player.black): 715029073847428633,
-    (Point(row=17, col=13), Player.white): 6230478730094791091,
-    (Point(row=17, col=14), Player.black): 7255216299800733958,
-    (Point(row=17, col=14), Player.white): 6929766737822456560,
-    (Point(row=17, col=15), Player.black): 1750795506158559927,
-    (Point(row=17, col=15), Player.white): 3402689424383371513,
-    (Point(row=17, col=16), Player.black): 163245165485466265,
-    (Point(row=17, col=16), Player.white): 3814655899489506845,
-    (Point(row=17, col=17), Player.black): 4723023603194101572,
-    (Point(row=17, col=17), Player.white): 5664762458639074801,
-    (Point(row=17, col=18), Player.black): 6369815279397107818,
-    (Point(row=17, col=18), Player.white): 1916083704515772214,
-    (Point(row=17, col=19), Player.black): 5772216473068508486,
-    (Point(row=17, col=19), Player.white): 4944343441504224037,
-    (Point(row=18, col=1), Player.black): 540173497069053689,
-    (Point(row=18, col=1), Player.white): 7211778634382757661,
-    (Point(row=18, col=2), Player.black): 3036067021086294945,
-    (Point(row=18, col=2), Player.white): 1540835484104004220,
-    (Point(row=18, col=3), Player.black): 2767638751011821967,
-    (Point(row=18, col=3), Player.white): 487568310567361845,
-    (Point(row=18, col=4), Player.black): 7075421583112003491,
-    (Point(row=18, col=4), Player.white): 7184571016726791805,
-    (Point(row=18, col=5), Player.black): 5241640207868636029,
-    (Point(row=18, col=5), Player.white): 2555481526362689996,
-    (Point(row=18, col=6), Player.black): 7461023070081178249,
-    (Point(row=18, col=6), Player.white): 1391491250310316387,
-    (Point(row=18, col=7), Player.black): 2224583468408151172,
-    (Point(row=18, col=7), Player.white): 7086609315128623780,
-    (Point(row=18, col=8), Player.black): 9102367772379882411,
-    (Point(row=18, col=8), Player.white): 6891212471561353348,
-    (Point(row=18, col=9), Player.black): 2021660677771585297,
-    (Point(row=18, col=9), Player.white): 5823865236603582921,
-    (Point(row=18, col=10), Player.black): 5952724080903752775,
-    (Point(row=18, col=10), Player.white): 283687441526480795,
-    (Point(row=18, col=11), Player.black): 8158771252928334028,
-    (Point(row=18, col=11), Player.white): 3993649529354852438,
-    (Point(row=18, col=12), Player.black): 4251901010609393157,
-    (Point(row=18, col=12), Player.white): 7176788028375457109,
-    (Point(row=18, col=13), Player.black): 6465409443296300985,
-    (Point(row=18, col=13), Player.white): 3116951109769560862,
-    (Point(row=18, col=14), Player.black): 5514627997426596409,
-    (Point(row=18, col=14), Player.white): 8229158809526766550,
-    (Point(row=18, col=15), Player.black): 2811851094285769112,
-    (Point(row=18, col=15), Player.white): 6247298173782560200,
-    (Point(row=18, col=16), Player.black): 2047259045747911269,
-    (Point(row=18, col=16), Player.white): 4059507225450919632,
-    (Point(row=18, col=17), Player.black): 2671912701472190978,
-    (Point(row=18, col=17), Player.white): 8072566552312528322,
-    (Point(row=18, col=18), Player.black): 4133327429077140894,
-    (Point(row=18, col=18), Player.white): 7169205878906518378,
-    (Point(row=18, col=19), Player.black): 2676403786990812991,
-    (Point(row=18, col=19), Player.white): 8972953780785979299,
-    (Point(row=19, col=1), Player.black): 5615967344085773238,
-    (Point(row=19, col=1), Player.white): 1709362886393812940,
-    (Point(row=19, col=2), Player.black): 3949079997593391992,
-    (Point(row=19, col=2), Player.white): 5955587202606511601,
-    (Point(row=19, col=3), Player.black): 3162512201226361111,
-    (Point(row=19, col=3), Player.white): 4457784605804965680,
-    (Point(row=19, col=4), Player.black): 1449708370156577537,
-    (Point(row=19, col=4), Player.white): 4152742113880734432,
-    (Point(row=19, col=5), Player.black): 7419192487281200902,
-    (Point(row=19, col=5), Player.white): 6831061652223961715,
-    (Point(row=19, col=6), Player.black): 3723363001635062340,
-    (Point(row=19, col=6), Player.white): 5622307269601269663,
-    (Point(row=19, col=7), Player.black): 6380536525855325678,
-    (Point(row=19, col=7), Player.white): 7901558767670683080,
-    (Point(row=19, col=8), Player.black): 9143560067763050915,
-    (Point(row=19, col=8), Player.white): 3736943894574161053,
-    (Point(row=19, col=9), Player.black): 6118429198233123476,
-    (Point(row=19, col=9), Player.white): 5791950017056225657,
-    (Point(row=19, col=10), Player.black): 7612180633397910257,
-    (Point(row=19, col=10), Player.white): 5771032230177900210,
-    (Point(row=19, col=11), Player.black): 2029457023937949079,
-    (Point(row=19, col=11), Player.white): 6316473383775168423,
-    (Point(row=19, col=12), Player.black): 1418166512996935709,
-    (Point(row=19, col=12), Player.white): 7299367737286798095,
-    (Point(row=19, col=13), Player.black): 8647979551574893090,
-    (Point(row=19, col=13), Player.white): 8790683837829025032,
-    (Point(row=19, col=14), Player.black): 5958096542181927152,
-    (Point(row=19, col=14), Player.white): 7755345875541209754,
-    (Point(row=19, col=15), Player.black): 571003173075521539,
-    (Point(row=19, col=15), Player.white): 4500713081258374712,
-    (Point(row=19, col=16), Player.black): 8320237324732372371,
-    (Point(row=19, col=16), Player.white): 9136768387086418249,
-    (Point(row=19, col=17), Player.black): 5831094606333134169,
-    (Point(row=19, col=17), Player.white): 2811769899115598691,
-    (Point(row=19, col=18), Player.black): 320514758255661010,
-    (Point(row=19, col=18), Player.white): 1964216548637197865,
-    (Point(row=19, col=19), Player.black): 5899502359693090121,
-    (Point(row=19, col=19), Player.white): 3382965753028330842,
-}
+__all__ = ['EMPTY_BOARD', 'SEED', 'ZobristTable', 'table_for']
 
+# The hash value of an empty board
 EMPTY_BOARD = 0
+# Seed used to generate the codes of every board size
+SEED = 1846
+
+MAX63 = 0x7fffffffffffffff
+
+
+class ZobristTable():
+
+    def __init__(self, num_rows, num_cols, seed = SEED):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        num_points = num_rows * num_cols
+        # String seeds are hashed the same way on every run and platform
+        rng = random.Random('%d:%dx%d' % (seed, num_rows, num_cols))
+        self.codes = {
+            Player.black: array(
+                'Q', (rng.randint(0, MAX63) for _ in range(num_points))),
+            Player.white: array(
+                'Q', (rng.randint(0, MAX63) for _ in range(num_points))),
+        }
+        # Translation tables for hash_colors, they turn a color value into 1
+        # when it matches the player and into 0 otherwise
+        self._selectors = {
+            player: bytes(1 if value == player.value else 0
+                          for value in range(256))
+            for player in (Player.black, Player.white)
+        }
+
+    # Index of a point in the code arrays
+    def index(self, point):
+        return (point.row - 1) * self.num_cols + (point.col - 1)
+
+    # The code of a stone of the player on the point
+    def code(self, point, player):
+        return self.codes[player][(point.row - 1) * self.num_cols +
+                                  (point.col - 1)]
+
+    # Hash a whole position at once. The colors are one value per point, in
+    # the same order as the code arrays, using the value of each Player for
+    # stones and 0 for empty points. The codes of each color are picked out
+    # and XOR-reduced without any Python level loop over the points
+    def hash_colors(self, colors):
+        colors = bytes(colors)
+        position_hash = EMPTY_BOARD
+        for player in (Player.black, Player.white):
+            selector = colors.translate(self._selectors[player])
+            position_hash = reduce(
+                xor, compress(self.codes[player], selector), position_hash)
+        return position_hash
+
+    # Hash any board with the Board interface from scratch
+    def hash_board(self, board):
+        return self.hash_colors(
+            0 if color is None else color.value
+            for color in (board.get(point) for point in self.points()))
+
+    # All the points of the board, in the order of the code arrays
+    def points(self):
+        return [Point(row = row, col = col)
+                for row in range(1, self.num_rows + 1)
+                for col in range(1, self.num_cols + 1)]
+
+
+_TABLES = {}
+
+
+# Returns the shared table for a board size
+def table_for(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    if key not in _TABLES:
+        _TABLES[key] = ZobristTable(num_rows, num_cols)
+    return _TABLES[key]
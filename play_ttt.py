@@ -1,5 +1,7 @@
 from dlgo.minimax import minimax
-from dlgo.ttt.tttboard import GameState, Player, Move
+from dlgo.minimax import ttt_solver
+from dlgo.ttt.tttbitboard import GameState
+from dlgo.ttt.tttboard import Player, Move
 from dlgo.ttt.ttttypes import Point
 
 # Names for the columns
@@ -47,8 +49,9 @@ def main():
     # Declare human players
     human_player = Player.x
 
-    # Declare bots
-    bot = minimax.MinimaxAgent()
+    # Declare bots. Every position is solved once, so the bot's moves are
+    # lookups
+    bot = minimax.MinimaxAgent(ttt_solver.best_result)
 
     # While the game is not over
     while not game.is_over():
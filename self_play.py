@@ -0,0 +1,37 @@
+from dlgo import selfplay
+import argparse
+
+# Headless self-play: plays many games in parallel and writes the results to
+# a JSON lines file, one game per line. For example:
+#   python self_play.py --games 100 --size 9 --black fast_random \
+#       --white random --out games.jsonl
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type = int, default = 10)
+    parser.add_argument('--size', type = int, default = 9)
+    parser.add_argument('--black', default = 'fast_random')
+    parser.add_argument('--white', default = 'fast_random')
+    parser.add_argument('--board', default = 'array',
+                        choices = sorted(selfplay.BOARDS))
+    parser.add_argument('--processes', type = int, default = None)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--max-moves', type = int, default = None)
+    parser.add_argument('--out', default = 'self_play.jsonl')
+    args = parser.parse_args()
+
+    summary = selfplay.play_games(
+        args.games, args.black, args.white, args.size, args.out,
+        board_name = args.board, processes = args.processes,
+        seed = args.seed, max_moves = args.max_moves)
+
+    print('%d games in %.2fs on %d processes' % (
+        summary['games'], summary['seconds'], summary['processes']))
+    print('%.2f games/s, %.0f moves/s' % (
+        summary['games_per_second'], summary['moves_per_second']))
+    print('Wins: %s' % summary['wins'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+from dlgo import goboard
+from dlgo.gotypes import Player, Point
+import random
+
+# Helpers shared by the board tests. Random games are played on the plain
+# dict Board, which every other board implementation is checked against.
+
+
+# Play num_games random games of legal moves from a fixed seed and return the
+# list of (player, point) plays of each one. Passes only switch the player, so
+# they are left out
+def random_plays(board_size, num_games, seed, max_moves = None):
+    rng = random.Random(seed)
+    if max_moves is None:
+        max_moves = board_size * board_size * 2
+    games = []
+    for _ in range(num_games):
+        game = goboard.GameState.new_game(board_size)
+        plays = []
+        while not game.is_over() and len(plays) < max_moves:
+            moves = [move for move in game.legal_moves() if move.is_play]
+            if not moves:
+                break
+            move = rng.choice(moves)
+            plays.append((game.next_player, move.point))
+            game = game.apply_move(move)
+        games.append(plays)
+    return games
+
+
+# Everything a board tells about itself through the Board interface: for
+# every point its color, the stones and the number of liberties of its string,
+# then the Zobrist hash
+def snapshot(board):
+    points = {}
+    for row in range(1, board.num_rows + 1):
+        for col in range(1, board.num_cols + 1):
+            point = Point(row = row, col = col)
+            string = board.get_go_string(point)
+            if string is None:
+                points[point] = (board.get(point), None, 0)
+            else:
+                points[point] = (board.get(point), frozenset(string.stones),
+                                 string.num_liberties)
+    return points, board.zobrist_hash()
+
+
+# The features an evaluation function reads, counted from scratch the way
+# capture_diff does: stones and the sum of the liberties of the strings of
+# each player
+def count_features(board):
+    stone_counts = {Player.black: 0, Player.white: 0}
+    liberty_totals = {Player.black: 0, Player.white: 0}
+    seen = set()
+    for row in range(1, board.num_rows + 1):
+        for col in range(1, board.num_cols + 1):
+            string = board.get_go_string(Point(row = row, col = col))
+            if string is None or string.stones in seen:
+                continue
+            seen.add(string.stones)
+            stone_counts[string.color] += len(string.stones)
+            liberty_totals[string.color] += string.num_liberties
+    return stone_counts, liberty_totals
+
+
+# Replay random games on a board implementation and on Board, stone by stone,
+# and check that they agree after every play. Then replay the same games
+# through GameState and check that both give the same legal moves
+def check_against_board(board_class, board_sizes = (5, 9), num_games = 3,
+                        max_moves = None):
+    for board_size in board_sizes:
+        for plays in random_plays(board_size, num_games, board_size,
+                                  max_moves):
+            board = board_class(board_size, board_size)
+            reference = goboard.Board(board_size, board_size)
+            for player, point in plays:
+                board.place_stone(player, point)
+                reference.place_stone(player, point)
+                assert snapshot(board) == snapshot(reference)
+            game = goboard.GameState.new_game(board_size, board_class)
+            reference_game = goboard.GameState.new_game(board_size)
+            for _, point in plays:
+                assert move_keys(game.legal_moves()) == \
+                    move_keys(reference_game.legal_moves())
+                move = goboard.Move.play(point)
+                game = game.apply_move(move)
+                reference_game = reference_game.apply_move(move)
+
+
+# Moves don't compare by value, so compare what they do
+def move_keys(moves):
+    return {(move.point, move.is_pass, move.is_resign) for move in moves}
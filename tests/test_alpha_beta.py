@@ -0,0 +1,38 @@
+from dlgo import goboard
+from dlgo.gotypes import Point
+from dlgo.minimax import alpha_beta
+
+
+def play(game, *moves):
+    for move in moves:
+        game = game.apply_move(move)
+    return game
+
+
+# The same board and player after a pass is a different position, as one
+# more pass ends the game
+def test_position_key_counts_passes():
+    a = goboard.Move.play(Point(row = 1, col = 1))
+    b = goboard.Move.play(Point(row = 3, col = 3))
+    pass_turn = goboard.Move.pass_turn()
+    start = goboard.GameState.new_game(3)
+    after_pass = play(start, a, b, pass_turn)
+    without_pass = play(start, pass_turn, b, a)
+    assert after_pass.board.zobrist_hash() == \
+        without_pass.board.zobrist_hash()
+    assert after_pass.next_player == without_pass.next_player
+    assert alpha_beta._position_key(after_pass) != \
+        alpha_beta._position_key(without_pass)
+
+
+# Passes are tried at every node anyway, so they never take a killer slot
+def test_pass_is_never_a_killer():
+    searcher = alpha_beta.AlphaBetaSearch()
+    searcher.killers = [[None, None]]
+    searcher._record_cutoff(goboard.Move.pass_turn(), 1, 0)
+    assert searcher.killers == [[None, None]]
+    point = Point(row = 2, col = 2)
+    searcher._record_cutoff(goboard.Move.play(point), 1, 0)
+    searcher._record_cutoff(goboard.Move.pass_turn(), 1, 0)
+    assert searcher.killers == [[point, None]]
+
@@ -0,0 +1,13 @@
+from board_helpers import check_against_board
+from dlgo.bitboard import BitBoard
+
+
+def test_bitboard_matches_board():
+    check_against_board(BitBoard)
+
+
+# A 19x19 bitboard needs more than 64 bits per color. The start of a game is
+# enough to cover the bits past the first 64
+def test_bitboard_matches_board_19x19():
+    check_against_board(BitBoard, board_sizes = (19,), num_games = 1,
+                        max_moves = 120)
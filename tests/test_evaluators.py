@@ -0,0 +1,43 @@
+from board_helpers import count_features, random_plays
+from dlgo import goboard
+from dlgo.agent.evaluators import stone_diff
+from dlgo.agent.helpers import capture_diff
+from dlgo.minimax.alpha_beta import AlphaBetaAgent
+from dlgo.selfplay import BOARDS
+
+
+# The counts Board keeps up to date as stones are placed and captured must
+# match counting them from scratch, after every play and every undo
+def test_incremental_features_match_counts():
+    for plays in random_plays(9, 3, 23):
+        board = goboard.Board(9, 9)
+        mutable = goboard.MutableBoard(9, 9)
+        for player, point in plays:
+            board.place_stone(player, point)
+            mutable.play(player, point)
+            for checked in (board, mutable):
+                assert (checked.stone_counts, checked.liberty_totals) == \
+                    count_features(checked)
+        while mutable.num_undo:
+            mutable.undo()
+            assert (mutable.stone_counts, mutable.liberty_totals) == \
+                count_features(mutable)
+
+
+# stone_diff gives the scores of capture_diff on every board backend, with or
+# without the counts
+def test_stone_diff_matches_capture_diff():
+    plays = random_plays(7, 1, 23)[0]
+    for board_class in BOARDS.values():
+        game = goboard.GameState.new_game(7, board_class)
+        for _, point in plays:
+            game = game.apply_move(goboard.Move.play(point))
+            assert stone_diff(game) == capture_diff(game)
+
+
+# The default evaluation works with boards that don't keep the counts
+def test_alpha_beta_on_every_backend():
+    for board_class in BOARDS.values():
+        game = goboard.GameState.new_game(5, board_class)
+        move = AlphaBetaAgent(2).select_move(game)
+        assert game.is_valid_move(move)
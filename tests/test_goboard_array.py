@@ -0,0 +1,6 @@
+from board_helpers import check_against_board
+from dlgo.goboard_array import ArrayBoard
+
+
+def test_array_board_matches_board():
+    check_against_board(ArrayBoard)
@@ -0,0 +1,6 @@
+from board_helpers import check_against_board
+from dlgo.goboard_uf import UnionFindBoard
+
+
+def test_union_find_board_matches_board():
+    check_against_board(UnionFindBoard)
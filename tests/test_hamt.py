@@ -0,0 +1,71 @@
+from dlgo.hamt import PersistentSet
+import pickle
+import random
+
+
+# An item with whatever hash we ask for, equal to another only by value
+class Colliding():
+
+    def __init__(self, value, item_hash):
+        self.value = value
+        self.item_hash = item_hash
+
+    def __hash__(self):
+        return self.item_hash
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and self.value == other.value
+
+    def __repr__(self):
+        return 'Colliding(%r, %r)' % (self.value, self.item_hash)
+
+
+# Build the set one item at a time, checking it against a set after every
+# add, and check that every earlier version is left as it was
+def check_items(items):
+    versions = [(PersistentSet(), set())]
+    for item in items:
+        persistent, expected = versions[-1]
+        expected = expected | {item}
+        persistent = persistent.add(item)
+        assert len(persistent) == len(expected)
+        assert set(persistent) == expected
+        for other in items:
+            assert (other in persistent) == (other in expected)
+        versions.append((persistent, expected))
+    for persistent, expected in versions:
+        assert set(persistent) == expected
+        assert len(persistent) == len(expected)
+
+
+def test_equal_hashes_go_to_a_bucket():
+    items = [Colliding(value, 12345) for value in range(10)]
+    check_items(items + items[:3])
+
+
+# Hashes that share their first 60 bits or more reach the bottom of the trie
+def test_hashes_equal_in_low_bits():
+    items = [Colliding(value, value << 60) for value in range(16)]
+    check_items(items)
+
+
+# Negative hashes and hashes past 64 bits are folded to 64 bits
+def test_folded_hashes():
+    items = [Colliding(0, -1), Colliding(1, (1 << 64) - 1),
+             Colliding(2, 1 << 64), Colliding(3, 0), Colliding(4, -2)]
+    check_items(items)
+
+
+# A mix of colliding and ordinary items, added in random order
+def test_random_collisions():
+    rng = random.Random(7)
+    items = [Colliding(value, rng.choice((1, 2, 1 << 63, rng.getrandbits(64))))
+             for value in range(60)]
+    rng.shuffle(items)
+    check_items(items)
+
+
+def test_pickle_round_trip():
+    items = [Colliding(value, value % 3) for value in range(10)]
+    persistent = PersistentSet(items)
+    assert set(pickle.loads(pickle.dumps(persistent))) == set(items)
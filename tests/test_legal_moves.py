@@ -0,0 +1,60 @@
+from board_helpers import move_keys, random_plays
+from dlgo import goboard
+from dlgo.gotypes import Point
+from dlgo.selfplay import BOARDS
+import copy
+
+
+# The legality check GameState used to do: apply the play to a copy of the
+# board, then look at the liberties of the new string and the new hash
+def reference_legal_moves(game_state):
+    board = game_state.board
+    moves = []
+    for row in range(1, board.num_rows + 1):
+        for col in range(1, board.num_cols + 1):
+            point = Point(row = row, col = col)
+            if board.get(point) is not None:
+                continue
+            next_board = copy.deepcopy(board)
+            next_board.place_stone(game_state.next_player, point)
+            if next_board.get_go_string(point).num_liberties == 0:
+                continue
+            next_situation = (game_state.next_player.other,
+                              next_board.zobrist_hash())
+            if next_situation in game_state.previous_states:
+                continue
+            moves.append(goboard.Move.play(point))
+    moves.append(goboard.Move.pass_turn())
+    moves.append(goboard.Move.resign())
+    return moves
+
+
+# Along random games, with and without the empty points of the previous state
+# to start from, on every board backend
+def test_legal_moves_match_reference():
+    for board_size in (5, 7):
+        for plays in random_plays(board_size, 3, board_size):
+            for board_class in BOARDS.values():
+                game = goboard.GameState.new_game(board_size, board_class)
+                for index, (_, point) in enumerate(plays):
+                    if index % 2 == 0:
+                        assert move_keys(game.legal_moves()) == \
+                            move_keys(reference_legal_moves(game))
+                    game = game.apply_move(goboard.Move.play(point))
+
+
+# The stones captured by a move are found from the previous board
+def test_captured_points():
+    for plays in random_plays(7, 3, 1):
+        game = goboard.GameState.new_game(7)
+        for _, point in plays:
+            previous = game
+            game = game.apply_move(goboard.Move.play(point))
+            captured = {
+                Point(row = row, col = col)
+                for row in range(1, 8) for col in range(1, 8)
+                if previous.board.get(Point(row = row, col = col)) and
+                game.board.get(Point(row = row, col = col)) is None
+            }
+            assert set(game.captured_points) == captured
+            assert len(game.captured_points) == len(captured)
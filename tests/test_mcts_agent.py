@@ -0,0 +1,119 @@
+from dlgo import goboard
+from dlgo.gotypes import Point
+from dlgo.mcst import mcts_agent
+import pickle
+import random
+
+
+def play(game, *moves):
+    for move in moves:
+        game = game.apply_move(move)
+    return game
+
+
+# A game state sent to a worker comes back with the same answers for
+# everything a search asks of it
+def test_position_task_round_trip():
+    start = goboard.GameState.new_game(5)
+    stone = goboard.Move.play(Point(row = 3, col = 3))
+    pass_turn = goboard.Move.pass_turn()
+    positions = [
+        start,
+        play(start, stone),
+        play(start, stone, pass_turn),
+        play(start, stone, pass_turn, pass_turn),
+        play(start, pass_turn, stone, pass_turn),
+        play(start, stone, goboard.Move.resign()),
+    ]
+    for game in positions:
+        task = pickle.loads(pickle.dumps(mcts_agent._position_task(game)))
+        rebuilt = mcts_agent._position_from_task(task)
+        assert rebuilt.is_over() == game.is_over()
+        assert rebuilt.winner() == game.winner()
+        assert rebuilt.next_player == game.next_player
+        assert [mcts_agent._move_to_key(move)
+                for move in rebuilt.legal_moves()] == \
+            [mcts_agent._move_to_key(move) for move in game.legal_moves()]
+        # One more pass ends the game only after a pass
+        after = rebuilt.apply_move(pass_turn)
+        if not game.is_over():
+            assert after.is_over() == game.apply_move(pass_turn).is_over()
+
+
+# Early stopping only protects the most visited move, so that is the move a
+# search that stopped early must play
+def test_early_stop_plays_most_visited_move():
+    random.seed(0)
+    agent = mcts_agent.MCTSAgent(300, 1.5)
+    search = agent.start_search(goboard.GameState.new_game(3))
+    done = search.run(max_rounds = 300, early_stop = True)
+    assert search.stopped_early
+    assert done < 300
+    most_visited = max(search.root.children,
+                       key = lambda child: child.num_rollouts)
+    assert search.best_move().point == most_visited.move.point
+
+
+# The clock is read before every leaf, so a time budget is kept even when
+# every leaf takes a while
+def test_time_budget_is_kept():
+    random.seed(0)
+    agent = mcts_agent.MCTSAgent(None, 1.5, time_budget_ms = 50)
+    search = agent.start_search(goboard.GameState.new_game(9))
+    search.run(time_budget_ms = 50)
+    assert search.num_rounds > 0
+    assert search.elapsed < 0.1
+
+
+# Root parallel workers search with the agent's settings, so with
+# leaf_rollouts every new leaf of a worker's tree gets a batch of games
+def test_root_search_worker_uses_agent_settings():
+    agent = mcts_agent.MCTSAgent(40, 1.5, leaf_rollouts = 4,
+                                 transposition_table_size = 1000)
+    position = mcts_agent._position_task(goboard.GameState.new_game(9))
+    children = mcts_agent._root_search_worker(
+        position, 40, 1.5, agent._worker_settings(), 1)
+    assert len(children) == 10
+    assert sum(rollouts for _, _, rollouts in children) == 40
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+# After our move and the opponent's reply, the search carries on from the
+# grandchild of the old root, and every other node of the old tree is thrown
+# away
+def test_tree_reuse_keeps_grandchild():
+    random.seed(16)
+    agent = mcts_agent.MCTSAgent(500, 1.5, reuse_tree = True)
+    game = goboard.GameState.new_game(5)
+    move = agent.select_move(game)
+    old_root = agent._tree
+    old_size = count_nodes(old_root)
+    child = mcts_agent._child_for_move(old_root, move)
+    grandchild = max(child.children, key = lambda node: node.num_rollouts)
+    expected_rollouts = grandchild.num_rollouts
+    assert expected_rollouts > 0
+    game = game.apply_move(move).apply_move(grandchild.move)
+    agent.select_move(game)
+    assert agent._tree is grandchild
+    assert agent.reused_rollouts == expected_rollouts
+    assert agent.reused_nodes + agent.discarded_nodes == old_size
+    assert grandchild.num_rollouts == expected_rollouts + 500
+
+
+# A game state that doesn't come from the old root gets a new tree
+def test_tree_reuse_unrelated_state():
+    random.seed(16)
+    agent = mcts_agent.MCTSAgent(200, 1.5, reuse_tree = True)
+    agent.select_move(goboard.GameState.new_game(5))
+    old_size = count_nodes(agent._tree)
+    other = goboard.GameState.new_game(5).apply_move(
+        goboard.Move.play(Point(row = 1, col = 1)))
+    agent.select_move(other)
+    assert agent.reused_rollouts == 0
+    assert agent.reused_nodes == 0
+    assert agent.discarded_nodes == old_size
+    assert agent._tree.game_state is other
+    assert agent._tree.num_rollouts == 200
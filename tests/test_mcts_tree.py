@@ -0,0 +1,68 @@
+from dlgo import goboard
+from dlgo.mcst.mcts_tree import ArrayMCTSAgent
+import pytest
+import random
+
+
+def search(num_rounds, board_size = 5):
+    random.seed(14)
+    agent = ArrayMCTSAgent(num_rounds, 1.5)
+    game = goboard.GameState.new_game(board_size)
+    move = agent.select_move(game)
+    return agent.last_tree, game, move
+
+
+# Every rollout goes through the root, the visits of the children of a node
+# add up to its child visits, and a parent's visits are its own leaf rollouts
+# plus its children's
+def test_visit_totals():
+    tree, _, _ = search(300)
+    assert tree.visits[0] == 300
+    for node in range(len(tree)):
+        children = tree.children(node)
+        assert tree.child_visits[node] == \
+            sum(tree.visits[child] for child in children)
+        # A node is visited once when it is added, then once per rollout
+        # that goes on to one of its children
+        if tree.is_expanded(node) and node != 0:
+            assert tree.visits[node] == tree.child_visits[node] + 1
+        assert 0 <= tree.wins[node] <= tree.visits[node]
+
+
+# The children of a node are one contiguous range of indexes that point back
+# to it, every node but the root is in exactly one range, and only the first
+# num_visited children of a range have been visited
+def test_contiguous_children():
+    tree, game, _ = search(300)
+    seen = [0] * len(tree)
+    for node in range(len(tree)):
+        children = tree.children(node)
+        if not tree.is_expanded(node):
+            assert len(children) == 0
+            continue
+        assert len(children) == tree.num_children[node]
+        for offset, child in enumerate(children):
+            assert tree.parent[child] == node
+            assert (tree.visits[child] > 0) == \
+                (offset < tree.num_visited[node])
+            seen[child] += 1
+    assert seen == [0] + [1] * (len(tree) - 1)
+    # The children of the root are all the legal moves
+    root_moves = {tree.move[child] for child in tree.children(0)}
+    assert root_moves == {tree.move_index(move)
+                          for move in game.legal_moves()}
+
+
+def test_best_move_is_legal():
+    _, game, move = search(100)
+    assert game.is_valid_move(move)
+
+
+# Options the agent doesn't support are rejected when it's built
+def test_rejects_unsupported_options():
+    with pytest.raises(TypeError):
+        ArrayMCTSAgent(None, 1.5, time_budget_ms = 50)
+    with pytest.raises(TypeError):
+        ArrayMCTSAgent(100, 1.5, num_workers = 2)
+    with pytest.raises(AssertionError):
+        ArrayMCTSAgent(None, 1.5)
@@ -0,0 +1,46 @@
+from dlgo.ttt import mnkboard
+from dlgo.ttt import tttbitboard
+from dlgo.ttt.tttboard import Move
+from dlgo.ttt.ttttypes import Player, Point
+import pytest
+import random
+
+
+# Any tile wins a game of k = 1, and two in a row win k = 2
+def test_small_k():
+    game = mnkboard.GameState.new_game(3, 3, 1)
+    game = game.apply_move(Move(Point(2, 2)))
+    assert game.is_over()
+    assert game.winner() == Player.x
+    game = mnkboard.GameState.new_game(3, 3, 2)
+    game = game.apply_move(Move(Point(1, 1)))
+    game = game.apply_move(Move(Point(3, 3)))
+    assert not game.is_over()
+    game = game.apply_move(Move(Point(2, 2)))
+    assert game.winner() == Player.x
+
+
+def test_apply_move_rejects_taken_point():
+    game = mnkboard.GameState.new_game()
+    game = game.apply_move(Move(Point(1, 1)))
+    with pytest.raises(AssertionError):
+        game.apply_move(Move(Point(1, 1)))
+
+
+# The winner found around the last tile is the one found by scanning the
+# whole board, and on 3x3 with k = 3 the one of tttbitboard
+def test_last_move_matches_full_scan():
+    rng = random.Random(22)
+    for num_rows, num_cols, k in ((3, 3, 3), (4, 5, 3), (6, 6, 4), (5, 5, 1)):
+        for _ in range(50):
+            game = mnkboard.GameState.new_game(num_rows, num_cols, k)
+            ttt_game = tttbitboard.GameState.new_game()
+            while not game.is_over():
+                move = rng.choice(game.legal_moves())
+                game = game.apply_move(move)
+                rescanned = mnkboard.GameState(
+                    game.board, game.next_player, move)
+                assert game.winner() == rescanned.winner()
+                if (num_rows, num_cols, k) == (3, 3, 3):
+                    ttt_game = ttt_game.apply_move(move)
+                    assert game.winner() == ttt_game.winner()
@@ -0,0 +1,53 @@
+from board_helpers import random_plays, snapshot
+from dlgo import goboard
+import copy
+
+
+# Every play of a random game, then every undo back to the empty board, must
+# go through the same positions as a Board that only moves forward
+def test_play_undo_round_trip():
+    for board_size in (5, 9):
+        for plays in random_plays(board_size, 3, seed = board_size):
+            board = goboard.MutableBoard(board_size, board_size)
+            reference = goboard.Board(board_size, board_size)
+            snapshots = [snapshot(reference)]
+            for player, point in plays:
+                board.play(player, point)
+                reference.place_stone(player, point)
+                assert snapshot(board) == snapshot(reference)
+                snapshots.append(snapshot(reference))
+            assert board.num_undo == len(plays)
+            while board.num_undo:
+                board.undo()
+                snapshots.pop()
+                assert snapshot(board) == snapshots[-1]
+
+
+# The evaluation features are put back by undo as well
+def test_undo_restores_features():
+    for plays in random_plays(9, 2, seed = 1):
+        board = goboard.MutableBoard(9, 9)
+        history = []
+        for player, point in plays:
+            history.append((dict(board.stone_counts),
+                            dict(board.capture_counts),
+                            dict(board.liberty_totals)))
+            board.play(player, point)
+        while history:
+            board.undo()
+            assert (board.stone_counts, board.capture_counts,
+                    board.liberty_totals) == history.pop()
+
+
+# A copy starts with its own empty undo log and doesn't share grid changes
+def test_deepcopy_is_independent():
+    plays = random_plays(5, 1, seed = 3)[0]
+    board = goboard.MutableBoard(5, 5)
+    for player, point in plays[:10]:
+        board.play(player, point)
+    before = snapshot(board)
+    board_copy = copy.deepcopy(board)
+    assert board_copy.num_undo == 0
+    for player, point in plays[10:]:
+        board_copy.play(player, point)
+    assert snapshot(board) == before
@@ -0,0 +1,106 @@
+from board_helpers import random_plays
+from dlgo import goboard
+from dlgo import scoring
+from dlgo.goboard_array import ArrayBoard
+from dlgo.gotypes import Player, Point
+
+
+def board_with(board_size, black, white, board_class = goboard.Board):
+    board = board_class(board_size, board_size)
+    for points, player in ((black, Player.black), (white, Player.white)):
+        for row, col in points:
+            board.place_stone(player, Point(row = row, col = col))
+    return board
+
+
+# Black holds column 2 and white column 4 of a 5x5 board. Column 1 is black
+# territory, column 5 white territory, and column 3 touches both colors, so
+# it counts for nobody
+def test_neutral_region():
+    column = range(1, 6)
+    board = board_with(5, [(row, 2) for row in column],
+                       [(row, 4) for row in column])
+    result = scoring.score_board(board, komi = 0)
+    assert (result.b, result.w) == (10, 10)
+    result = scoring.score_board(board)
+    assert result.winner == Player.white
+    assert result.winning_margin == 7.5
+
+
+# A region with no stones around it at all is nobody's either
+def test_empty_board():
+    result = scoring.score_board(goboard.Board(5, 5), komi = 0.5)
+    assert (result.b, result.w) == (0, 0)
+    assert str(result) == 'W+0.5'
+
+
+def test_komi_and_result_string():
+    result = scoring.GameResult(b = 10, w = 5, komi = 7.5)
+    assert result.winner == Player.white
+    assert result.winning_margin == 2.5
+    assert str(result) == 'W+2.5'
+    result = scoring.GameResult(b = 20, w = 5, komi = 7.5)
+    assert result.winner == Player.black
+    assert result.winning_margin == 7.5
+    assert str(result) == 'B+7.5'
+    # Black needs more than komi: a tie on the board plus komi is white's
+    result = scoring.GameResult(b = 10, w = 10, komi = 0)
+    assert result.winner == Player.white
+    assert str(result) == 'W+0.0'
+
+
+def test_resignation_loses():
+    game = goboard.GameState.new_game(5)
+    game = game.apply_move(goboard.Move.play(Point(row = 3, col = 3)))
+    assert game.winner() is None
+    # White resigns, with the board score in white's favour thanks to komi
+    resigned = game.apply_move(goboard.Move.resign())
+    assert resigned.is_over()
+    assert resigned.winner() == Player.black
+    resigned = game.apply_move(goboard.Move.pass_turn()).apply_move(
+        goboard.Move.resign())
+    assert resigned.winner() == Player.white
+
+
+def test_winner_after_two_passes():
+    game = goboard.GameState.new_game(5)
+    game = game.apply_move(goboard.Move.play(Point(row = 3, col = 3)))
+    game = game.apply_move(goboard.Move.pass_turn())
+    game = game.apply_move(goboard.Move.pass_turn())
+    assert game.winner() == Player.black
+    assert game.winner(komi = 30.5) == Player.white
+    assert str(game.game_result()) == 'B+17.5'
+
+
+def final_boards():
+    boards = []
+    for plays in random_plays(7, 4, 24):
+        board = goboard.Board(7, 7)
+        for player, point in plays:
+            board.place_stone(player, point)
+        boards.append(board)
+    return boards
+
+
+def test_batch_matches_score_board():
+    boards = final_boards()
+    colors = [scoring.board_colors(board) for board in boards]
+    batch = scoring.score_color_batch(colors, 7, 7, komi = 6.5)
+    assert batch == [scoring.score_board(board, 6.5) for board in boards]
+    assert scoring.score_boards(boards, 6.5) == batch
+
+
+# ArrayBoard gives its colors by index. They must be the colors the generic
+# path reads point by point
+def test_array_board_colors_match_get():
+    for plays in random_plays(7, 4, 24):
+        board = ArrayBoard(7, 7)
+        for player, point in plays:
+            board.place_stone(player, point)
+        tables = scoring.scoring_tables(7, 7)
+        generic = []
+        for point in tables.points:
+            player = board.get(point)
+            generic.append(scoring.EMPTY if player is None else player.value)
+        assert hasattr(board, 'color_at')
+        assert scoring.board_colors(board) == generic
@@ -0,0 +1,41 @@
+from dlgo import goboard
+from dlgo.gotypes import Point
+from dlgo.mcst.mcts_agent import MCTSAgent
+from dlgo.mcst.transpositions import position_key
+import random
+
+
+# The same board right after a pass is a different position: one more pass
+# ends the game from it
+def test_position_key_counts_passes():
+    game = goboard.GameState.new_game(5)
+    game = game.apply_move(goboard.Move.play(Point(row = 3, col = 3)))
+    game = game.apply_move(goboard.Move.play(Point(row = 2, col = 2)))
+    after_pass = game.apply_move(goboard.Move.pass_turn())
+    after_pass = after_pass.apply_move(goboard.Move.pass_turn())
+    assert after_pass.board.zobrist_hash() == game.board.zobrist_hash()
+    assert after_pass.next_player == game.next_player
+    assert after_pass.is_over() and not game.is_over()
+    assert position_key(after_pass) != position_key(game)
+
+
+# With shared stats, every node still counts the visits that came through it
+# from its parent, and the child visits of a node add them up
+def test_edge_visits_add_up():
+    random.seed(17)
+    agent = MCTSAgent(2000, 1.5, transposition_table_size = 10000)
+    root = agent.root_for(goboard.GameState.new_game(3))
+    agent._run_rollouts(root, 2000)
+    assert root.edge_visits == 2000
+    shared = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        assert node.child_visits == \
+            sum(child.edge_visits for child in node.children)
+        assert node.edge_visits <= node.num_rollouts
+        if node.edge_visits < node.num_rollouts:
+            shared += 1
+        stack.extend(node.children)
+    # A 3x3 board has plenty of transpositions
+    assert shared > 0
@@ -0,0 +1,34 @@
+from dlgo.ttt import tttbitboard
+from dlgo.ttt import tttboard
+from dlgo.ttt.tttboard import Move
+from dlgo.ttt.ttttypes import Point
+import pytest
+import random
+
+
+def test_apply_move_rejects_taken_point():
+    game = tttbitboard.GameState.new_game()
+    game = game.apply_move(Move(Point(2, 2)))
+    with pytest.raises(AssertionError):
+        game.apply_move(Move(Point(2, 2)))
+    with pytest.raises(AssertionError):
+        game.apply_move(Move(Point(4, 1)))
+
+
+# Random games give the same legal moves, winner and end of game as the
+# dict board
+def test_matches_tttboard():
+    rng = random.Random(21)
+    for _ in range(200):
+        game = tttboard.GameState.new_game()
+        bit_game = tttbitboard.GameState.new_game()
+        while not game.is_over():
+            assert not bit_game.is_over()
+            moves = game.legal_moves()
+            assert sorted(move.point for move in bit_game.legal_moves()) == \
+                sorted(move.point for move in moves)
+            move = rng.choice(moves)
+            game = game.apply_move(move)
+            bit_game = bit_game.apply_move(move)
+        assert bit_game.is_over()
+        assert bit_game.winner() == game.winner()
@@ -0,0 +1,47 @@
+from array import array
+from dlgo.mcst.mcts_agent import uct_score
+from dlgo.mcst.uct import best_uct_index, uct_scores
+import random
+
+
+# The first child with the best uct_score, the way select_child used to
+# choose
+def loop_best_index(wins, visits, parent_rollouts, temperature):
+    best_index = None
+    best_score = None
+    for index in range(len(wins)):
+        score = uct_score(parent_rollouts, visits[index],
+                          float(wins[index]) / float(visits[index]),
+                          temperature)
+        if best_score is None or score > best_score:
+            best_index = index
+            best_score = score
+    return best_index
+
+
+# Random sets of children, including ties and single visits, must get exactly
+# the same floats and the same choice as uct_score in a loop
+def test_uct_scores_match_uct_score():
+    rng = random.Random(15)
+    for _ in range(5000):
+        num_children = rng.randint(1, 40)
+        visits = [rng.choice((1, 1, 2, rng.randint(1, 1000)))
+                  for _ in range(num_children)]
+        wins = [rng.randint(0, visit) for visit in visits]
+        parent_rollouts = sum(visits) + rng.choice((0, 0, rng.randint(0, 50)))
+        temperature = rng.choice((0.0, 0.5, 1.5, rng.uniform(0.0, 3.0)))
+        scores = uct_scores(wins, visits, parent_rollouts, temperature)
+        for index in range(num_children):
+            assert scores[index] == uct_score(
+                parent_rollouts, visits[index],
+                float(wins[index]) / float(visits[index]), temperature)
+        assert best_uct_index(wins, visits, parent_rollouts, temperature) == \
+            loop_best_index(wins, visits, parent_rollouts, temperature)
+
+
+# The scores take any sequences, such as the array slices of an ArrayTree
+def test_uct_scores_take_arrays():
+    wins = array('d', [1.0, 3.0, 0.0])
+    visits = array('l', [2, 4, 1])
+    assert uct_scores(wins, visits, 7, 1.5) == \
+        uct_scores(list(wins), list(visits), 7, 1.5)
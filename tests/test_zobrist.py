@@ -0,0 +1,37 @@
+from board_helpers import random_plays
+from dlgo import goboard
+from dlgo import zobrist
+from dlgo.selfplay import BOARDS
+
+
+# The hash every board keeps up to date as stones are placed and captured
+# must match hashing the board from scratch, for every size and backend
+def test_incremental_hash_matches_hash_board():
+    for board_size in (5, 9, 13):
+        table = zobrist.table_for(board_size, board_size)
+        games = random_plays(board_size, 2, board_size, max_moves = 150)
+        for board_class in BOARDS.values():
+            for plays in games:
+                board = board_class(board_size, board_size)
+                assert board.zobrist_hash() == table.hash_board(board)
+                for player, point in plays:
+                    board.place_stone(player, point)
+                    assert board.zobrist_hash() == table.hash_board(board)
+
+
+# Rectangular boards get their own table
+def test_rectangular_board():
+    table = zobrist.table_for(5, 7)
+    assert table is zobrist.table_for(5, 7)
+    assert table is not zobrist.table_for(7, 5)
+    game = goboard.GameState.new_game((5, 7))
+    for move in game.legal_moves()[:10]:
+        if move.is_play:
+            game = game.apply_move(move)
+            assert game.board.zobrist_hash() == table.hash_board(game.board)
+
+
+# The codes come from a fixed seed, so a table built again is the same
+def test_tables_are_reproducible():
+    table = zobrist.ZobristTable(9, 9)
+    assert table.codes == zobrist.table_for(9, 9).codes